@@ -4,7 +4,9 @@ from .models import (
     BaseRequestModel,
     CanjeOperacion,
     CompraOperacion,
+    EmailOutbox,
     PlazoFijoOperacion,
+    PosicionSemanal,
     VentaOperacion,
 )
 
@@ -15,5 +17,7 @@ admin.site.register(
         VentaOperacion,
         CanjeOperacion,
         PlazoFijoOperacion,
+        EmailOutbox,
+        PosicionSemanal,
     ]
 )
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class OperacionesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "operaciones"
+
+    def ready(self):
+        """Registra los signals del libro de posiciones."""
+        import operaciones.signals  # noqa: F401
@@ -0,0 +1,197 @@
+"""
+Encoder compilado del payload SSN.
+
+serialize_operations() pasa cada fila por la maquinaria de campos de DRF y
+después vuelve a recorrer el dict para aplicar las reglas de formato SSN y
+pasar las claves a camelCase. Este módulo precalcula, una vez por modelo, la
+lista de (campo, clave camelCase, formateador) y arma el JSON directamente
+desde filas de values(), sin instanciar modelos ni serializadores.
+
+La salida es idéntica byte a byte a la de serialize_operations (mismo orden de
+claves y mismos strings); lo verifica el golden test de tests.py.
+"""
+
+import decimal
+import logging
+import time
+import uuid
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.db import models
+
+from .helpers.number_utils import format_cantidad, format_entero, format_max_decimales
+from .helpers.text_utils import to_camel_case
+from .models import TipoEntrega, TipoEspecie
+from .serializers import (
+    CANTIDAD_FIELDS,
+    INTEGER_FIELDS,
+    MAX_DECIMALS_FIELDS,
+    BaseModelSerializer,
+    DetalleCanjeSerializer,
+    get_operation_serializer,
+    log_payload_summary,
+)
+
+logger = logging.getLogger("operaciones")
+
+FCI = TipoEspecie.FONDOS_COMUNES_DE_INVERSIÓN
+
+# (tipo_operacion, related_name en BaseRequestModel, campo de fecha para ordenar)
+SEMANAL_SOURCES = [
+    ("C", "compras", "fecha_movimiento"),
+    ("V", "ventas", "fecha_movimiento"),
+    ("J", "canjes", "fecha_movimiento"),
+    ("P", "plazos_fijos", "fecha_constitucion"),
+]
+MENSUAL_SOURCES = [
+    ("SI", "stocks_inversion_mensuales", None),
+    ("SP", "stocks_plazofijo_mensuales", None),
+    ("SC", "stocks_chequespd_mensuales", None),
+]
+
+# Formateador: (valor, fila) -> valor final. Se llama solo con valores no nulos.
+Formatter = Callable[[Any, Dict[str, Any]], Any]
+
+
+def _decimal_formatter(model_field: models.DecimalField) -> Callable[[Any], str]:
+    """Replica DecimalField.to_representation de DRF (quantize + '{:f}')."""
+    exponent = decimal.Decimal(".1") ** model_field.decimal_places
+    context = decimal.getcontext().copy()
+    context.prec = model_field.max_digits
+
+    def fmt(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return "{:f}".format(value.quantize(exponent, context=context))
+
+    return fmt
+
+
+def _build_formatter(name: str, model_field: models.Field, prefix: str) -> Formatter:
+    """Arma el formateador de un campo, con las mismas reglas que CamelCaseModelSerializer."""
+    if isinstance(model_field, (models.DateField, models.DateTimeField)):
+        return lambda value, row: value.strftime("%d%m%Y")
+    if isinstance(model_field, models.BooleanField):
+        return lambda value, row: "1" if value else "0"
+    if isinstance(model_field, models.DecimalField):
+        drf = _decimal_formatter(model_field)
+        if name in CANTIDAD_FIELDS:
+            tipo_especie = f"{prefix}tipo_especie"
+            return lambda value, row: format_cantidad(drf(value), row.get(tipo_especie) == FCI)
+        if name in INTEGER_FIELDS:
+            return lambda value, row: format_entero(drf(value))
+        if name in MAX_DECIMALS_FIELDS:
+            places = MAX_DECIMALS_FIELDS[name]
+            return lambda value, row: format_max_decimales(drf(value), places)
+        return lambda value, row: drf(value)
+    if isinstance(model_field, (models.CharField, models.TextField, models.UUIDField)):
+        return lambda value, row: value if isinstance(value, str) else str(value)
+    return lambda value, row: str(value) if isinstance(value, uuid.UUID) else value
+
+
+class CompiledEncoder:
+    """
+    Encoder de un serializador CamelCase compilado a una tabla de campos.
+
+    Toma el orden y el conjunto de campos del serializador DRF (así ambos
+    caminos no pueden divergir) y resuelve el formateador de cada uno una vez.
+    """
+
+    def __init__(self, serializer_class, prefix: str = "") -> None:
+        self.prefix = prefix
+        serializer = serializer_class()
+        model = serializer_class.Meta.model
+
+        # (clave camelCase, lookup en values(), formateador | encoder anidado)
+        self.fields: List[Tuple[str, Optional[str], Any]] = []
+        # Columnas que no se emiten pero que los formateadores necesitan
+        self.extra_lookups: List[str] = []
+        for name, field in serializer.fields.items():
+            key = to_camel_case(name)
+            model_field = model._meta.get_field(name)
+            if isinstance(field, DetalleCanjeSerializer):
+                nested = CompiledEncoder(type(field), prefix=f"{prefix}{name}__")
+                self.fields.append((key, None, nested))
+            else:
+                lookup = f"{prefix}{name}"
+                self.fields.append((key, lookup, _build_formatter(name, model_field, prefix)))
+                # El formato de las cantidades depende del tipo de especie
+                if name in CANTIDAD_FIELDS and "tipo_especie" not in serializer.fields:
+                    self.extra_lookups.append(f"{prefix}tipo_especie")
+
+        self.lookups: List[str] = []
+        for _, lookup, fmt in self.fields:
+            self.lookups.extend(fmt.lookups if lookup is None else [lookup])
+        self.lookups.extend(dict.fromkeys(self.extra_lookups))
+
+    def encode(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        encoded = {}
+        for key, lookup, fmt in self.fields:
+            if lookup is None:
+                encoded[key] = fmt.encode(row)
+                continue
+            value = row[lookup]
+            encoded[key] = "" if value is None else fmt(value, row)
+        return encoded
+
+
+@lru_cache(maxsize=None)
+def get_encoder(tipo_operacion: str) -> CompiledEncoder:
+    """Encoder compilado por tipo de operación (uno por proceso)."""
+    return CompiledEncoder(get_operation_serializer(tipo_operacion))
+
+
+@lru_cache(maxsize=None)
+def _base_encoder() -> CompiledEncoder:
+    return CompiledEncoder(BaseModelSerializer)
+
+
+def _encode_source(base_request, tipo: str, related_name: str, sort_field: Optional[str]):
+    encoder = get_encoder(tipo)
+    lookups = encoder.lookups
+    if sort_field and sort_field not in lookups:
+        lookups = lookups + [sort_field]
+    rows = getattr(base_request, related_name).values(*lookups)
+    return [(row[sort_field] if sort_field else None, encoder.encode(row)) for row in rows]
+
+
+def encode_solicitud(base_request) -> Dict[str, Any]:
+    """
+    Arma el payload SSN de una solicitud directamente desde la base.
+
+    Equivale a serialize_operations(base_request, get_all_operaciones(base_request)):
+    mismas claves, mismo orden y mismos valores.
+
+    Args:
+        base_request: Instancia de BaseRequestModel
+
+    Returns:
+        dict: Payload listo para enviar a la SSN
+    """
+    start = time.perf_counter()
+    counts = Counter()
+    base_row = {lookup: getattr(base_request, lookup) for lookup in _base_encoder().lookups}
+    payload = _base_encoder().encode(base_row)
+
+    if base_request.tipo_entrega == TipoEntrega.MENSUAL:
+        stocks = []
+        for tipo, related_name, _ in MENSUAL_SOURCES:
+            rows = _encode_source(base_request, tipo, related_name, None)
+            counts[tipo] += len(rows)
+            stocks.extend(data for _, data in rows)
+        payload["stocks"] = stocks
+    else:
+        operaciones = []
+        for tipo, related_name, sort_field in SEMANAL_SOURCES:
+            rows = _encode_source(base_request, tipo, related_name, sort_field)
+            counts[tipo] += len(rows)
+            operaciones.extend(rows)
+        # Mismo orden que get_all_operaciones: por fecha, estable entre tipos
+        operaciones.sort(key=lambda item: item[0])
+        payload["operaciones"] = [data for _, data in operaciones]
+
+    logger.info(f"Payload SSN codificado para {base_request.uuid}: {sum(counts.values())} filas")
+    log_payload_summary(base_request, "encoder", counts, 0, time.perf_counter() - start)
+    return payload
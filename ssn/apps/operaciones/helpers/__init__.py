@@ -15,6 +15,8 @@ from .mixins import (
     StandaloneViewMixin,
 )
 from .model_utils import get_mapping_model, get_related_names_map
+from .number_utils import format_ar_number, to_decimal
+from .payload_utils import camel_to_snake, normalize_ssn_payload
 from .text_utils import camel_to_title, normalizar_texto, to_camel_case
 
 __all__ = [
@@ -31,6 +33,10 @@ __all__ = [
     "disable_field",
     "get_mapping_model",
     "get_related_names_map",
+    "format_ar_number",
+    "to_decimal",
+    "camel_to_snake",
+    "normalize_ssn_payload",
     "camel_to_title",
     "normalizar_texto",
     "to_camel_case",
@@ -0,0 +1,111 @@
+"""
+Formateo numérico exacto con Decimal.
+
+Todos los montos del sistema son DecimalField (hasta 20 dígitos). Pasarlos por
+float pierde precisión por encima de 2**53 y puede producir notación
+científica, así que el serializador SSN, format_ar_number y el Excel de la
+vista previa usan estas funciones, que solo operan con Decimal/int.
+"""
+
+import re
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from typing import Any, Optional, Union
+
+# Strings puramente numéricos (entero o decimal, con signo opcional).
+# Excluye códigos alfanuméricos como "FC", "ARS", "TZXM7".
+NUMERIC_STR = re.compile(r"^-?\d+(\.\d+)?$")
+
+
+def to_decimal(value: Any) -> Optional[Decimal]:
+    """
+    Convierte un valor (Decimal, int, float o str) a Decimal sin pasar por float.
+
+    Los float se convierten desde su repr (str), igual que Decimal(str(x)).
+
+    Returns:
+        Decimal, o None si el valor es None, vacío o no numérico.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    try:
+        d = Decimal(str(value).strip())
+    except InvalidOperation:
+        return None
+    return d if d.is_finite() else None
+
+
+def _plain(d: Decimal) -> str:
+    """Decimal sin exponente ni ceros decimales finales ("-0" se muestra como "0")."""
+    if d == 0:
+        return "0"
+    text = format(d, "f")
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return text
+
+
+def format_entero(value: Any) -> str:
+    """Número sin decimales (trunca hacia cero, como int())."""
+    return str(int(to_decimal(value)))
+
+
+def format_cantidad(value: Any, is_fci: bool) -> str:
+    """Cantidad de especies: FCI conserva los decimales, el resto solo la parte entera."""
+    if is_fci:
+        return str(value)
+    return format_entero(value)
+
+
+def format_max_decimales(value: Any, places: int) -> str:
+    """Número con hasta `places` decimales (redondeo bancario), sin ceros ni punto finales."""
+    d = to_decimal(value).quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_EVEN)
+    return _plain(d)
+
+
+def format_ar_number(value: Any) -> str:
+    """
+    Formatea un número con separadores argentinos: punto para miles, coma para decimal.
+    Elimina ceros decimales trailing.
+
+    Ejemplos:
+        2630913.678600  →  "2.630.913,6786"
+        99421.04        →  "99.421,04"
+        100000.00       →  "100.000"
+        180.05          →  "180,05"
+        685             →  "685"
+    """
+    if value is None:
+        return ""
+    d = to_decimal(value)
+    if d is None:
+        return str(value)
+
+    int_part, _, dec_part = _plain(d).partition(".")
+    negative = int_part.startswith("-")
+    int_formatted = "{:,}".format(int(int_part.lstrip("-"))).replace(",", ".")
+    if negative:
+        int_formatted = "-" + int_formatted
+    return f"{int_formatted},{dec_part}" if dec_part else int_formatted
+
+
+def parse_numeric_str(value: Any) -> Union[int, Decimal, Any]:
+    """
+    Convierte un string numérico del payload SSN al tipo que se escribe en Excel.
+
+    Los enteros quedan como int (exactos, sin ".0") y los decimales como
+    Decimal, así los totales se suman sin error de redondeo. Cualquier otro
+    valor se devuelve sin cambios.
+    """
+    if not isinstance(value, str) or not NUMERIC_STR.match(value.strip()):
+        return value
+    d = Decimal(value.strip())
+    return int(d) if d == d.to_integral_value() else d
+
+
+def is_number(value: Any) -> bool:
+    """True para int, float o Decimal (los bool no cuentan como números)."""
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
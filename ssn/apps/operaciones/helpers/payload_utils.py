@@ -0,0 +1,116 @@
+"""
+Normalización de respuestas de la API de SSN.
+
+La API devuelve claves camelCase, fechas DDMMYYYY, strings vacíos para campos
+sin valor y el string "null" en lugar de null. normalize_ssn_payload() resuelve
+todo eso en una sola pasada iterativa (sin recursión), apoyándose en tablas
+memoizadas para las claves y las fechas, que se repiten en cada fila.
+"""
+
+import datetime
+import re
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+_CAMEL_BOUNDARY_RE = re.compile(r"(.)([A-Z][a-z]+)")
+_CAMEL_LOWER_UPPER_RE = re.compile(r"([a-z0-9])([A-Z])")
+_SSN_DATE_RE = re.compile(r"\d{8}")
+
+
+@lru_cache(maxsize=2048)
+def camel_to_snake(name: str) -> str:
+    """
+    Convierte camelCase/PascalCase a snake_case (memoizado).
+
+    Example:
+        >>> camel_to_snake("fechaPaseVt")
+        'fecha_pase_vt'
+    """
+    s1 = _CAMEL_BOUNDARY_RE.sub(r"\1_\2", name)
+    return _CAMEL_LOWER_UPPER_RE.sub(r"\1_\2", s1).lower()
+
+
+@lru_cache(maxsize=2048)
+def _is_date_key(key: str) -> bool:
+    return "fecha" in key.lower()
+
+
+@lru_cache(maxsize=4096)
+def ssn_date_to_iso(value: str) -> str:
+    """
+    Convierte una fecha DDMMYYYY de la SSN a ISO (YYYY-MM-DD).
+
+    Si el valor no es una fecha válida se devuelve sin cambios.
+
+    Example:
+        >>> ssn_date_to_iso("07042025")
+        '2025-04-07'
+    """
+    if not _SSN_DATE_RE.fullmatch(value):
+        return value
+    try:
+        return datetime.datetime.strptime(value, "%d%m%Y").date().isoformat()
+    except ValueError:
+        return value
+
+
+def normalize_ssn_payload(data: Any) -> Any:
+    """
+    Normaliza una respuesta de la API de SSN en una sola pasada:
+
+    - Convierte las claves camelCase a snake_case
+    - Convierte fechas DDMMYYYY a ISO en claves que contienen "fecha"
+    - Elimina pares clave/valor cuyo valor es string vacío
+    - Convierte el string "null" en None
+
+    Recorre el árbol con una pila explícita, por lo que no depende del límite
+    de recursión ni reconstruye cada dict varias veces.
+
+    Args:
+        data: JSON ya decodificado (dict, list o escalar)
+
+    Returns:
+        Una copia normalizada de data
+    """
+    if not isinstance(data, (dict, list)):
+        return data
+
+    result = {} if isinstance(data, dict) else []
+    stack: List[Tuple[Any, Any]] = [(data, result)]
+
+    while stack:
+        source, target = stack.pop()
+
+        if isinstance(source, dict):
+            for key, value in source.items():
+                key = camel_to_snake(key)
+                if isinstance(value, str):
+                    if value == "":
+                        continue
+                    if value == "null":
+                        target[key] = None
+                    elif _is_date_key(key):
+                        target[key] = ssn_date_to_iso(value)
+                    else:
+                        target[key] = value
+                elif isinstance(value, dict):
+                    child = target[key] = {}
+                    stack.append((value, child))
+                elif isinstance(value, list):
+                    child = target[key] = []
+                    stack.append((value, child))
+                else:
+                    target[key] = value
+        else:
+            for item in source:
+                if isinstance(item, dict):
+                    child = {}
+                    stack.append((item, child))
+                elif isinstance(item, list):
+                    child = []
+                    stack.append((item, child))
+                else:
+                    child = item
+                target.append(child)
+
+    return result
@@ -1,7 +1,6 @@
 import json
 import re
 import unicodedata
-from decimal import Decimal, InvalidOperation
 
 
 def normalizar_texto(texto: str) -> str:
@@ -49,42 +48,6 @@ def to_camel_case(snake_str):
     return components[0] + "".join(x.title() for x in components[1:])
 
 
-def format_ar_number(value) -> str:
-    """
-    Formatea un número con separadores argentinos: punto para miles, coma para decimal.
-    Elimina ceros decimales trailing.
-
-    Ejemplos:
-        2630913.678600  →  "2.630.913,6786"
-        99421.04        →  "99.421,04"
-        100000.00       →  "100.000"
-        180.05          →  "180,05"
-        685             →  "685"
-    """
-    if value is None:
-        return ""
-    try:
-        d = Decimal(str(value)).normalize()
-        # format(d, 'f') evita notación científica en números grandes/pequeños
-        str_d = format(d, "f")
-        if "." in str_d:
-            int_part, dec_part = str_d.split(".")
-            dec_part = dec_part.rstrip("0")
-        else:
-            int_part = str_d
-            dec_part = ""
-
-        negative = int_part.startswith("-")
-        abs_int = int_part.lstrip("-")
-        int_formatted = "{:,}".format(int(abs_int)).replace(",", ".")
-        if negative:
-            int_formatted = "-" + int_formatted
-
-        return f"{int_formatted},{dec_part}" if dec_part else int_formatted
-    except (InvalidOperation, ValueError):
-        return str(value)
-
-
 def pretty_json(data):
     """
     Converts a Python object into a formatted JSON string with indentation for readability.
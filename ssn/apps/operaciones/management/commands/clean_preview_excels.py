@@ -31,7 +31,8 @@ class Command(BaseCommand):
 
         removed_files = []
         for fname in os.listdir(previews_path):
-            if fname.startswith("solicitud_") and fname.endswith(".xlsx"):
+            # Excel y JSON cacheados de la vista previa (se regeneran al pedirlos)
+            if fname.startswith("solicitud_") and fname.endswith((".xlsx", ".json")):
                 fpath = os.path.join(previews_path, fname)
                 try:
                     mtime = datetime.fromtimestamp(os.path.getmtime(fpath))
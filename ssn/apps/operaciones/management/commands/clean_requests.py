@@ -25,21 +25,15 @@ class Command(BaseCommand):
         days = options["days"]
         cutoff = timezone.now() - timedelta(days=days)
 
-        qs = BaseRequestModel.objects.filter(
-            send_at__isnull=True, created_at__lt=cutoff
-        )
-
-        empty = []
-        for req in qs:
-            counts = OperacionesService.get_count_by_tipo(req)
-            if all(count == 0 for count in counts.values()):
-                empty.append(req)
-
-        count = len(empty)
-        if count != 0:
-            deleted_ids = [str(req.uuid) for req in empty]
-            for req in empty:
-                req.delete()
+        # Vacías = sin operaciones semanales ni stocks mensuales, contadas en SQL
+        empty = OperacionesService.annotate_counts(
+            BaseRequestModel.objects.filter(send_at__isnull=True, created_at__lt=cutoff)
+        ).filter(n_operaciones=0)
+
+        deleted_ids = [str(uuid) for uuid in empty.values_list("uuid", flat=True)]
+        if deleted_ids:
+            _, deleted_by_model = empty.delete()
+            count = deleted_by_model.get(BaseRequestModel._meta.label, 0)
 
             self.stdout.write(
                 self.style.SUCCESS(
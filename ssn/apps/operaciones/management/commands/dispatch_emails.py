@@ -0,0 +1,82 @@
+"""
+Comando que entrega los emails encolados en la bandeja de salida (EmailOutbox).
+
+Reintenta con backoff exponencial los emails que fallan y agrupa los
+destinatarios en lotes por llamada (EMAIL_OUTBOX_BATCH_SIZE).
+
+Uso:
+    python manage.py dispatch_emails
+    python manage.py dispatch_emails --loop 30      # worker: cada 30 segundos
+    python manage.py dispatch_emails --batch-size 20
+
+Ejemplo de cron cada minuto:
+    * * * * * docker exec ssn_web python ssn/manage.py dispatch_emails
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from operaciones.services.email_service import EmailOutboxService
+
+logger = logging.getLogger("operaciones")
+
+
+class Command(BaseCommand):
+    help = "Entrega los emails pendientes de la bandeja de salida"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            metavar="SEGUNDOS",
+            help="Repite la entrega cada N segundos (modo worker). 0 = una sola vez",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=100,
+            help="Máximo de emails por corrida (default: 100)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Destinatarios por llamada al servidor de correo (default: EMAIL_OUTBOX_BATCH_SIZE)",
+        )
+
+    def handle(self, *args, **options):
+        if options["loop"] <= 0:
+            self._dispatch(options)
+            return
+
+        self.stdout.write(f"🔁 Entregando emails cada {options['loop']}s (Ctrl+C para salir)")
+        try:
+            while True:
+                close_old_connections()
+                try:
+                    self._dispatch(options)
+                except Exception as e:
+                    logger.exception(f"Error entregando emails de la bandeja de salida: {e}")
+                time.sleep(options["loop"])
+        except KeyboardInterrupt:
+            self.stdout.write("Entrega detenida")
+
+    def _dispatch(self, options) -> None:
+        stats = EmailOutboxService.dispatch_pending(
+            limit=options["limit"], batch_size=options["batch_size"]
+        )
+        if not any(stats.values()):
+            self.stdout.write(self.style.SUCCESS("No hay emails pendientes"))
+            return
+
+        style = self.style.SUCCESS if not stats["fallidos"] else self.style.WARNING
+        self.stdout.write(
+            style(
+                f"📧 {stats['enviados']} enviados, {stats['reintentos']} a reintentar, "
+                f"{stats['fallidos']} descartados"
+            )
+        )
@@ -0,0 +1,101 @@
+"""
+Genera los stocks mensuales de un rango de meses encadenando el roll-forward.
+
+Equivale a usar "Generar Stocks Mensuales" mes por mes, pero el stock generado
+para cada mes pasa en memoria como stock anterior del mes siguiente (no se
+vuelve a leer de la base) y cada mes se guarda con bulk_create en su propia
+transacción. Las solicitudes mensuales que no existen se crean.
+
+Uso:
+    python manage.py generate_monthly_stocks --from 2025-01 --to 2025-12
+    python manage.py generate_monthly_stocks --from 2025-01 --to 2025-12 --force
+    python manage.py generate_monthly_stocks --from 2025-06 --to 2025-06 --compania 0744
+
+Con --force se eliminan y regeneran los stocks de las solicitudes editables que
+ya los tengan; las solicitudes presentadas nunca se modifican.
+"""
+
+import logging
+import re
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from operaciones.services import MonthlyReportGeneratorService
+
+logger = logging.getLogger("operaciones")
+
+CRONOGRAMA_MENSUAL = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
+class Command(BaseCommand):
+    help = "Genera los stocks mensuales de un rango de meses (roll-forward encadenado)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from",
+            dest="desde",
+            required=True,
+            metavar="YYYY-MM",
+            help="Primer mes a generar",
+        )
+        parser.add_argument(
+            "--to",
+            dest="hasta",
+            required=True,
+            metavar="YYYY-MM",
+            help="Último mes a generar (inclusive)",
+        )
+        parser.add_argument(
+            "--compania",
+            default=settings.SSN_API_CIA,
+            help="Código de compañía para las solicitudes que se creen (default: SSN_API_CIA)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenera los meses editables que ya tengan stocks",
+        )
+
+    def handle(self, *args, **options):
+        desde, hasta = options["desde"], options["hasta"]
+        for valor in (desde, hasta):
+            if not CRONOGRAMA_MENSUAL.match(valor):
+                raise CommandError(f"Cronograma mensual inválido: {valor} (formato YYYY-MM)")
+        if desde > hasta:
+            raise CommandError(f"--from ({desde}) es posterior a --to ({hasta})")
+
+        self.stdout.write(f"📅 Generando stocks mensuales de {desde} a {hasta}")
+        start = time.perf_counter()
+        generados, fallidos = 0, 0
+
+        for cronograma, result, seconds in MonthlyReportGeneratorService.generate_monthly_range(
+            desde, hasta, options["compania"], force=options["force"]
+        ):
+            if result.success:
+                generados += 1
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"  ✅ {cronograma}: {result.total_count} stocks "
+                        f"({result.inversiones_count} inversiones, "
+                        f"{result.plazos_fijos_count} PF, {result.cheques_pd_count} CPD) "
+                        f"en {seconds:.2f}s"
+                    )
+                )
+                for warning in result.warnings:
+                    self.stdout.write(self.style.WARNING(f"     ⚠️  {warning}"))
+            else:
+                fallidos += 1
+                self.stdout.write(
+                    self.style.ERROR(f"  ❌ {cronograma}: {result.message} ({seconds:.2f}s)")
+                )
+
+        elapsed = time.perf_counter() - start
+        logger.info(
+            f"generate_monthly_stocks {desde}..{hasta}: {generados} generados, "
+            f"{fallidos} sin generar en {elapsed:.2f}s"
+        )
+        self.stdout.write(
+            f"\n📊 {generados} meses generados, {fallidos} sin generar ({elapsed:.2f}s)"
+        )
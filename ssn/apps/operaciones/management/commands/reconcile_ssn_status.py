@@ -0,0 +1,171 @@
+"""
+Comando para reconciliar en segundo plano el estado local de las solicitudes
+con el estado informado por la SSN.
+
+Toma todas las solicitudes en estados no finales (CARGADO,
+RECTIFICACION_PENDIENTE, A_RECTIFICAR), consulta la SSN con concurrencia
+acotada y aplica las transiciones en una única transacción con bulk_update.
+Usa el mismo mapeo y la misma regla de no-regresión que
+BaseRequestModel.sync_estado_con_ssn (estado_desde_ssn).
+
+Cada consulta exitosa queda además en la caché de estados, de modo que las
+vistas la leen sin esperar a la SSN.
+
+Uso:
+    python manage.py reconcile_ssn_status
+    python manage.py reconcile_ssn_status --workers 8
+    python manage.py reconcile_ssn_status --dry-run
+    python manage.py reconcile_ssn_status --loop 60     # worker: cada 60 segundos
+
+Ejemplo de cron cada 5 minutos:
+    */5 * * * * docker exec ssn_web python ssn/manage.py reconcile_ssn_status
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from operaciones.models import BaseRequestModel, EstadoSolicitud
+
+logger = logging.getLogger("operaciones")
+
+ESTADOS_A_RECONCILIAR = [
+    EstadoSolicitud.CARGADO,
+    EstadoSolicitud.RECTIFICACION_PENDIENTE,
+    EstadoSolicitud.A_RECTIFICAR,
+]
+
+
+class Command(BaseCommand):
+    help = "Reconcilia el estado de las solicitudes no finales con el estado en la SSN"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Consultas simultáneas a la SSN (default: 4)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Muestra las transiciones sin guardarlas",
+        )
+        parser.add_argument(
+            "--loop",
+            type=int,
+            default=0,
+            metavar="SEGUNDOS",
+            help="Repite la reconciliación cada N segundos (modo worker). 0 = una sola vez",
+        )
+
+    def handle(self, *args, **options):
+        if options["loop"] <= 0:
+            self._reconcile(options)
+            return
+
+        self.stdout.write(f"🔁 Reconciliando cada {options['loop']}s (Ctrl+C para salir)")
+        try:
+            while True:
+                try:
+                    self._reconcile(options)
+                except Exception as e:
+                    # Un ciclo fallido no debe tirar abajo el worker
+                    logger.exception(f"Error en la reconciliación de estados SSN: {e}")
+                time.sleep(options["loop"])
+        except KeyboardInterrupt:
+            self.stdout.write("Reconciliación detenida")
+
+    def _reconcile(self, options) -> None:
+        start = time.perf_counter()
+        solicitudes = list(BaseRequestModel.objects.filter(estado__in=ESTADOS_A_RECONCILIAR))
+        if not solicitudes:
+            self.stdout.write(self.style.SUCCESS("No hay solicitudes pendientes de reconciliar"))
+            return
+
+        workers = max(1, options["workers"])
+        self.stdout.write(
+            f"Consultando {len(solicitudes)} solicitudes en la SSN ({workers} workers)..."
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            resultados = list(executor.map(self._consultar, solicitudes))
+
+        cambios: List[Tuple[BaseRequestModel, str]] = []
+        errores = 0
+        for solicitud, (estado_ssn, status) in zip(solicitudes, resultados):
+            if status >= 400 or not estado_ssn:
+                errores += 1
+                continue
+            nuevo_estado = solicitud.estado_desde_ssn(estado_ssn)
+            if nuevo_estado:
+                cambios.append((solicitud, nuevo_estado))
+
+        for solicitud, nuevo_estado in cambios:
+            self.stdout.write(
+                f"  {solicitud.tipo_entrega} {solicitud.cronograma}: "
+                f"{solicitud.estado} -> {nuevo_estado}"
+            )
+
+        aplicados = 0
+        if cambios and not options["dry_run"]:
+            aplicados = self._aplicar(cambios)
+
+        elapsed = time.perf_counter() - start
+        resumen = (
+            f"✅ {len(solicitudes)} consultadas, {len(cambios)} con cambio de estado, "
+            f"{aplicados} actualizadas, {errores} errores ({elapsed:.2f}s)"
+        )
+        if options["dry_run"]:
+            resumen += " [dry-run]"
+        self.stdout.write(self.style.SUCCESS(resumen))
+
+    def _consultar(self, solicitud):
+        """Consulta el estado en la SSN (sin caché) y refresca la caché de estados."""
+        from ssn_client.services import consultar_estado_ssn, guardar_estado_en_cache
+
+        estado_ssn, response, status = consultar_estado_ssn(solicitud)
+        if estado_ssn is not None and status < 400:
+            guardar_estado_en_cache(solicitud, estado_ssn, response, status)
+        return estado_ssn, status
+
+    def _aplicar(self, cambios: List[Tuple[BaseRequestModel, str]]) -> int:
+        """
+        Aplica las transiciones en una única transacción.
+
+        Las filas se bloquean y se vuelve a leer su estado: si una solicitud
+        cambió mientras se consultaba a la SSN (ej: el usuario pidió una
+        rectificación), se descarta su transición para no pisar el cambio.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            actuales = dict(
+                BaseRequestModel.objects.select_for_update()
+                .filter(pk__in=[solicitud.pk for solicitud, _ in cambios])
+                .order_by()
+                .values_list("pk", "estado")
+            )
+
+            actualizar = []
+            for solicitud, nuevo_estado in cambios:
+                if actuales.get(solicitud.pk) != solicitud.estado:
+                    logger.info(
+                        f"Reconciliación omitida para {solicitud.uuid}: el estado cambió "
+                        f"durante la consulta ({solicitud.estado} -> {actuales.get(solicitud.pk)})"
+                    )
+                    continue
+                logger.info(
+                    f"Reconciliando estado de {solicitud.uuid}: "
+                    f"{solicitud.estado} -> {nuevo_estado}"
+                )
+                solicitud.estado = nuevo_estado
+                # bulk_update no aplica auto_now
+                solicitud.updated_at = now
+                actualizar.append(solicitud)
+
+            BaseRequestModel.objects.bulk_update(actualizar, ["estado", "updated_at"])
+        return len(actualizar)
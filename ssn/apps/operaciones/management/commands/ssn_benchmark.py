@@ -0,0 +1,422 @@
+"""
+Management command con micro-benchmarks de los caminos críticos de la app.
+
+Uso:
+    python manage.py ssn_benchmark --target startup
+    python manage.py ssn_benchmark --target startup --latency 2 --repeat 3
+    python manage.py ssn_benchmark --target normalize --rows 20000
+    python manage.py ssn_benchmark --target serialize --rows 1000
+    python manage.py ssn_benchmark --target serialize --rows 10000 --repeat 3
+    python manage.py ssn_benchmark --target excel --rows 10000 --repeat 3
+"""
+
+import copy
+import datetime
+import json
+import re
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+import jwt
+from django.core.management.base import BaseCommand
+
+TESTDATA_DIR = Path(__file__).resolve().parents[2] / "testdata"
+
+
+class _SlowLoginHandler(BaseHTTPRequestHandler):
+    """Simula un /login de la SSN que tarda `latency` segundos en responder."""
+
+    latency = 1.0
+
+    def do_POST(self):
+        time.sleep(self.latency)
+        token = jwt.encode({"exp": int(time.time()) + 3600}, "benchmark")
+        body = json.dumps({"token": token}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def _fake_ssn_server(latency: float) -> Iterator[str]:
+    """Levanta un servidor HTTP local que imita la latencia de la SSN."""
+    handler = type("Handler", (_SlowLoginHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _load_recorded_payload(name: str, rows: int, list_key: str) -> Dict[str, Any]:
+    """Carga una respuesta grabada de testdata/ y replica sus filas hasta `rows`."""
+    payload = json.loads((TESTDATA_DIR / name).read_text(encoding="utf-8"))
+    template = payload[list_key]
+    payload[list_key] = [copy.deepcopy(template[i % len(template)]) for i in range(rows)]
+    return payload
+
+
+def _legacy_normalize(data: Any) -> Any:
+    """Normalizador de tres pasadas recursivas previo a normalize_ssn_payload (referencia)."""
+
+    def camel_to_snake(name):
+        s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
+        return re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+
+    def keys_to_snake(obj):
+        if isinstance(obj, dict):
+            return {camel_to_snake(k): keys_to_snake(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [keys_to_snake(item) for item in obj]
+        return obj
+
+    def convert_dates(obj):
+        if isinstance(obj, dict):
+            new_dict = {}
+            for k, v in obj.items():
+                if "fecha" in k.lower() and isinstance(v, str) and re.fullmatch(r"\d{8}", v):
+                    try:
+                        new_dict[k] = datetime.datetime.strptime(v, "%d%m%Y").date().isoformat()
+                    except ValueError:
+                        new_dict[k] = v
+                else:
+                    new_dict[k] = convert_dates(v)
+            return new_dict
+        if isinstance(obj, list):
+            return [convert_dates(item) for item in obj]
+        return obj
+
+    def remove_empty_strings(obj):
+        if isinstance(obj, dict):
+            result = {}
+            for k, v in obj.items():
+                if v == "":
+                    continue
+                result[k] = None if v == "null" else remove_empty_strings(v)
+            return result
+        if isinstance(obj, list):
+            return [remove_empty_strings(item) for item in obj]
+        return obj
+
+    return remove_empty_strings(convert_dates(keys_to_snake(data)))
+
+
+def _legacy_stock_excel(stocks: List[Dict[str, Any]]) -> bytes:
+    """
+    Hoja de stock con DataFrames, previa al writer en streaming (referencia):
+    json_normalize, conversión celda por celda, to_excel y reescritura de
+    todas las celdas con worksheet.write.
+    """
+    from io import BytesIO
+
+    import numpy as np
+    import pandas as pd
+
+    from operaciones.helpers import camel_to_title
+    from operaciones.helpers.number_utils import is_number, parse_numeric_str
+
+    def to_num(v):
+        if isinstance(v, bool) or v is None or v == "":
+            return v
+        if isinstance(v, float):
+            return v if v == v else ""
+        return parse_numeric_str(v)
+
+    df = pd.json_normalize(stocks)
+    df.columns = [camel_to_title(col) for col in df.columns]
+    df = df.replace([np.nan, np.inf, -np.inf], "")
+    df = df.apply(lambda col: col.map(to_num))
+    num_cols = {col for col in df.columns if df[col].apply(is_number).any()}
+
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        num_fmt = writer.book.add_format({"border": 1, "num_format": "#,##0.########"})
+        border = writer.book.add_format({"border": 1})
+        df.to_excel(writer, index=False, sheet_name="Stock")
+        worksheet = writer.sheets["Stock"]
+        for row_idx, (_, row) in enumerate(df.iterrows()):
+            for col_idx, col_name in enumerate(df.columns):
+                value = row[col_name]
+                fmt = num_fmt if (col_name in num_cols and is_number(value)) else border
+                worksheet.write(row_idx + 1, col_idx, value, fmt)
+        for col_idx, col_name in enumerate(df.columns):
+            if col_name in num_cols:
+                total = df[col_name].apply(lambda v: v if is_number(v) else 0).sum()
+                worksheet.write(len(df) + 1, col_idx, total, num_fmt)
+            width = max(df[col_name].astype(str).map(len).max(), len(col_name), 8)
+            worksheet.set_column(col_idx, col_idx, width + 2)
+    return output.getvalue()
+
+
+def _synthetic_solicitud(tipo_entrega: str, rows: int):
+    """
+    Arma una solicitud en memoria (sin tocar la base) con `rows` operaciones o
+    stocks repartidos entre todos los tipos del período.
+    """
+    from operaciones.models import (
+        BaseRequestModel,
+        CanjeOperacion,
+        ChequePagoDiferidoStock,
+        CompraOperacion,
+        DetalleOperacionCanje,
+        InversionStock,
+        PlazoFijoOperacion,
+        PlazoFijoStock,
+        VentaOperacion,
+    )
+
+    fecha = datetime.date(2025, 4, 7)
+    especie = dict(tipo_especie="TP", codigo_especie="AL30", tipo_valuacion="V", codigo_afectacion="998")
+    plazo_fijo = dict(
+        codigo_afectacion="998", tipo_pf="TF", bic="NACNARBA", cdf="0000123456",
+        fecha_constitucion=fecha, fecha_vencimiento=fecha + datetime.timedelta(days=30),
+        moneda="ARS", tipo_tasa="F", tasa=Decimal("32.500"), titulo_deuda=False,
+        valor_nominal_nacional=Decimal("25000000"),
+    )
+    stock = dict(
+        codigo_afectacion="998", libre_disponibilidad=True, en_custodia=True,
+        financiera=True, valor_contable=Decimal("107025000"),
+    )
+
+    if tipo_entrega == "Semanal":
+        def detalle(codigo):
+            return DetalleOperacionCanje(
+                **dict(especie, codigo_especie=codigo, tipo_valuacion="T"),
+                cant_especies=Decimal("20000"), fecha_pase_vt=fecha, precio_pase_vt=Decimal("1.10"),
+            )
+
+        factories = [
+            lambda i: CompraOperacion(
+                tipo_operacion="C", fecha_movimiento=fecha, fecha_liquidacion=fecha,
+                cant_especies=Decimal(150000 + i), precio_compra=Decimal("71.35"), **especie,
+            ),
+            lambda i: VentaOperacion(
+                tipo_operacion="V", fecha_movimiento=fecha, fecha_liquidacion=fecha,
+                cant_especies=Decimal(50000 + i), precio_venta=Decimal("68.90"), **especie,
+            ),
+            lambda i: CanjeOperacion(
+                tipo_operacion="J", fecha_movimiento=fecha, fecha_liquidacion=fecha,
+                detalle_a=detalle("TX26"), detalle_b=detalle("TZX26"),
+            ),
+            lambda i: PlazoFijoOperacion(tipo_operacion="P", **plazo_fijo),
+        ]
+    else:
+        factories = [
+            lambda i: InversionStock(
+                **dict(stock, **especie), cantidad_devengado_especies=Decimal(1500000 + i),
+                cantidad_percibido_especies=Decimal(1500000 + i),
+            ),
+            lambda i: PlazoFijoStock(**dict(stock, **plazo_fijo)),
+            lambda i: ChequePagoDiferidoStock(
+                **stock, moneda="ARS", tipo_tasa="F", tasa=Decimal("40.000"), codigo_sgr="30",
+                codigo_cheque=f"{i:08d}", fecha_emision=fecha, fecha_vencimiento=fecha,
+                valor_nominal=Decimal("5000000"), valor_adquisicion=Decimal("4500000"),
+                fecha_adquisicion=fecha,
+            ),
+        ]
+
+    solicitud = BaseRequestModel(codigo_compania="0744", tipo_entrega=tipo_entrega, cronograma="2025-15")
+    operations = [factories[i % len(factories)](i) for i in range(rows)]
+    return solicitud, operations
+
+
+class Command(BaseCommand):
+    help = "Ejecuta micro-benchmarks de rendimiento (arranque del cliente SSN, etc.)"
+
+    TARGETS = ["startup", "normalize", "serialize", "excel"]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            type=str,
+            choices=self.TARGETS,
+            required=True,
+            help="Camino a medir",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Cantidad de repeticiones por escenario (default: 5)",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=1.0,
+            help="[startup] Latencia simulada del login de la SSN en segundos (default: 1.0)",
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=5000,
+            help="Cantidad de filas sintéticas a generar a partir de los fixtures (default: 5000)",
+        )
+
+    def handle(self, *args, **options):
+        getattr(self, f"_bench_{options['target']}")(options)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _measure(self, label: str, func: Callable[[], None], repeat: int) -> List[float]:
+        """Ejecuta func `repeat` veces e imprime mediana y máximo en milisegundos."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(
+            f"  {label:<40} mediana {statistics.median(timings):9.2f} ms"
+            f"   máx {max(timings):9.2f} ms"
+        )
+        return timings
+
+    # ------------------------------------------------------------------
+    # Benchmarks
+    # ------------------------------------------------------------------
+
+    def _bench_startup(self, options):
+        """
+        Compara el costo de construir SsnService (lo que hace AppConfig.ready())
+        con login bloqueante vs. login lazy / warm-up en segundo plano.
+        """
+        from ssn_client.clients import Singleton, SsnService
+        from ssn_client.token_store import LocalTokenStore
+
+        latency = options["latency"]
+        repeat = options["repeat"]
+        self.stdout.write(
+            self.style.NOTICE(f"Arranque de SsnService con login simulado de {latency:.2f}s")
+        )
+
+        with _fake_ssn_server(latency) as base_url:
+
+            def build() -> SsnService:
+                # Instancia nueva en cada corrida (bypass del Singleton)
+                Singleton._instances.pop(SsnService, None)
+                return SsnService(
+                    username="bench", password="bench", cia="0000",
+                    base_url=base_url, verify_ssl=False,
+                    token_store=LocalTokenStore(),
+                )
+
+            previous = Singleton._instances.pop(SsnService, None)
+            try:
+                self._measure(
+                    "bloqueante (login en __init__)",
+                    lambda: build().warm_up(background=False),
+                    repeat,
+                )
+                self._measure("lazy (login en primer uso)", build, repeat)
+                self._measure(
+                    "lazy + warm-up en segundo plano",
+                    lambda: build().warm_up(background=True),
+                    repeat,
+                )
+            finally:
+                Singleton._instances.pop(SsnService, None)
+                if previous is not None:
+                    Singleton._instances[SsnService] = previous
+
+    def _bench_normalize(self, options):
+        """
+        Compara el normalizador de una pasada con el de tres pasadas recursivas
+        sobre respuestas grabadas (testdata/) replicadas a --rows filas.
+        """
+        from operaciones.helpers.payload_utils import normalize_ssn_payload
+
+        rows = options["rows"]
+        repeat = options["repeat"]
+        payloads = [
+            ("semanal", _load_recorded_payload("entrega_semanal.json", rows, "operaciones")),
+            ("mensual", _load_recorded_payload("entrega_mensual.json", rows, "stocks")),
+        ]
+
+        for label, payload in payloads:
+            self.stdout.write(self.style.NOTICE(f"Normalización {label}: {rows} filas"))
+            if normalize_ssn_payload(payload) != _legacy_normalize(payload):
+                self.stdout.write(self.style.ERROR("  Los resultados NO coinciden"))
+            legacy = self._measure("tres pasadas recursivas", lambda: _legacy_normalize(payload), repeat)
+            fused = self._measure("una pasada iterativa", lambda: normalize_ssn_payload(payload), repeat)
+            speedup = statistics.median(legacy) / statistics.median(fused)
+            self.stdout.write(self.style.SUCCESS(f"  speedup x{speedup:.1f}"))
+
+    def _bench_serialize(self, options):
+        """
+        Compara serialize_operations (registro de serializadores por tipo y
+        campos cacheados) con el camino previo, que creaba una clase de
+        serializador por fila, sobre solicitudes sintéticas de --rows filas.
+        """
+        from operaciones.serializers import create_model_serializer, serialize_operations
+
+        def legacy(operations):
+            return [create_model_serializer(op.tipo_operacion)(op).data for op in operations]
+
+        rows = options["rows"]
+        repeat = options["repeat"]
+        for tipo_entrega, list_key in (("Semanal", "operaciones"), ("Mensual", "stocks")):
+            solicitud, operations = _synthetic_solicitud(tipo_entrega, rows)
+            self.stdout.write(self.style.NOTICE(f"Serialización {tipo_entrega.lower()}: {rows} filas"))
+            if serialize_operations(solicitud, operations)[list_key] != legacy(operations):
+                self.stdout.write(self.style.ERROR("  Los resultados NO coinciden"))
+            before = self._measure("una clase de serializador por fila", lambda: legacy(operations), repeat)
+            after = self._measure(
+                "registro por tipo", lambda: serialize_operations(solicitud, operations), repeat
+            )
+            speedup = statistics.median(before) / statistics.median(after)
+            self.stdout.write(self.style.SUCCESS(f"  speedup x{speedup:.1f}"))
+
+    def _bench_excel(self, options):
+        """
+        Compara el Excel de la vista previa armado con DataFrames (conversión
+        celda por celda y doble escritura) con el writer en streaming de
+        SolicitudPreviewService, sobre hojas de stock de --rows filas.
+        """
+        import tracemalloc
+        from unittest import mock
+
+        from operaciones.services import SolicitudPreviewService
+
+        rows = options["rows"]
+        repeat = options["repeat"]
+        payload = _load_recorded_payload("entrega_mensual.json", rows, "stocks")
+        for stock in payload["stocks"]:
+            stock["tipo"] = "I"  # Una sola hoja de --rows filas
+
+        preview = SolicitudPreviewService(mock.MagicMock(tipo_entrega="Mensual"), [])
+        preview.payload = payload
+
+        self.stdout.write(self.style.NOTICE(f"Excel de stock: {rows} filas"))
+        before = self._measure(
+            "DataFrame + reescritura de celdas",
+            lambda: _legacy_stock_excel(payload["stocks"]),
+            repeat,
+        )
+        after = self._measure("streaming (constant_memory)", preview.build_excel, repeat)
+        speedup = statistics.median(before) / statistics.median(after)
+        self.stdout.write(self.style.SUCCESS(f"  speedup x{speedup:.1f}"))
+
+        for label, func in (
+            ("DataFrame + reescritura de celdas", lambda: _legacy_stock_excel(payload["stocks"])),
+            ("streaming (constant_memory)", preview.build_excel),
+        ):
+            tracemalloc.start()
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.stdout.write(f"  {label:<40} pico de memoria {peak / 1e6:9.1f} MB")
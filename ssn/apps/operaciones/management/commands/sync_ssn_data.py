@@ -5,17 +5,35 @@ Uso:
     python manage.py sync_ssn_data --period semanal --year 2025
     python manage.py sync_ssn_data --period mensual --year 2025
     python manage.py sync_ssn_data --period semanal --year 2025 --dry-run
+    python manage.py sync_ssn_data --period semanal --year 2023 --workers 4
+    python manage.py sync_ssn_data --period mensual --year 2025 --incremental
+
+Con --workers N los cronogramas se descargan en paralelo (pool acotado de threads
+que comparten la sesión autenticada del cliente SSN); la escritura en la base
+sigue siendo secuencial en el thread principal. El avance se guarda en un archivo
+de checkpoint, de modo que una corrida interrumpida retoma donde quedó.
+
+Con --incremental se guarda un hash de cada respuesta de la SSN en la solicitud
+(sync_hash). Si el hash no cambió no se toca la base; si cambió se aplica un diff
+fila por fila (insert/update/delete) en lugar de borrar y recrear todo.
 """
 
 import datetime
+import hashlib
+import json
 import logging
-import re
-from typing import Any, Dict, List, Optional, Tuple
+import os
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from django.apps import apps
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import models, transaction
 from django.db.models import F
 from django.utils import timezone
 
@@ -25,6 +43,7 @@ from operaciones.helpers.date_utils import (
     generate_week_options,
     get_last_week_id,
 )
+from operaciones.helpers.payload_utils import normalize_ssn_payload
 from operaciones.models import (
     BaseRequestModel,
     CanjeOperacion,
@@ -36,8 +55,10 @@ from operaciones.models import (
     PlazoFijoOperacion,
     PlazoFijoStock,
     TipoEntrega,
+    TipoEspecie,
     VentaOperacion,
 )
+from operaciones.services.posicion_service import PosicionesService
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +79,105 @@ STOCK_MODEL_MAP = {
 }
 
 
+# Campos que identifican una fila para emparejar lo existente con lo que devuelve
+# la SSN en --incremental. El resto de los campos se compara y se actualiza en el lugar.
+ROW_MATCH_KEYS = {
+    CompraOperacion: (
+        "tipo_especie", "codigo_especie", "codigo_afectacion", "tipo_valuacion",
+        "fecha_movimiento", "fecha_liquidacion",
+    ),
+    VentaOperacion: (
+        "tipo_especie", "codigo_especie", "codigo_afectacion", "tipo_valuacion",
+        "fecha_movimiento", "fecha_liquidacion",
+    ),
+    PlazoFijoOperacion: ("bic", "cdf", "fecha_constitucion"),
+    InversionStock: (
+        "tipo_especie", "codigo_especie", "codigo_afectacion", "tipo_valuacion",
+        "libre_disponibilidad",
+    ),
+    PlazoFijoStock: ("bic", "cdf", "fecha_constitucion"),
+    ChequePagoDiferidoStock: ("codigo_sgr", "codigo_cheque"),
+}
+
+# Campos locales (no vienen de la SSN) que no participan del diff
+DIFF_IGNORED_FIELDS = {"id", "created_at", "updated_at", "solicitud", "comprobante"}
+
+
+class SyncCheckpoint:
+    """
+    Registro persistente de cronogramas ya sincronizados.
+
+    Se guarda como JSON (escritura atómica con os.replace) después de cada
+    cronograma, para que una corrida interrumpida no vuelva a empezar de cero.
+
+    El modo de la corrida (default, force, incremental) es parte de la
+    identidad del checkpoint: un cronograma completado en un modo no cuenta
+    como hecho para otro (--force no debe saltar lo que una corrida normal ya
+    había marcado).
+    """
+
+    def __init__(self, path: Path, period: str, year: int, mode: str = "default") -> None:
+        self.path = Path(path)
+        self.period = period
+        self.year = year
+        self.mode = mode
+        self.completed: Set[str] = set()
+
+    def load(self) -> None:
+        """Carga el checkpoint si existe y corresponde al mismo período/año/modo."""
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Checkpoint ilegible en {self.path}, se ignora: {e}")
+            return
+        if data.get("period") != self.period or data.get("year") != self.year:
+            return
+        if data.get("mode", "default") != self.mode:
+            logger.info(
+                f"Checkpoint de otro modo ({data.get('mode', 'default')} != {self.mode}), se descarta"
+            )
+            return
+        self.completed = set(data.get("completed", []))
+
+    def mark_done(self, cronograma_id: str) -> None:
+        """Marca un cronograma como completado y persiste el archivo."""
+        self.completed.add(cronograma_id)
+        self._save()
+
+    def forget(self, cronograma_ids: Iterable[str]) -> None:
+        """
+        Quita del checkpoint solo los cronogramas indicados (una corrida con
+        --cronograma no descarta el progreso de una corrida del año completo).
+        Si no queda ninguno, elimina el archivo.
+        """
+        self.completed.difference_update(cronograma_ids)
+        if self.completed:
+            self._save()
+        else:
+            self.clear()
+
+    def _save(self) -> None:
+        payload = {
+            "period": self.period,
+            "year": self.year,
+            "mode": self.mode,
+            "completed": sorted(self.completed),
+            "updated_at": timezone.now().isoformat(),
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        """Elimina el archivo de checkpoint (corrida completa sin errores)."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
 class Command(BaseCommand):
     help = "Sincroniza datos históricos desde la API de SSN a la base de datos local"
 
@@ -90,12 +210,40 @@ class Command(BaseCommand):
             type=str,
             help="Sincronizar solo un cronograma específico (ej: 2025-15)",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Cantidad de descargas concurrentes contra la SSN (default: 1, secuencial)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            help="Archivo de checkpoint (default: logs/sync_ssn_<period>_<year>.checkpoint.json)",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignorar el checkpoint existente y procesar todos los cronogramas",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Filas por INSERT en bulk_create (default: 500)",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Re-sincronizar existentes aplicando solo los cambios (hash + diff por fila)",
+        )
 
     def handle(self, *args, **options):
         period = options["period"]
         year = options["year"]
         dry_run = options["dry_run"]
         force = options["force"]
+        incremental = options["incremental"]
         specific_cronograma = options.get("cronograma")
 
         self.stdout.write(
@@ -105,11 +253,18 @@ class Command(BaseCommand):
         if dry_run:
             self.stdout.write(self.style.WARNING("🔍 Modo DRY-RUN activado"))
 
+        workers = max(options["workers"], 1)
+        self.batch_size = max(options["batch_size"], 1)
+
         # Obtener el cliente SSN
         try:
             ssn_client = apps.get_app_config("ssn_client").ssn_client
         except Exception as e:
             raise CommandError(f"Error al obtener cliente SSN: {e}")
+        if ssn_client is None:
+            raise CommandError(
+                "Cliente SSN no inicializado (revisar SSN_API_ENABLED y credenciales)."
+            )
 
         # Generar lista de cronogramas a sincronizar
         if specific_cronograma:
@@ -119,6 +274,30 @@ class Command(BaseCommand):
 
         self.stdout.write(f"📅 Cronogramas a procesar: {len(cronogramas)}")
 
+        # Checkpoint para retomar corridas interrumpidas (no aplica a dry-run)
+        checkpoint = None
+        if not dry_run:
+            checkpoint_path = options.get("checkpoint") or (
+                Path(settings.LOGS_DIR) / f"sync_ssn_{period}_{year}.checkpoint.json"
+            )
+            mode = "+".join(
+                name for name, flag in (("force", force), ("incremental", incremental)) if flag
+            ) or "default"
+            checkpoint = SyncCheckpoint(checkpoint_path, period, year, mode)
+            if options["restart"] and not specific_cronograma:
+                checkpoint.clear()
+            else:
+                checkpoint.load()
+            # Un --cronograma explícito siempre se procesa, aunque figure como hecho
+            if checkpoint.completed and not specific_cronograma:
+                cronogramas = [
+                    c for c in cronogramas if c[0] not in checkpoint.completed
+                ]
+                self.stdout.write(
+                    f"↩️  Retomando desde checkpoint: {len(checkpoint.completed)} ya completados, "
+                    f"{len(cronogramas)} pendientes"
+                )
+
         # Estadísticas
         stats = {
             "processed": 0,
@@ -126,24 +305,65 @@ class Command(BaseCommand):
             "skipped": 0,
             "errors": 0,
             "operations_created": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "rows_changed": 0,
+            "write_seconds": 0.0,
         }
 
+        tipo_entrega = TipoEntrega.SEMANAL if period == "semanal" else TipoEntrega.MENSUAL
+
+        # Los que ya existen se saltan sin consultar la API (salvo --force / --incremental)
+        to_fetch = []
         for cronograma_id, presentation_date in cronogramas:
+            exists = BaseRequestModel.objects.filter(
+                cronograma=cronograma_id, tipo_entrega=tipo_entrega
+            ).exists()
+            if exists and not (force or incremental):
+                self.stdout.write(f"  ⏭️  {cronograma_id} ya existe (saltando)")
+                stats["processed"] += 1
+                stats["skipped"] += 1
+                if checkpoint:
+                    checkpoint.mark_done(cronograma_id)
+                continue
+            to_fetch.append((cronograma_id, presentation_date))
+
+        if workers > 1 and len(to_fetch) > 1:
+            self.stdout.write(f"⚡ Descargando con {workers} workers concurrentes")
+            ssn_client.set_pool_size(workers)
+            # Login antes de lanzar los threads para que no compitan por el token
+            ssn_client.warm_up(background=False)
+
+        fetched = self._fetch_cronogramas(ssn_client, period, to_fetch, workers)
+        for cronograma_id, presentation_date, fetched_data, error in fetched:
             try:
-                result = self._sync_cronograma(
-                    ssn_client=ssn_client,
+                if error is not None:
+                    raise error
+                normalized, content_hash = fetched_data
+                result = self._store_cronograma(
                     period=period,
                     cronograma_id=cronograma_id,
                     presentation_date=presentation_date,
+                    normalized=normalized,
                     dry_run=dry_run,
                     force=force,
+                    incremental=incremental,
+                    content_hash=content_hash,
                 )
                 stats["processed"] += 1
+                stats["write_seconds"] += result.get("write_seconds", 0.0)
                 if result["created"]:
                     stats["created"] += 1
                     stats["operations_created"] += result["operations"]
+                elif result.get("updated"):
+                    stats["updated"] += 1
+                    stats["rows_changed"] += result["operations"]
+                elif result.get("unchanged"):
+                    stats["unchanged"] += 1
                 elif result["skipped"]:
                     stats["skipped"] += 1
+                if checkpoint:
+                    checkpoint.mark_done(cronograma_id)
             except Exception as e:
                 stats["errors"] += 1
                 self.stdout.write(
@@ -151,6 +371,21 @@ class Command(BaseCommand):
                 )
                 logger.exception(f"Error sincronizando {cronograma_id}")
 
+        # Corrida sin errores: el checkpoint ya no hace falta para el año completo;
+        # con --cronograma solo se descartan los cronogramas de esta corrida
+        if checkpoint and stats["errors"] == 0:
+            if specific_cronograma:
+                checkpoint.forget(c[0] for c in cronogramas)
+            else:
+                checkpoint.clear()
+        elif checkpoint:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"💾 Checkpoint guardado en {checkpoint.path}: "
+                    "volver a ejecutar el comando para reintentar los fallidos"
+                )
+            )
+
         # Actualizar created_at = send_at para todos los registros sincronizados
         # (auto_now_add=True ignora valores en create(), usamos UPDATE masivo)
         updated = BaseRequestModel.objects.filter(
@@ -168,6 +403,17 @@ class Command(BaseCommand):
         self.stdout.write(f"  Saltados (ya existían): {stats['skipped']}")
         self.stdout.write(f"  Errores: {stats['errors']}")
         self.stdout.write(f"  Operaciones/Stocks creados: {stats['operations_created']}")
+        if incremental:
+            self.stdout.write(f"  Sin cambios (hash igual): {stats['unchanged']}")
+            self.stdout.write(f"  Actualizados por diff: {stats['updated']}")
+            self.stdout.write(f"  Filas insertadas/actualizadas/borradas: {stats['rows_changed']}")
+        if stats["write_seconds"] > 0:
+            rows_written = stats["operations_created"] + stats["rows_changed"]
+            rows_per_second = rows_written / stats["write_seconds"]
+            self.stdout.write(
+                f"  Escritura en base: {stats['write_seconds']:.2f}s "
+                f"({rows_per_second:,.0f} filas/s, batch {self.batch_size})"
+            )
 
     def _get_available_cronogramas(
         self, period: str, year: int
@@ -227,40 +473,102 @@ class Command(BaseCommand):
 
         return []
 
-    def _sync_cronograma(
+    def _fetch_cronogramas(
         self,
         ssn_client,
         period: str,
+        cronogramas: List[Tuple[str, Optional[str]]],
+        workers: int,
+    ) -> Iterator[Tuple[str, Optional[str], Optional[Tuple[Dict[str, Any], str]], Optional[Exception]]]:
+        """
+        Descarga y normaliza los cronogramas, secuencialmente o con un pool acotado.
+
+        Solo hace I/O de red y normalización (sin tocar la base), por lo que es
+        seguro ejecutarlo en threads. Los resultados se entregan a medida que
+        terminan para que el thread principal los persista.
+
+        Yields:
+            Tuplas (cronograma_id, fecha_presentacion, (datos_normalizados, hash), error)
+        """
+        if workers <= 1 or len(cronogramas) <= 1:
+            for cronograma_id, presentation_date in cronogramas:
+                try:
+                    normalized = self._fetch_cronograma(ssn_client, period, cronograma_id)
+                    yield cronograma_id, presentation_date, normalized, None
+                except Exception as e:
+                    yield cronograma_id, presentation_date, None, e
+            return
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ssn-sync") as executor:
+            futures = {
+                executor.submit(self._fetch_cronograma, ssn_client, period, cronograma_id): (
+                    cronograma_id,
+                    presentation_date,
+                )
+                for cronograma_id, presentation_date in cronogramas
+            }
+            for future in as_completed(futures):
+                cronograma_id, presentation_date = futures[future]
+                try:
+                    yield cronograma_id, presentation_date, future.result(), None
+                except Exception as e:
+                    yield cronograma_id, presentation_date, None, e
+
+    def _fetch_cronograma(
+        self, ssn_client, period: str, cronograma_id: str
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Consulta la API de SSN para un cronograma.
+
+        Returns:
+            Tupla (datos normalizados, hash SHA-256 de la respuesta original)
+        """
+        resource = f"entrega{period.capitalize()}?codigoCompania={settings.SSN_API_CIA}&cronograma={cronograma_id}"
+        data, status = ssn_client.get_resource(resource)
+
+        if status != 200:
+            raise Exception(f"API respondió con status {status}: {data}")
+
+        return self._normalize_data(data), self._content_hash(data)
+
+    def _content_hash(self, data: Any) -> str:
+        """Hash estable (claves ordenadas) de una respuesta de la SSN."""
+        canonical = json.dumps(
+            data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _store_cronograma(
+        self,
+        period: str,
         cronograma_id: str,
         presentation_date: Optional[str],
+        normalized: Dict[str, Any],
         dry_run: bool,
         force: bool,
+        incremental: bool = False,
+        content_hash: str = "",
     ) -> Dict[str, Any]:
         """
-        Sincroniza un cronograma específico desde SSN.
+        Persiste un cronograma ya descargado y normalizado.
         """
         tipo_entrega = TipoEntrega.SEMANAL if period == "semanal" else TipoEntrega.MENSUAL
-        
+
         # Verificar si ya existe
         existing = BaseRequestModel.objects.filter(
             cronograma=cronograma_id,
             tipo_entrega=tipo_entrega,
         ).first()
 
+        if existing and incremental and not force:
+            return self._sync_incremental(
+                existing, period, normalized, content_hash, dry_run
+            )
+
         if existing and not force:
             self.stdout.write(f"  ⏭️  {cronograma_id} ya existe (saltando)")
             return {"created": False, "skipped": True, "operations": 0}
 
-        # Consultar la API de SSN
-        resource = f"entrega{period.capitalize()}?codigoCompania={settings.SSN_API_CIA}&cronograma={cronograma_id}"
-        data, status = ssn_client.get_resource(resource)
-
-        if status != 200:
-            raise Exception(f"API respondió con status {status}: {data}")
-
-        # Normalizar datos
-        normalized = self._normalize_data(data)
-
         if dry_run:
             ops_count = len(normalized.get("operaciones", [])) or len(
                 normalized.get("stocks", [])
@@ -271,6 +579,7 @@ class Command(BaseCommand):
             return {"created": True, "skipped": False, "operations": ops_count}
 
         # Crear en la base de datos
+        write_start = time.perf_counter()
         with transaction.atomic():
             # Eliminar existente si force=True
             if existing and force:
@@ -289,6 +598,7 @@ class Command(BaseCommand):
                 cronograma=cronograma_id,
                 estado=EstadoSolicitud.PRESENTADO,
                 send_at=presentation_datetime,
+                sync_hash=content_hash,
             )
 
             # Crear operaciones/stocks
@@ -301,18 +611,256 @@ class Command(BaseCommand):
                     base_request, normalized.get("stocks", [])
                 )
 
+        write_seconds = time.perf_counter() - write_start
+
         self.stdout.write(
             self.style.SUCCESS(
                 f"  ✅ {cronograma_id}: {ops_count} operaciones/stocks creados"
             )
         )
-        return {"created": True, "skipped": False, "operations": ops_count}
+        return {
+            "created": True,
+            "skipped": False,
+            "operations": ops_count,
+            "write_seconds": write_seconds,
+        }
+
+    def _sync_incremental(
+        self,
+        base_request: BaseRequestModel,
+        period: str,
+        normalized: Dict[str, Any],
+        content_hash: str,
+        dry_run: bool,
+    ) -> Dict[str, Any]:
+        """
+        Re-sincroniza una solicitud existente aplicando solo los cambios.
+
+        Si el hash de la respuesta coincide con el guardado no se escribe nada.
+        Las solicitudes editables (con trabajo local en curso) no se tocan.
+        """
+        cronograma_id = base_request.cronograma
+
+        if base_request.is_editable:
+            self.stdout.write(
+                f"  ⏭️  {cronograma_id} en estado {base_request.estado} (editable, saltando)"
+            )
+            return {"created": False, "skipped": True, "operations": 0}
+
+        if content_hash and base_request.sync_hash == content_hash:
+            self.stdout.write(f"  ⏸️  {cronograma_id} sin cambios")
+            return {"created": False, "skipped": True, "unchanged": True, "operations": 0}
+
+        if dry_run:
+            self.stdout.write(f"  🔍 {cronograma_id}: respuesta cambió (dry-run)")
+            return {"created": False, "skipped": True, "operations": 0}
+
+        write_start = time.perf_counter()
+        with transaction.atomic():
+            counts = self._apply_row_diff(base_request, period, normalized)
+            base_request.sync_hash = content_hash
+            base_request.save(update_fields=["sync_hash", "updated_at"])
+        write_seconds = time.perf_counter() - write_start
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"  🔁 {cronograma_id}: +{counts['inserted']} ~{counts['updated']} "
+                f"-{counts['deleted']} filas"
+            )
+        )
+        return {
+            "created": False,
+            "skipped": False,
+            "updated": True,
+            "operations": sum(counts.values()),
+            "write_seconds": write_seconds,
+        }
+
+    def _apply_row_diff(
+        self, base_request: BaseRequestModel, period: str, normalized: Dict[str, Any]
+    ) -> Counter:
+        """
+        Aplica el diff entre las filas guardadas y las devueltas por la SSN.
+
+        Returns:
+            Counter con las claves inserted, updated y deleted
+        """
+        counts = Counter(inserted=0, updated=0, deleted=0)
+
+        if period == "semanal":
+            instances_by_model, canjes = self._build_operation_instances(
+                base_request, normalized.get("operaciones", [])
+            )
+            model_classes = [m for m in OPERATION_MODEL_MAP.values() if m is not CanjeOperacion]
+            counts.update(self._diff_canjes(base_request, canjes))
+        else:
+            instances_by_model = self._build_stock_instances(
+                base_request, normalized.get("stocks", [])
+            )
+            model_classes = list(STOCK_MODEL_MAP.values())
+
+        for model_class in model_classes:
+            existing = model_class.objects.filter(solicitud=base_request).order_by("pk")
+            counts.update(
+                self._diff_model_rows(
+                    model_class, list(existing), instances_by_model.get(model_class, [])
+                )
+            )
+
+        if period == "semanal":
+            # Los bulk_create/bulk_update del diff no disparan los signals del libro
+            PosicionesService.rebuild([base_request])
+        return counts
+
+    def _diff_model_rows(
+        self, model_class, existing: List[Any], incoming: List[Any]
+    ) -> Counter:
+        """
+        Empareja filas por ROW_MATCH_KEYS y aplica bulk_create / bulk_update / delete.
+        """
+        fields = [
+            f for f in model_class._meta.concrete_fields if f.name not in DIFF_IGNORED_FIELDS
+        ]
+        match_names = ROW_MATCH_KEYS.get(model_class)
+        key_fields = [f for f in fields if match_names is None or f.name in match_names]
+
+        pending = defaultdict(list)
+        for row in existing:
+            pending[self._row_values(row, key_fields)].append(row)
+
+        to_insert, to_update, changed_fields = [], [], set()
+        now = timezone.now()
+        for new_row in incoming:
+            candidates = pending.get(self._row_values(new_row, key_fields))
+            if not candidates:
+                to_insert.append(new_row)
+                continue
+            old_row = candidates.pop(0)
+            changed = [
+                f for f in fields
+                if self._comparable(f, getattr(old_row, f.attname))
+                != self._comparable(f, getattr(new_row, f.attname))
+            ]
+            if changed:
+                for f in changed:
+                    setattr(old_row, f.attname, getattr(new_row, f.attname))
+                    changed_fields.add(f.name)
+                # bulk_update no aplica auto_now
+                old_row.updated_at = now
+                to_update.append(old_row)
+
+        to_delete = [row.pk for rows in pending.values() for row in rows]
+
+        batch_size = self._get_batch_size()
+        if to_insert:
+            model_class.objects.bulk_create(to_insert, batch_size=batch_size)
+        if to_update:
+            model_class.objects.bulk_update(
+                to_update, [*sorted(changed_fields), "updated_at"], batch_size=batch_size
+            )
+        if to_delete:
+            model_class.objects.filter(pk__in=to_delete).delete()
+
+        return Counter(inserted=len(to_insert), updated=len(to_update), deleted=len(to_delete))
+
+    def _diff_canjes(
+        self, base_request: BaseRequestModel, incoming: List[Tuple[Any, Any, Any]]
+    ) -> Counter:
+        """
+        Diff de canjes: se comparan completos (canje + detalles A/B). Los que no
+        coinciden se borran y se insertan de nuevo, ya que los detalles son filas aparte.
+        """
+        canje_fields = [
+            f for f in CanjeOperacion._meta.concrete_fields
+            if f.name not in DIFF_IGNORED_FIELDS | {"detalle_a", "detalle_b"}
+        ]
+        detalle_fields = [
+            f for f in DetalleOperacionCanje._meta.concrete_fields
+            if f.name not in DIFF_IGNORED_FIELDS
+        ]
+
+        def signature(canje, detalle_a, detalle_b):
+            return (
+                self._row_values(canje, canje_fields),
+                self._row_values(detalle_a, detalle_fields),
+                self._row_values(detalle_b, detalle_fields),
+            )
+
+        pending = defaultdict(list)
+        existing = CanjeOperacion.objects.filter(solicitud=base_request).select_related(
+            "detalle_a", "detalle_b"
+        ).order_by("pk")
+        for canje in existing:
+            pending[signature(canje, canje.detalle_a, canje.detalle_b)].append(canje)
+
+        to_insert = []
+        for canje, detalle_a, detalle_b in incoming:
+            candidates = pending.get(signature(canje, detalle_a, detalle_b))
+            if candidates:
+                candidates.pop(0)
+            else:
+                to_insert.append((canje, detalle_a, detalle_b))
+
+        stale = [canje for canjes in pending.values() for canje in canjes]
+        if stale:
+            # Borrar los detalles elimina en cascada los canjes que los referencian
+            detalle_ids = [pk for c in stale for pk in (c.detalle_a_id, c.detalle_b_id)]
+            DetalleOperacionCanje.objects.filter(pk__in=detalle_ids).delete()
+
+        self._bulk_create_canjes(to_insert)
+        return Counter(inserted=len(to_insert), deleted=len(stale))
+
+    def _row_values(self, instance, fields) -> Tuple[Any, ...]:
+        return tuple(self._comparable(f, getattr(instance, f.attname)) for f in fields)
+
+    def _comparable(self, field, value) -> Any:
+        """
+        Normaliza un valor para comparar lo guardado con lo recibido de la SSN
+        (strings "2025-04-07" vs date, 71.35 vs Decimal("71.35"), "1" vs True).
+        """
+        if value is None:
+            return None
+        value = field.to_python(value)
+        if isinstance(field, models.DecimalField) and value is not None:
+            value = value.quantize(Decimal(1).scaleb(-field.decimal_places))
+        return value
 
     def _create_operations(
         self, base_request: BaseRequestModel, operations: List[Dict]
     ) -> int:
-        """Crea las operaciones semanales asociadas a una solicitud."""
+        """
+        Crea las operaciones semanales asociadas a una solicitud.
+
+        Agrupa las filas por modelo y las inserta con bulk_create. Los detalles
+        de canje se insertan primero (en bloque) para obtener sus PKs y luego
+        los canjes que los referencian.
+        """
+        instances_by_model, canjes = self._build_operation_instances(
+            base_request, operations
+        )
+
         count = 0
+        for model_class, instances in instances_by_model.items():
+            model_class.objects.bulk_create(instances, batch_size=self._get_batch_size())
+            count += len(instances)
+
+        count += self._bulk_create_canjes(canjes)
+        # bulk_create no dispara los signals del libro de posiciones
+        PosicionesService.rebuild([base_request])
+        return count
+
+    def _build_operation_instances(
+        self, base_request: BaseRequestModel, operations: List[Dict]
+    ) -> Tuple[Dict[type, List[Any]], List[Tuple[Any, Any, Any]]]:
+        """
+        Construye (sin guardar) las instancias de operaciones semanales.
+
+        Returns:
+            Tupla (instancias agrupadas por modelo, canjes como (canje, detalle_a, detalle_b))
+        """
+        instances_by_model = defaultdict(list)
+        canjes = []
+
         for op_data in operations:
             tipo = op_data.pop("tipo_operacion", None)
             model_class = OPERATION_MODEL_MAP.get(tipo)
@@ -328,22 +876,100 @@ class Command(BaseCommand):
 
             # Manejar canjes con detalles
             if tipo == "J":
-                detalles = op_data.pop("detalles", [])
-                canje = model_class.objects.create(solicitud=base_request, **op_data)
-                for detalle in detalles:
-                    DetalleOperacionCanje.objects.create(canje=canje, **detalle)
+                detalles = self._split_canje_detalles(op_data)
+                if detalles is None:
+                    logger.warning(
+                        f"Canje sin detalles A/B en {base_request.cronograma}; se omite."
+                    )
+                    continue
+                detalle_a, detalle_b = (
+                    DetalleOperacionCanje(**detalle_data) for detalle_data in detalles
+                )
+                self._round_cant_especies(detalle_a)
+                self._round_cant_especies(detalle_b)
+                canje = CanjeOperacion(solicitud=base_request, tipo_operacion=tipo, **op_data)
+                canjes.append((canje, detalle_a, detalle_b))
             else:
-                model_class.objects.create(solicitud=base_request, **op_data)
+                instance = model_class(solicitud=base_request, tipo_operacion=tipo, **op_data)
+                self._round_cant_especies(instance)
+                instances_by_model[model_class].append(instance)
 
-            count += 1
+        return instances_by_model, canjes
 
-        return count
+    def _bulk_create_canjes(self, canjes: List[Tuple[Any, Any, Any]]) -> int:
+        """
+        Inserta canjes en bloque: primero los detalles A/B y luego los canjes.
+
+        Returns:
+            Cantidad de canjes creados
+        """
+        if not canjes:
+            return 0
+
+        batch_size = self._get_batch_size()
+        detalles = [detalle for _, detalle_a, detalle_b in canjes for detalle in (detalle_a, detalle_b)]
+        # bulk_create asigna las PKs (PostgreSQL / SQLite >= 3.35)
+        DetalleOperacionCanje.objects.bulk_create(detalles, batch_size=batch_size)
+
+        for canje, detalle_a, detalle_b in canjes:
+            canje.detalle_a = detalle_a
+            canje.detalle_b = detalle_b
+        CanjeOperacion.objects.bulk_create(
+            [canje for canje, _, _ in canjes], batch_size=batch_size
+        )
+        return len(canjes)
+
+    def _get_batch_size(self) -> int:
+        return getattr(self, "batch_size", 500)
+
+    def _split_canje_detalles(
+        self, op_data: Dict[str, Any]
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Extrae los datos de los detalles A (entrega) y B (recibe) de un canje.
+
+        Acepta tanto claves detalle_a/detalle_b como una lista "detalles" [A, B].
+
+        Returns:
+            Tupla (detalle_a, detalle_b) o None si faltan detalles
+        """
+        detalle_a = op_data.pop("detalle_a", None)
+        detalle_b = op_data.pop("detalle_b", None)
+        detalles = op_data.pop("detalles", None) or []
+        if detalle_a is None and detalle_b is None and len(detalles) == 2:
+            detalle_a, detalle_b = detalles
+        if not isinstance(detalle_a, dict) or not isinstance(detalle_b, dict):
+            return None
+        return detalle_a, detalle_b
+
+    def _round_cant_especies(self, instance) -> None:
+        """
+        Replica el redondeo de save(): cant_especies entera salvo para FCI.
+
+        bulk_create no llama a save(), por lo que hay que aplicarlo a mano.
+        """
+        if getattr(instance, "cant_especies", None) is None:
+            return
+        if instance.tipo_especie != TipoEspecie.FONDOS_COMUNES_DE_INVERSIÓN:
+            instance.cant_especies = int(Decimal(str(instance.cant_especies)))
 
     def _create_stocks(
         self, base_request: BaseRequestModel, stocks: List[Dict]
     ) -> int:
-        """Crea los stocks mensuales asociados a una solicitud."""
+        """Crea los stocks mensuales asociados a una solicitud (bulk_create por modelo)."""
         count = 0
+        for model_class, instances in self._build_stock_instances(base_request, stocks).items():
+            model_class.objects.bulk_create(instances, batch_size=self._get_batch_size())
+            count += len(instances)
+
+        return count
+
+    def _build_stock_instances(
+        self, base_request: BaseRequestModel, stocks: List[Dict]
+    ) -> Dict[type, List[Any]]:
+        """Construye (sin guardar) las instancias de stocks mensuales agrupadas por modelo."""
+        instances_by_model = defaultdict(list)
+
         for stock_data in stocks:
             tipo = stock_data.pop("tipo", None)
             model_class = STOCK_MODEL_MAP.get(tipo)
@@ -360,10 +986,11 @@ class Command(BaseCommand):
             # Convertir None a 0 en campos decimales requeridos
             stock_data = self._fix_null_decimals(stock_data)
 
-            model_class.objects.create(solicitud=base_request, **stock_data)
-            count += 1
+            instances_by_model[model_class].append(
+                model_class(solicitud=base_request, **stock_data)
+            )
 
-        return count
+        return instances_by_model
 
     def _fix_null_decimals(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -388,68 +1015,9 @@ class Command(BaseCommand):
 
     def _normalize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Normaliza los datos de la API de SSN:
+        Normaliza los datos de la API de SSN (una sola pasada, ver normalize_ssn_payload):
         - Convierte camelCase a snake_case
         - Convierte fechas ddmmyyyy a ISO (yyyy-mm-dd)
         - Elimina strings vacíos
         """
-        data = self._dict_keys_to_snake(data)
-        data = self._convert_dates(data)
-        data = self._remove_empty_strings(data)
-        return data
-
-    def _camel_to_snake(self, name: str) -> str:
-        """Convierte camelCase/PascalCase a snake_case."""
-        s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
-        return re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
-
-    def _dict_keys_to_snake(self, obj: Any) -> Any:
-        """Recursivamente convierte keys de dict a snake_case."""
-        if isinstance(obj, dict):
-            return {
-                self._camel_to_snake(k): self._dict_keys_to_snake(v)
-                for k, v in obj.items()
-            }
-        elif isinstance(obj, list):
-            return [self._dict_keys_to_snake(item) for item in obj]
-        return obj
-
-    def _convert_dates(self, obj: Any) -> Any:
-        """Recursivamente convierte fechas ddmmyyyy a ISO."""
-        if isinstance(obj, dict):
-            new_dict = {}
-            for k, v in obj.items():
-                if "fecha" in k.lower() and isinstance(v, str) and re.fullmatch(
-                    r"\d{8}", v
-                ):
-                    try:
-                        new_dict[k] = datetime.datetime.strptime(
-                            v, "%d%m%Y"
-                        ).date().isoformat()
-                    except ValueError:
-                        new_dict[k] = v
-                else:
-                    new_dict[k] = self._convert_dates(v)
-            return new_dict
-        elif isinstance(obj, list):
-            return [self._convert_dates(item) for item in obj]
-        return obj
-
-    def _remove_empty_strings(self, obj: Any) -> Any:
-        """
-        Recursivamente elimina pares key:value donde value es string vacío.
-        También convierte el string "null" a None real de Python.
-        """
-        if isinstance(obj, dict):
-            result = {}
-            for k, v in obj.items():
-                if v == "":
-                    continue  # Eliminar strings vacíos
-                elif v == "null":
-                    result[k] = None  # Convertir string "null" a None
-                else:
-                    result[k] = self._remove_empty_strings(v)
-            return result
-        elif isinstance(obj, list):
-            return [self._remove_empty_strings(item) for item in obj]
-        return obj
+        return normalize_ssn_payload(data)
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 00:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operaciones', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baserequestmodel',
+            name='sync_hash',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Hash SHA-256 de la última respuesta de la SSN sincronizada (sync_ssn_data)', max_length=64),
+        ),
+    ]
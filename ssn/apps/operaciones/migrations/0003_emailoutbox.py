@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-17 00:56
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operaciones', '0002_baserequestmodel_sync_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(help_text='Origen del email (ej: presentacion, alertas)', max_length=32)),
+                ('subject', models.CharField(max_length=255)),
+                ('html_body', models.TextField()),
+                ('recipients', models.JSONField(default=list, help_text='Lista de destinatarios')),
+                ('enviados', models.PositiveIntegerField(default=0, help_text='Destinatarios ya entregados (los lotes siguientes retoman desde aquí)')),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('ENVIADO', 'Enviado'), ('ERROR', 'Error')], default='PENDIENTE', max_length=16)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='No se intenta entregar antes de esta fecha (backoff / lease del dispatcher)')),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Email en cola',
+                'verbose_name_plural': 'Emails en cola',
+                'db_table': 'db_email_outbox',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['estado', 'next_attempt_at'], name='db_email_ou_estado_c9fc23_idx')],
+            },
+        ),
+    ]
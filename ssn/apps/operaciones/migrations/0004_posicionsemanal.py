@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:19
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operaciones', '0003_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PosicionSemanal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_especie', models.CharField(max_length=2)),
+                ('codigo_especie', models.CharField(max_length=20)),
+                ('codigo_afectacion', models.CharField(max_length=3)),
+                ('tipo_valuacion', models.CharField(max_length=1)),
+                ('cantidad_compras', models.DecimalField(decimal_places=6, default=Decimal('0'), max_digits=20)),
+                ('compras', models.IntegerField(default=0, help_text='Compras acumuladas en la fila')),
+                ('cantidad_ventas', models.DecimalField(decimal_places=6, default=Decimal('0'), max_digits=20)),
+                ('ventas', models.IntegerField(default=0, help_text='Ventas acumuladas en la fila')),
+                ('cantidad_canje_ingreso', models.DecimalField(decimal_places=6, default=Decimal('0'), help_text='Especies recibidas por canje (detalle B)', max_digits=20)),
+                ('cantidad_canje_egreso', models.DecimalField(decimal_places=6, default=Decimal('0'), help_text='Especies entregadas por canje (detalle A)', max_digits=20)),
+                ('canjes', models.IntegerField(default=0, help_text='Detalles de canje acumulados en la fila')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('solicitud', models.ForeignKey(help_text='Solicitud semanal a la que pertenecen los movimientos', on_delete=django.db.models.deletion.CASCADE, related_name='posiciones', to='operaciones.baserequestmodel')),
+            ],
+            options={
+                'verbose_name': 'Posición semanal',
+                'verbose_name_plural': 'Posiciones semanales',
+                'db_table': 'db_posiciones_semanales',
+                'constraints': [models.UniqueConstraint(fields=('solicitud', 'tipo_especie', 'codigo_especie', 'codigo_afectacion', 'tipo_valuacion'), name='posicion_semanal_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+"""
+Carga inicial del libro de posiciones (PosicionSemanal) desde las operaciones
+ya guardadas. Misma agregación que PosicionesService.rebuild(), con los
+modelos históricos de la migración.
+"""
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+KEY_FIELDS = ("tipo_especie", "codigo_especie", "codigo_afectacion", "tipo_valuacion")
+
+
+def backfill_posiciones(apps, schema_editor):
+    PosicionSemanal = apps.get_model("operaciones", "PosicionSemanal")
+    filas = {}
+
+    def acumular(fila, campos, campo_cantidad, campo_conteo):
+        clave = (fila["solicitud_id"], *(fila[campo] for campo in campos))
+        posicion = filas.get(clave)
+        if posicion is None:
+            posicion = filas[clave] = PosicionSemanal(
+                solicitud_id=fila["solicitud_id"], **dict(zip(KEY_FIELDS, clave[1:]))
+            )
+        setattr(posicion, campo_cantidad, getattr(posicion, campo_cantidad) + fila["cantidad"])
+        setattr(posicion, campo_conteo, getattr(posicion, campo_conteo) + fila["n"])
+
+    movimientos = [
+        ("CompraOperacion", "", "cantidad_compras", "compras"),
+        ("VentaOperacion", "", "cantidad_ventas", "ventas"),
+        ("CanjeOperacion", "detalle_a__", "cantidad_canje_egreso", "canjes"),
+        ("CanjeOperacion", "detalle_b__", "cantidad_canje_ingreso", "canjes"),
+    ]
+    for model_name, prefix, campo_cantidad, campo_conteo in movimientos:
+        campos = [f"{prefix}{field}" for field in KEY_FIELDS]
+        agregados = (
+            apps.get_model("operaciones", model_name).objects
+            .filter(solicitud_id__isnull=False)  # operaciones huérfanas no tienen posición
+            .values("solicitud_id", *campos)
+            .annotate(cantidad=Sum(f"{prefix}cant_especies"), n=Count("pk"))
+            .order_by()
+        )
+        for fila in agregados:
+            acumular(fila, campos, campo_cantidad, campo_conteo)
+
+    PosicionSemanal.objects.bulk_create(filas.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("operaciones", "0004_posicionsemanal"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_posiciones, migrations.RunPython.noop),
+    ]
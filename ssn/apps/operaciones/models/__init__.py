@@ -5,6 +5,8 @@ Estructura:
 - base/: Clases base abstractas y mixins
 - semanal/: Operaciones semanales (Compra, Venta, Canje, Plazo Fijo)
 - mensual/: Stocks mensuales (Inversión, Plazo Fijo, Cheque PD)
+- email_outbox: Bandeja de salida de emails (dispatch_emails)
+- posicion: Libro de posiciones de inversión por semana
 """
 
 # Choices
@@ -30,6 +32,9 @@ from .semanal import (
     DetalleOperacionCanje,
 )
 
+# Bandeja de salida de emails
+from .email_outbox import EmailOutbox, EstadoEmail
+
 # Stocks mensuales
 from .mensual import (
     InversionStock,
@@ -37,6 +42,9 @@ from .mensual import (
     ChequePagoDiferidoStock,
 )
 
+# Libro de posiciones
+from .posicion import PosicionSemanal
+
 
 __all__ = [
     # Choices
@@ -59,5 +67,10 @@ __all__ = [
     "InversionStock",
     "PlazoFijoStock",
     "ChequePagoDiferidoStock",
+    # Emails
+    "EmailOutbox",
+    "EstadoEmail",
+    # Posiciones
+    "PosicionSemanal",
 ]
 
@@ -43,6 +43,13 @@ class BaseRequestModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
     send_at = models.DateTimeField(null=True, blank=True)
+    sync_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Hash SHA-256 de la última respuesta de la SSN sincronizada (sync_ssn_data)",
+    )
 
     @property
     def is_editable(self):
@@ -60,49 +67,77 @@ class BaseRequestModel(models.Model):
             EstadoSolicitud.A_RECTIFICAR,
         ]
 
-    def sync_estado_con_ssn(self):
+    def estado_desde_ssn(self, estado_ssn):
         """
-        Sincroniza el estado local con el estado en la SSN.
-        Retorna True si hubo cambio de estado, False en caso contrario.
+        Traduce un estado de la SSN al estado local que corresponde aplicar.
 
         Regla de no-regresión: si el estado local es RECTIFICACION_PENDIENTE y la SSN
         todavía devuelve PRESENTADO, significa que la SSN aún no procesó la solicitud
         de rectificación. En ese caso NO se sobreescribe el estado local.
+
+        Args:
+            estado_ssn: Estado normalizado devuelto por la SSN (EstadoSSN)
+
+        Returns:
+            El nuevo EstadoSolicitud, o None si no corresponde cambiar el estado.
+        """
+        from ssn_client.services import EstadoSSN
+        import logging
+
+        logger = logging.getLogger("operaciones")
+
+        if self.estado == EstadoSolicitud.BORRADOR or not estado_ssn:
+            return None
+
+        estado_local_mapping = {
+            EstadoSSN.VACIO: EstadoSolicitud.BORRADOR,
+            EstadoSSN.CARGADO: EstadoSolicitud.CARGADO,
+            EstadoSSN.PRESENTADO: EstadoSolicitud.PRESENTADO,
+            EstadoSSN.RECTIFICACION_PENDIENTE: EstadoSolicitud.RECTIFICACION_PENDIENTE,
+            EstadoSSN.A_RECTIFICAR: EstadoSolicitud.A_RECTIFICAR,
+        }
+
+        nuevo_estado = estado_local_mapping.get(estado_ssn)
+
+        # Protección: no revertir RECTIFICACION_PENDIENTE a PRESENTADO.
+        # Ocurre inmediatamente después de solicitar la rectificación,
+        # cuando la SSN aún no reflejó el cambio.
+        if (
+            self.estado == EstadoSolicitud.RECTIFICACION_PENDIENTE
+            and nuevo_estado == EstadoSolicitud.PRESENTADO
+        ):
+            logger.info(
+                f"Sync omitida para {self.uuid}: estado local RECTIFICACION_PENDIENTE "
+                f"conservado (SSN aún reporta PRESENTADO)."
+            )
+            return None
+
+        if nuevo_estado and nuevo_estado != self.estado:
+            return nuevo_estado
+        return None
+
+    def sync_estado_con_ssn(self):
+        """
+        Sincroniza el estado local con el estado en la SSN.
+        Retorna True si hubo cambio de estado, False en caso contrario.
+
+        El mapeo y la regla de no-regresión viven en estado_desde_ssn(), que
+        también usa el comando reconcile_ssn_status.
         """
         if self.estado == EstadoSolicitud.BORRADOR:
             return False
 
-        from ssn_client.services import consultar_estado_ssn, EstadoSSN
+        from ssn_client.services import consultar_estado_ssn_cacheado
         import logging
 
         logger = logging.getLogger("operaciones")
-        estado_ssn, _, status = consultar_estado_ssn(self)
+        # Lectura cacheada (TTL corto, single-flight): abrir o paginar la lista
+        # no dispara una consulta a la SSN por cada vista.
+        estado_ssn, _, status = consultar_estado_ssn_cacheado(self)
 
         if status < 400 and estado_ssn:
-            estado_local_mapping = {
-                EstadoSSN.VACIO: EstadoSolicitud.BORRADOR,
-                EstadoSSN.CARGADO: EstadoSolicitud.CARGADO,
-                EstadoSSN.PRESENTADO: EstadoSolicitud.PRESENTADO,
-                EstadoSSN.RECTIFICACION_PENDIENTE: EstadoSolicitud.RECTIFICACION_PENDIENTE,
-                EstadoSSN.A_RECTIFICAR: EstadoSolicitud.A_RECTIFICAR,
-            }
-
-            nuevo_estado = estado_local_mapping.get(estado_ssn)
-
-            # Protección: no revertir RECTIFICACION_PENDIENTE a PRESENTADO.
-            # Ocurre inmediatamente después de solicitar la rectificación,
-            # cuando la SSN aún no reflejó el cambio.
-            if (
-                self.estado == EstadoSolicitud.RECTIFICACION_PENDIENTE
-                and nuevo_estado == EstadoSolicitud.PRESENTADO
-            ):
-                logger.info(
-                    f"Sync omitida para {self.uuid}: estado local RECTIFICACION_PENDIENTE "
-                    f"conservado (SSN aún reporta PRESENTADO)."
-                )
-                return False
-
-            if nuevo_estado and nuevo_estado != self.estado:
+            nuevo_estado = self.estado_desde_ssn(estado_ssn)
+            if nuevo_estado:
                 logger.info(
                     f"Sincronizando estado de {self.uuid}: "
                     f"{self.estado} -> {nuevo_estado} (SSN: {estado_ssn})"
@@ -0,0 +1,57 @@
+"""
+Bandeja de salida de emails (outbox).
+
+Los emails se encolan ya renderizados y el comando dispatch_emails los entrega
+en segundo plano (SMTP o Mailsender), con reintentos y backoff exponencial.
+"""
+
+from django.db import models
+from django.utils import timezone
+
+
+class EstadoEmail(models.TextChoices):
+    PENDIENTE = "PENDIENTE", "Pendiente"
+    ENVIADO = "ENVIADO", "Enviado"
+    ERROR = "ERROR", "Error"
+
+
+class EmailOutbox(models.Model):
+    """Email pendiente de entrega."""
+
+    tipo = models.CharField(
+        max_length=32,
+        help_text="Origen del email (ej: presentacion, alertas)",
+    )
+    subject = models.CharField(max_length=255)
+    html_body = models.TextField()
+    recipients = models.JSONField(
+        default=list, help_text="Lista de destinatarios"
+    )
+    enviados = models.PositiveIntegerField(
+        default=0,
+        help_text="Destinatarios ya entregados (los lotes siguientes retoman desde aquí)",
+    )
+    estado = models.CharField(
+        max_length=16,
+        choices=EstadoEmail.choices,
+        default=EstadoEmail.PENDIENTE,
+    )
+    intentos = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="No se intenta entregar antes de esta fecha (backoff / lease del dispatcher)",
+    )
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.tipo} | {self.subject} | {self.estado}"
+
+    class Meta:
+        app_label = "operaciones"
+        verbose_name = "Email en cola"
+        verbose_name_plural = "Emails en cola"
+        db_table = "db_email_outbox"
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["estado", "next_attempt_at"])]
@@ -0,0 +1,72 @@
+"""
+Libro de posiciones de inversión por semana.
+
+Acumula, por solicitud semanal y por clave de posición (la misma que usa
+MonthlyReportGeneratorService para el stock de inversión), las cantidades
+compradas, vendidas y canjeadas. Se mantiene incrementalmente con signals al
+guardar o borrar compras, ventas y canjes (ver operaciones/signals.py), y se
+reconstruye con PosicionesService.rebuild() después de los caminos bulk.
+
+La generación mensual lee estas filas (O(posiciones)) en lugar de recorrer
+todas las operaciones de las semanas del mes.
+"""
+
+from decimal import Decimal
+
+from django.db import models
+
+
+class PosicionSemanal(models.Model):
+    """Movimientos netos de una posición de inversión en una semana."""
+
+    solicitud = models.ForeignKey(
+        "operaciones.BaseRequestModel",
+        on_delete=models.CASCADE,
+        related_name="posiciones",
+        help_text="Solicitud semanal a la que pertenecen los movimientos",
+    )
+    tipo_especie = models.CharField(max_length=2)
+    codigo_especie = models.CharField(max_length=20)
+    codigo_afectacion = models.CharField(max_length=3)
+    tipo_valuacion = models.CharField(max_length=1)
+
+    cantidad_compras = models.DecimalField(max_digits=20, decimal_places=6, default=Decimal("0"))
+    compras = models.IntegerField(default=0, help_text="Compras acumuladas en la fila")
+    cantidad_ventas = models.DecimalField(max_digits=20, decimal_places=6, default=Decimal("0"))
+    ventas = models.IntegerField(default=0, help_text="Ventas acumuladas en la fila")
+    cantidad_canje_ingreso = models.DecimalField(
+        max_digits=20, decimal_places=6, default=Decimal("0"),
+        help_text="Especies recibidas por canje (detalle B)",
+    )
+    cantidad_canje_egreso = models.DecimalField(
+        max_digits=20, decimal_places=6, default=Decimal("0"),
+        help_text="Especies entregadas por canje (detalle A)",
+    )
+    canjes = models.IntegerField(default=0, help_text="Detalles de canje acumulados en la fila")
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def vacia(self) -> bool:
+        return not (self.compras or self.ventas or self.canjes)
+
+    def __str__(self):
+        return (
+            f"{self.solicitud_id} | {self.tipo_especie} {self.codigo_especie} "
+            f"+{self.cantidad_compras} -{self.cantidad_ventas}"
+        )
+
+    class Meta:
+        app_label = "operaciones"
+        verbose_name = "Posición semanal"
+        verbose_name_plural = "Posiciones semanales"
+        db_table = "db_posiciones_semanales"
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "solicitud", "tipo_especie", "codigo_especie",
+                    "codigo_afectacion", "tipo_valuacion",
+                ],
+                name="posicion_semanal_unica",
+            )
+        ]
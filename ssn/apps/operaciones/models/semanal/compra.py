@@ -69,7 +69,7 @@ class CompraOperacion(
         super().save(*args, **kwargs)
 
     def __str__(self):
-        from ...helpers.text_utils import format_ar_number
+        from ...helpers.number_utils import format_ar_number
         return f"Compra: {self.codigo_especie} x {format_ar_number(self.cant_especies)}"
 
     class Meta:
@@ -41,6 +41,11 @@ class PlazoFijoOperacion(
         help_text="Solicitud a la que pertenece este plazo fijo",
     )
 
+    @property
+    def fecha_operacion(self):
+        """Alias para fecha_constitucion (mismo rol que fecha_movimiento en el resto)."""
+        return self.fecha_constitucion
+
     def clean(self):
         super().clean()
         errors = {}
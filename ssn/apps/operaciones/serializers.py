@@ -1,15 +1,40 @@
+import copy
 import logging
+import time
 import uuid
+from collections import Counter
+from functools import lru_cache
 
+from django.conf import settings
 from django.db import models
 from rest_framework import serializers
 
-from .models import BaseRequestModel, TipoEspecie
+from .helpers.number_utils import format_cantidad, format_entero, format_max_decimales
+from .models import BaseRequestModel, DetalleOperacionCanje, TipoEspecie
 
 # Configuración del logger
 logger = logging.getLogger("operaciones")
 
 
+# =============================================================================
+# REGLAS DE FORMATEO NUMÉRICO SSN (compartidas con encoders.py)
+# Los formateadores viven en helpers/number_utils.py (Decimal, sin float)
+# =============================================================================
+
+# Cantidad de especies (14,6): decimales solo para FCI
+CANTIDAD_FIELDS = ("cant_especies", "cantidad_devengado_especies", "cantidad_percibido_especies")
+
+# Enteros sin decimales (Number 10, 14, etc.)
+INTEGER_FIELDS = (
+    "valor_contable", "prevision_desvalorizacion", "valor_financiero",
+    "valor_nominal_origen", "valor_nominal_nacional", "valor_nominal",
+    "valor_adquisicion",
+)
+
+# Campos con tope de decimales, sin ceros innecesarios
+MAX_DECIMALS_FIELDS = {"tasa": 3, "precio_pase_vt": 2}
+
+
 def transform_representation(data):
     """
     Transforma las claves de un diccionario a camelCase.
@@ -33,8 +58,6 @@ def transform_representation(data):
             transformed[key] = str(v)
         else:
             transformed[key] = v
-
-    logger.debug(f"Transformación camelCase completada: {len(data)} campos procesados")
     return transformed
 
 
@@ -54,9 +77,7 @@ class CustomDateField(serializers.DateField):
         Returns:
             str: Fecha formateada o None
         """
-        formatted = value.strftime("%d%m%Y") if value else None
-        logger.debug(f"Fecha formateada: {value} -> {formatted}")
-        return formatted
+        return value.strftime("%d%m%Y") if value else None
 
 
 class CustomBooleanField(serializers.BooleanField):
@@ -75,9 +96,7 @@ class CustomBooleanField(serializers.BooleanField):
         Returns:
             str: "1" para True, "0" para False
         """
-        formatted = "1" if value else "0"
-        logger.debug(f"Valor booleano formateado: {value} -> {formatted}")
-        return formatted
+        return "1" if value else "0"
 
 
 class CamelCaseModelSerializer(serializers.ModelSerializer):
@@ -110,51 +129,40 @@ class CamelCaseModelSerializer(serializers.ModelSerializer):
         # =====================================================================
 
         # --- Campos de cantidad de especies (14,6): 6 decimales solo para FC ---
-        cantidad_fields = ["cant_especies", "cantidad_devengado_especies", "cantidad_percibido_especies"]
-        for field in cantidad_fields:
+        for field in CANTIDAD_FIELDS:
             if field in original and original[field] is not None:
-                if is_fci:
-                    # FCI: mantener decimales (hasta 6)
-                    original[field] = str(original[field])
-                else:
-                    # Otros: solo enteros
-                    original[field] = str(int(float(original[field])))
+                original[field] = format_cantidad(original[field], is_fci)
 
         # --- Campos enteros sin decimales (Number 10, 14, etc.) ---
-        integer_fields = [
-            "valor_contable", "prevision_desvalorizacion", "valor_financiero",
-            "valor_nominal_origen", "valor_nominal_nacional", "valor_nominal",
-            "valor_adquisicion"
-        ]
-        for field in integer_fields:
+        for field in INTEGER_FIELDS:
             if field in original and original[field] is not None:
-                original[field] = str(int(float(original[field])))
-
-        # --- Tasa (2,3): mantener hasta 3 decimales ---
-        if "tasa" in original and original["tasa"] is not None:
-            # Formatear con hasta 3 decimales, sin ceros innecesarios
-            tasa_val = float(original["tasa"])
-            if tasa_val == int(tasa_val):
-                original["tasa"] = str(int(tasa_val))
-            else:
-                original["tasa"] = str(round(tasa_val, 3)).rstrip('0').rstrip('.')
-
-        # --- Precio pase VT (6,2): hasta 2 decimales ---
-        if "precio_pase_vt" in original and original["precio_pase_vt"] is not None:
-            precio_val = float(original["precio_pase_vt"])
-            if precio_val == int(precio_val):
-                original["precio_pase_vt"] = str(int(precio_val))
-            else:
-                original["precio_pase_vt"] = str(round(precio_val, 2)).rstrip('0').rstrip('.')
-
-        transformed = transform_representation(original)
-
-        if hasattr(instance, "pk"):
-            logger.debug(
-                f"Serialización completada para instancia ID: {instance.pk}, modelo: {instance.__class__.__name__}"
-            )
-
-        return transformed
+                original[field] = format_entero(original[field])
+
+        # --- Tasa (2,3) y precio pase VT (6,2): hasta 3 / 2 decimales ---
+        for field, places in MAX_DECIMALS_FIELDS.items():
+            if field in original and original[field] is not None:
+                original[field] = format_max_decimales(original[field], places)
+
+        return transform_representation(original)
+
+    def get_fields(self):
+        """
+        Devuelve los campos del serializador a partir de un caché por clase.
+
+        DRF introspecciona el modelo (get_field_info, build_field) cada vez que
+        se instancia un ModelSerializer. El resultado solo depende de la clase,
+        así que se calcula una vez y cada instancia recibe una copia (los campos
+        se "bindean" al serializador y no pueden compartirse).
+
+        Returns:
+            dict: Campos del serializador (copia del caché de la clase)
+        """
+        cls = type(self)
+        cached = cls.__dict__.get("_cached_fields")
+        if cached is None:
+            cached = super().get_fields()
+            cls._cached_fields = cached
+        return copy.deepcopy(cached)
 
     def build_standard_field(self, field_name, model_field):
         """
@@ -173,10 +181,10 @@ class CamelCaseModelSerializer(serializers.ModelSerializer):
         )
         if isinstance(model_field, (models.DateField, models.DateTimeField)):
             field_class = CustomDateField
-            logger.debug(f"Campo de fecha personalizado aplicado: {field_name}")
+            logger.debug("Campo de fecha personalizado aplicado: %s", field_name)
         elif isinstance(model_field, models.BooleanField):
             field_class = CustomBooleanField
-            logger.debug(f"Campo booleano personalizado aplicado: {field_name}")
+            logger.debug("Campo booleano personalizado aplicado: %s", field_name)
 
         return field_class, field_kwargs
 
@@ -189,7 +197,17 @@ class BaseModelSerializer(CamelCaseModelSerializer):
 
     class Meta:
         model = BaseRequestModel
-        exclude = ["uuid", "send_at", "created_at", "updated_at", "estado"]
+        exclude = ["uuid", "send_at", "created_at", "updated_at", "estado", "sync_hash"]
+
+
+class DetalleCanjeSerializer(CamelCaseModelSerializer):
+    """
+    Serializador de los detalles A y B de un canje (anidados en la operación).
+    """
+
+    class Meta:
+        model = DetalleOperacionCanje
+        exclude = ["id", "comprobante"]
 
 
 def create_model_serializer(tipo_operacion):
@@ -225,19 +243,71 @@ def create_model_serializer(tipo_operacion):
         # Operaciones semanales también excluyen timestamps
         exclude_fields = ["id", "comprobante", "solicitud", "created_at", "updated_at"]
 
-    class DynamicModelSerializer(CamelCaseModelSerializer):
-        """
-        Serializador dinámico para un tipo específico de operación.
-        """
-
-        class Meta:
-            model = model_class
-            exclude = exclude_fields
+    # El canje no tiene comprobante propio (lo tienen sus detalles): excluir
+    # solo los campos que existen en el modelo
+    model_field_names = {f.name for f in model_class._meta.get_fields()}
+    exclude_fields = [f for f in exclude_fields if f in model_field_names]
+
+    attrs = {}
+    if tipo_operacion == "J":
+        # Los detalles A y B se envían anidados, no como IDs
+        attrs["detalle_a"] = DetalleCanjeSerializer()
+        attrs["detalle_b"] = DetalleCanjeSerializer()
+
+    attrs["Meta"] = type("Meta", (), {"model": model_class, "exclude": exclude_fields})
+    attrs["__doc__"] = "Serializador dinámico para un tipo específico de operación."
+    DynamicModelSerializer = type(
+        "DynamicModelSerializer", (CamelCaseModelSerializer,), attrs
+    )
 
     logger.debug(f"Serializador creado para modelo: {model_class.__name__}")
     return DynamicModelSerializer
 
 
+@lru_cache(maxsize=None)
+def get_operation_serializer(tipo_operacion):
+    """
+    Registro de serializadores por tipo de operación.
+
+    Cada clase se construye una sola vez por proceso (create_model_serializer
+    crea una clase nueva en cada llamada y DRF vuelve a introspeccionar el modelo).
+
+    Args:
+        tipo_operacion (str): Código del tipo de operación
+
+    Returns:
+        class: Clase de serializador registrada para el tipo de operación
+
+    Raises:
+        ValueError: Si el tipo de operación no es válido
+    """
+    return create_model_serializer(tipo_operacion)
+
+
+def log_payload_summary(base_instance, origen, counts, errores, elapsed):
+    """
+    Resumen agregado (INFO) de la serialización de un payload.
+
+    Reemplaza a los logs por campo/fila: una sola línea por solicitud con las
+    filas por tipo, los errores y el tiempo total. Se emite solo con
+    SSN_SERIALIZER_STATS=True.
+
+    Args:
+        base_instance: Instancia de BaseRequestModel serializada
+        origen (str): Camino que armó el payload ("serializer" o "encoder")
+        counts (Counter): Filas serializadas por tipo de operación/stock
+        errores (int): Filas descartadas por error
+        elapsed (float): Segundos totales
+    """
+    if not getattr(settings, "SSN_SERIALIZER_STATS", False):
+        return
+    por_tipo = ", ".join(f"{tipo}={n}" for tipo, n in sorted(counts.items())) or "-"
+    logger.info(
+        "Payload %s (%s): %d filas [%s], %d errores, %.1f ms",
+        base_instance.uuid, origen, sum(counts.values()), por_tipo, errores, elapsed * 1000,
+    )
+
+
 def serialize_operations(base_instance, operations, pre_serialized=False):
     """
     Serializa una instancia base y las operaciones/stocks asociadas.
@@ -258,70 +328,59 @@ def serialize_operations(base_instance, operations, pre_serialized=False):
     logger.info(
         f"Serializando solicitud {base_instance.uuid} con {len(operations)} operaciones/stocks"
     )
+    start = time.perf_counter()
 
     base_data = BaseModelSerializer(base_instance).data
     is_monthly = base_instance.tipo_entrega == TipoEntrega.MENSUAL
+    list_key = "stocks" if is_monthly else "operaciones"
 
     if pre_serialized:
         logger.debug("Usando operaciones pre-serializadas")
-        if is_monthly:
-            base_data["stocks"] = operations
-        else:
-            base_data["operaciones"] = operations
-    else:
-        logger.debug("Serializando cada operación/stock individualmente")
-
-        if is_monthly:
-            # Para entregas mensuales: un único array "stocks" con campo "tipo" en cada uno
-            stocks = []
-
-            for op in operations:
-                try:
-                    tipo_op = getattr(op, "tipo_operacion", None)
-                    tipo_stock = getattr(op, "tipo", None)  # I, P, o C para SSN
-                    
-                    if tipo_op is None:
-                        logger.warning(
-                            f"No se encontró tipo_operacion para instancia {op}."
-                        )
-                        continue
-
-                    serializer_class = create_model_serializer(tipo_op)
-                    serialized_data = serializer_class(op).data
-                    
-                    # El campo "tipo" ya viene del modelo (I=Inversión, P=PlazoFijo, C=Cheque)
-                    # Asegurarse de que esté al principio
-                    if "tipo" not in serialized_data:
-                        serialized_data["tipo"] = tipo_stock
-                    
-                    stocks.append(serialized_data)
-                    logger.debug(f"Stock tipo {tipo_stock} serializado correctamente")
-                except Exception as e:
-                    logger.error(f"Error al serializar stock: {str(e)}")
-
-            base_data["stocks"] = stocks
-            logger.debug(f"Total stocks serializados: {len(stocks)}")
-        else:
-            # Estructura original para entregas semanales
-            serialized_ops = []
-
-            for op in operations:
-                try:
-                    tipo = getattr(op, "tipo_operacion", None)
-                    if tipo is None:
-                        logger.warning(
-                            f"No se encontró tipo_operacion para instancia {op}."
-                        )
-                        continue
-
-                    serializer_class = create_model_serializer(tipo)
-                    serialized_data = serializer_class(op).data
-                    serialized_ops.append(serialized_data)
-                    logger.debug(f"Operación tipo {tipo} serializada correctamente")
-                except Exception as e:
-                    logger.error(f"Error al serializar operación: {str(e)}")
-
-            base_data["operaciones"] = serialized_ops
-            logger.debug(f"Total de operaciones serializadas: {len(serialized_ops)}")
+        base_data[list_key] = operations
+        return base_data
+
+    # El nivel se consulta una vez por payload: las filas no arman mensajes
+    # de log que nadie va a leer
+    debug = logger.isEnabledFor(logging.DEBUG)
+    counts = Counter()
+    errores = 0
+
+    # Una instancia de serializador por tipo para todo el payload: los campos
+    # se construyen una vez y se reutilizan en cada fila
+    serializers_by_tipo = {}
+
+    def get_serializer(tipo):
+        serializer = serializers_by_tipo.get(tipo)
+        if serializer is None:
+            serializer = serializers_by_tipo[tipo] = get_operation_serializer(tipo)()
+        return serializer
+
+    serialized = []
+    for op in operations:
+        try:
+            tipo = getattr(op, "tipo_operacion", None)
+            if tipo is None:
+                logger.warning(f"No se encontró tipo_operacion para instancia {op}.")
+                continue
+
+            serialized_data = get_serializer(tipo).to_representation(op)
+
+            # Para entregas mensuales: un único array "stocks" con campo "tipo"
+            # en cada uno (I=Inversión, P=PlazoFijo, C=Cheque), que ya viene del modelo
+            if is_monthly and "tipo" not in serialized_data:
+                serialized_data["tipo"] = getattr(op, "tipo", None)
+
+            serialized.append(serialized_data)
+            counts[tipo] += 1
+            if debug:
+                logger.debug("Fila tipo %s serializada (pk=%s)", tipo, op.pk)
+        except Exception as e:
+            errores += 1
+            logger.error(f"Error al serializar operación/stock: {str(e)}")
+
+    base_data[list_key] = serialized
+    if debug:
+        logger.debug("Total de %s serializados: %d", list_key, len(serialized))
+    log_payload_summary(base_instance, "serializer", counts, errores, time.perf_counter() - start)
 
     return base_data
@@ -1,8 +1,9 @@
 from .operacion_service import OperacionesService
 from .session_service import SessionService
 from .solicitud_preview_service import SolicitudPreviewService
-from .monthly_report_service import MonthlyReportGeneratorService, GenerationResult
+from .monthly_report_service import GenerationResult, MonthlyReportGeneratorService, MonthlyStocks
 from .validation_service import SolicitudValidationService, ValidationResult
+from .posicion_service import PosicionesService
 
 __all__ = [
     "SessionService",
@@ -10,6 +11,8 @@ __all__ = [
     "OperacionesService",
     "MonthlyReportGeneratorService",
     "GenerationResult",
+    "MonthlyStocks",
     "SolicitudValidationService",
     "ValidationResult",
+    "PosicionesService",
 ]
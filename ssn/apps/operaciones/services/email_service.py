@@ -13,20 +13,29 @@ Mismo patrón que usa el dispatcher (identidad.py → authenticate_service()).
 El from_email no se pasa: Mailsender usa el sender configurado en SendGrid por defecto.
 
 Throttle de alertas: un email de vencimientos por día vía FileBasedCache ("alerts" backend).
+
+Bandeja de salida (EMAIL_OUTBOX_ENABLED=True): la confirmación de presentación
+se encola en EmailOutbox (PresentacionEmailService.queue_confirmacion) y la
+entrega el comando dispatch_emails con reintentos, backoff exponencial y lotes
+de destinatarios, de modo que el envío a la SSN no espera al servidor de correo.
+Sin la bandeja (default) se envía en el momento, como siempre: así no quedan
+emails encolados sin entregar si dispatch_emails no está programado.
 """
 
 import datetime
 import logging
 import time as _time
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import requests
 from django.conf import settings
 from django.core.cache import caches
-from django.core.mail import send_mail
+from django.core.mail import get_connection, send_mail
 from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.html import strip_tags
 
+from operaciones.models import EmailOutbox, EstadoEmail
 from operaciones.services.alert_service import Alert, AlertLevel
 
 logger = logging.getLogger("operaciones")
@@ -226,6 +235,145 @@ class PresentacionEmailService:
             return False
 
 
+    @staticmethod
+    def deliver_confirmacion(base_request, operations, ssn_message: str = "") -> bool:
+        """
+        Encola la confirmación si EMAIL_OUTBOX_ENABLED está activo; si no, la envía ya.
+
+        Returns:
+            True si quedó encolada o enviada, False si no hay destinatarios o falló.
+        """
+        if getattr(settings, "EMAIL_OUTBOX_ENABLED", False):
+            return PresentacionEmailService.queue_confirmacion(
+                base_request, operations, ssn_message=ssn_message
+            ) is not None
+        return PresentacionEmailService.send_confirmacion(
+            base_request, operations, ssn_message=ssn_message
+        )
+
+    @staticmethod
+    def queue_confirmacion(base_request, operations, ssn_message: str = "") -> Optional[EmailOutbox]:
+        """
+        Encola el email de confirmación de presentación (no hace I/O de red).
+
+        El template se renderiza ahora, con las operaciones enviadas; la
+        entrega queda a cargo de dispatch_emails.
+
+        Returns:
+            La fila de EmailOutbox, o None si no hay destinatarios configurados.
+        """
+        recipients = _get_recipients()
+        if not recipients:
+            logger.debug("ssn email presentación: sin destinatarios configurados")
+            return None
+
+        context = _build_presentacion_context(base_request, operations, ssn_message)
+        html_body = render_to_string("emails/presentacion_confirmacion.html", context)
+        return EmailOutboxService.enqueue(
+            "presentacion", recipients, _build_presentacion_subject(base_request), html_body
+        )
+
+
+# =============================================================================
+# Bandeja de salida (outbox)
+# =============================================================================
+
+class EmailOutboxService:
+    """Encola emails y los entrega en segundo plano (comando dispatch_emails)."""
+
+    @staticmethod
+    def enqueue(tipo: str, recipients: List[str], subject: str, html_body: str) -> EmailOutbox:
+        email = EmailOutbox.objects.create(
+            tipo=tipo, recipients=recipients, subject=subject, html_body=html_body
+        )
+        logger.info("ssn email %s: encolado #%s para %d destinatario(s)", tipo, email.pk, len(recipients))
+        return email
+
+    @staticmethod
+    def backoff_seconds(intentos: int) -> int:
+        """Espera antes del próximo intento: base * 2^(intentos-1), con tope de 1 hora."""
+        base = getattr(settings, "EMAIL_OUTBOX_BACKOFF", 60)
+        return min(base * 2 ** max(intentos - 1, 0), 3600)
+
+    @staticmethod
+    def dispatch_pending(
+        limit: int = 100,
+        batch_size: Optional[int] = None,
+        lease: int = 300,
+    ) -> Dict[str, int]:
+        """
+        Entrega los emails pendientes cuyo next_attempt_at ya pasó.
+
+        Cada email se reserva moviendo su next_attempt_at `lease` segundos hacia
+        adelante con un UPDATE condicional: dos dispatchers no entregan el mismo
+        email, y si el proceso muere el email vuelve a quedar disponible.
+        Los destinatarios se envían en lotes de `batch_size` por llamada y el
+        avance (enviados) se guarda después de cada lote: si un lote falla o el
+        proceso muere, el reintento retoma desde el primer destinatario no
+        entregado.
+
+        Returns:
+            Contadores {"enviados", "reintentos", "fallidos"}.
+        """
+        batch_size = batch_size or getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 50)
+        max_attempts = getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5)
+        stats = {"enviados": 0, "reintentos": 0, "fallidos": 0}
+
+        now = timezone.now()
+        candidatos = list(
+            EmailOutbox.objects.filter(estado=EstadoEmail.PENDIENTE, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")
+            .values_list("pk", "next_attempt_at")[:limit]
+        )
+        if not candidatos:
+            return stats
+
+        mailsender_url = getattr(settings, "MAILSENDER_URL", "").strip()
+        # Una sola conexión SMTP para todo el lote de emails
+        connection = None if mailsender_url else get_connection(fail_silently=False)
+        try:
+            for pk, next_attempt_at in candidatos:
+                reservado = EmailOutbox.objects.filter(
+                    pk=pk, estado=EstadoEmail.PENDIENTE, next_attempt_at=next_attempt_at
+                ).update(next_attempt_at=now + datetime.timedelta(seconds=lease))
+                if not reservado:
+                    continue
+
+                email = EmailOutbox.objects.get(pk=pk)
+                try:
+                    recipients = email.recipients
+                    for start in range(email.enviados, len(recipients), batch_size):
+                        chunk = recipients[start:start + batch_size]
+                        _deliver(chunk, email.subject, email.html_body, mailsender_url, connection)
+                        email.enviados = start + len(chunk)
+                        EmailOutbox.objects.filter(pk=email.pk).update(enviados=email.enviados)
+                    email.estado = EstadoEmail.ENVIADO
+                    email.sent_at = timezone.now()
+                    email.last_error = ""
+                    stats["enviados"] += 1
+                    logger.info("ssn email %s: #%s entregado", email.tipo, email.pk)
+                except Exception as e:
+                    email.intentos += 1
+                    email.last_error = str(e)
+                    if email.intentos >= max_attempts:
+                        email.estado = EstadoEmail.ERROR
+                        stats["fallidos"] += 1
+                        logger.error("ssn email %s: #%s descartado tras %d intentos: %s",
+                                     email.tipo, email.pk, email.intentos, e)
+                    else:
+                        delay = EmailOutboxService.backoff_seconds(email.intentos)
+                        email.next_attempt_at = timezone.now() + datetime.timedelta(seconds=delay)
+                        stats["reintentos"] += 1
+                        logger.warning("ssn email %s: #%s falló (intento %d), reintento en %ds: %s",
+                                       email.tipo, email.pk, email.intentos, delay, e)
+                email.save()
+        finally:
+            if connection is not None:
+                connection.close()
+
+        return stats
+
+
 # =============================================================================
 # Helpers compartidos (privados al módulo)
 # =============================================================================
@@ -255,18 +403,35 @@ def _send_via_smtp(
     template: str,
     context: dict,
 ) -> None:
-    html_message = render_to_string(template, context)
-    plain_message = strip_tags(html_message)
+    _send_html_via_smtp(recipients, subject, render_to_string(template, context))
+
+
+def _send_html_via_smtp(
+    recipients: List[str],
+    subject: str,
+    html_message: str,
+    connection=None,
+) -> None:
     send_mail(
         subject=subject,
-        message=plain_message,
+        message=strip_tags(html_message),
         from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=recipients,
         html_message=html_message,
         fail_silently=False,
+        connection=connection,
     )
 
 
+def _deliver(recipients: List[str], subject: str, html_body: str, mailsender_url: str, connection) -> None:
+    """Entrega un lote de destinatarios por Mailsender o SMTP."""
+    if mailsender_url:
+        payload = _build_mailsender_payload(recipients, subject, html_body)
+        _post_to_mailsender(payload, mailsender_url)
+    else:
+        _send_html_via_smtp(recipients, subject, html_body, connection=connection)
+
+
 # --- Alertas de vencimiento ---
 
 def _build_deadline_subject(alerts: List[Alert]) -> str:
@@ -11,13 +11,15 @@ Flujo:
 
 import calendar
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 
 from django.db import transaction
-from django.db.models import QuerySet
+
+from .posicion_service import KEY_FIELDS, PosicionesService
 
 # Imports solo para type hints (no se ejecutan en runtime)
 if TYPE_CHECKING:
@@ -36,6 +38,8 @@ class GenerationResult:
     plazos_fijos_count: int = 0
     cheques_pd_count: int = 0
     warnings: list = None
+    # Stocks generados (ya guardados): generate_monthly_range los encadena al mes siguiente
+    stocks: Optional["MonthlyStocks"] = None
 
     def __post_init__(self):
         if self.warnings is None:
@@ -46,6 +50,23 @@ class GenerationResult:
         return self.inversiones_count + self.plazos_fijos_count + self.cheques_pd_count
 
 
+@dataclass
+class MonthlyStocks:
+    """Stocks de un mes por tipo, leídos de la base o recién generados en memoria."""
+
+    inversiones: list = field(default_factory=list)
+    plazos_fijos: list = field(default_factory=list)
+    cheques_pd: list = field(default_factory=list)
+
+    @classmethod
+    def from_request(cls, request) -> "MonthlyStocks":
+        return cls(
+            inversiones=list(request.stocks_inversion_mensuales.all()),
+            plazos_fijos=list(request.stocks_plazofijo_mensuales.all()),
+            cheques_pd=list(request.stocks_chequespd_mensuales.all()),
+        )
+
+
 class MonthlyReportGeneratorService:
     """
     Servicio para generar automáticamente los stocks mensuales
@@ -164,7 +185,7 @@ class MonthlyReportGeneratorService:
     @staticmethod
     def _generate_plazo_fijo_stocks(
         target_request,
-        prev_request,
+        prev_stocks: Optional[list],
         weekly_requests,
     ) -> tuple[list, list[str]]:
         """
@@ -176,8 +197,8 @@ class MonthlyReportGeneratorService:
 
         El CDF en stock mensual es compuesto: {internal_number}-{original_cdf}
         """
-        from ..models import PlazoFijoStock
-        
+        from ..models import PlazoFijoOperacion, PlazoFijoStock
+
         stocks = []
         warnings = []
         month_end = MonthlyReportGeneratorService.get_month_end_date(
@@ -187,9 +208,9 @@ class MonthlyReportGeneratorService:
         # Diccionario para rastrear PFs: key = (bic, cdf_original)
         pf_registry: dict[tuple[str, str], dict] = {}
 
-        # 1. Cargar PFs del mes anterior (si existe)
-        if prev_request:
-            for pf_stock in prev_request.stocks_plazofijo_mensuales.all():
+        # 1. Cargar PFs del mes anterior (si existe, de la base o en memoria)
+        if prev_stocks:
+            for pf_stock in prev_stocks:
                 # El CDF del stock es compuesto: {internal}-{original}
                 # Extraemos el CDF original
                 cdf_parts = pf_stock.cdf.split("-", 1)
@@ -225,50 +246,53 @@ class MonthlyReportGeneratorService:
                         f"vencido el {pf_stock.fecha_vencimiento}"
                     )
 
-        # 2. Procesar operaciones semanales de Plazo Fijo (constituciones)
+        # 2. Procesar operaciones semanales de Plazo Fijo (constituciones):
+        # una sola consulta para todas las semanas, en orden de cronograma
         internal_counter = len(pf_registry) + 1
-        for weekly_req in weekly_requests:
-            for pf_op in weekly_req.plazos_fijos.all():
-                key = (pf_op.bic, pf_op.cdf)
-
-                # Solo incluir si no está vencido al cierre del mes
-                if pf_op.fecha_vencimiento > month_end:
-                    if key not in pf_registry:
-                        # Nueva constitución: crear CDF compuesto
-                        cdf_compuesto = f"{internal_counter:06d}-{pf_op.cdf}"
-                        pf_registry[key] = {
-                            "codigo_afectacion": pf_op.codigo_afectacion,
-                            "libre_disponibilidad": True,  # Default
-                            "en_custodia": True,  # Default
-                            "financiera": True,  # Default
-                            "valor_contable": pf_op.valor_nominal_nacional,  # Por defecto
-                            "moneda": pf_op.moneda,
-                            "tipo_tasa": pf_op.tipo_tasa,
-                            "tasa": pf_op.tasa,
-                            "tipo_pf": pf_op.tipo_pf,
-                            "bic": pf_op.bic,
-                            "cdf": cdf_compuesto,
-                            "fecha_constitucion": pf_op.fecha_constitucion,
-                            "fecha_vencimiento": pf_op.fecha_vencimiento,
-                            "valor_nominal_origen": pf_op.valor_nominal_origen,
-                            "valor_nominal_nacional": pf_op.valor_nominal_nacional,
-                            "emisor_grupo_economico": False,  # Default
-                            "titulo_deuda": pf_op.titulo_deuda,
-                            "codigo_titulo": pf_op.codigo_titulo,
-                        }
-                        internal_counter += 1
-                        logger.info(
-                            f"PF nuevo: {pf_op.bic}/{pf_op.cdf} -> {cdf_compuesto}"
-                        )
-                    else:
-                        warnings.append(
-                            f"PF {pf_op.bic}/{pf_op.cdf} ya existe en stock (posible renovación)."
-                        )
-                else:
+        pf_ops = PlazoFijoOperacion.objects.filter(
+            solicitud__in=weekly_requests
+        ).order_by("solicitud__cronograma", "pk")
+        for pf_op in pf_ops:
+            key = (pf_op.bic, pf_op.cdf)
+
+            # Solo incluir si no está vencido al cierre del mes
+            if pf_op.fecha_vencimiento > month_end:
+                if key not in pf_registry:
+                    # Nueva constitución: crear CDF compuesto
+                    cdf_compuesto = f"{internal_counter:06d}-{pf_op.cdf}"
+                    pf_registry[key] = {
+                        "codigo_afectacion": pf_op.codigo_afectacion,
+                        "libre_disponibilidad": True,  # Default
+                        "en_custodia": True,  # Default
+                        "financiera": True,  # Default
+                        "valor_contable": pf_op.valor_nominal_nacional,  # Por defecto
+                        "moneda": pf_op.moneda,
+                        "tipo_tasa": pf_op.tipo_tasa,
+                        "tasa": pf_op.tasa,
+                        "tipo_pf": pf_op.tipo_pf,
+                        "bic": pf_op.bic,
+                        "cdf": cdf_compuesto,
+                        "fecha_constitucion": pf_op.fecha_constitucion,
+                        "fecha_vencimiento": pf_op.fecha_vencimiento,
+                        "valor_nominal_origen": pf_op.valor_nominal_origen,
+                        "valor_nominal_nacional": pf_op.valor_nominal_nacional,
+                        "emisor_grupo_economico": False,  # Default
+                        "titulo_deuda": pf_op.titulo_deuda,
+                        "codigo_titulo": pf_op.codigo_titulo,
+                    }
+                    internal_counter += 1
                     logger.info(
-                        f"PF operación {pf_op.bic}/{pf_op.cdf} no incluido: "
-                        f"vencido el {pf_op.fecha_vencimiento}"
+                        f"PF nuevo: {pf_op.bic}/{pf_op.cdf} -> {cdf_compuesto}"
                     )
+                else:
+                    warnings.append(
+                        f"PF {pf_op.bic}/{pf_op.cdf} ya existe en stock (posible renovación)."
+                    )
+            else:
+                logger.info(
+                    f"PF operación {pf_op.bic}/{pf_op.cdf} no incluido: "
+                    f"vencido el {pf_op.fecha_vencimiento}"
+                )
 
         # 3. Crear objetos PlazoFijoStock
         for pf_data in pf_registry.values():
@@ -281,24 +305,61 @@ class MonthlyReportGeneratorService:
 
         return stocks, warnings
 
+    @staticmethod
+    def _clave_posicion(obj) -> tuple[str, str, str, str, bool]:
+        """Clave del stock_registry para una operación semanal (siempre libre disponibilidad)."""
+        return (
+            obj.tipo_especie,
+            obj.codigo_especie,
+            obj.codigo_afectacion,
+            obj.tipo_valuacion,
+            True,  # libre_disponibilidad
+        )
+
+    @staticmethod
+    def _nueva_posicion_inversion(
+        mov: dict, cantidad: Decimal, fecha_pase_vt=None, precio_pase_vt=None
+    ) -> dict:
+        """Datos de una posición nueva (sin stock previo) con los valores por defecto."""
+        return {
+            "codigo_afectacion": mov["codigo_afectacion"],
+            "libre_disponibilidad": True,  # Default
+            "en_custodia": True,  # Default
+            "financiera": True,  # Default
+            "valor_contable": Decimal("0"),  # Se debe calcular manualmente
+            "tipo_especie": mov["tipo_especie"],
+            "codigo_especie": mov["codigo_especie"],
+            "cantidad_devengado_especies": cantidad,
+            "cantidad_percibido_especies": cantidad,
+            "tipo_valuacion": mov["tipo_valuacion"],
+            "con_cotizacion": True,  # Default
+            "emisor_grupo_economico": False,  # Default
+            "emisor_art_ret": False,  # Default
+            "prevision_desvalorizacion": None,
+            "fecha_pase_vt": fecha_pase_vt,
+            "precio_pase_vt": precio_pase_vt,
+            "valor_financiero": None,
+        }
+
     @staticmethod
     def _generate_inversion_stocks(
         target_request,
-        prev_request,
+        prev_stocks: Optional[list],
         weekly_requests,
     ) -> tuple[list, list[str]]:
         """
         Genera los stocks de Inversión para el mes actual.
 
         Lógica:
-        - Stock actual = Stock mes anterior + Compras - Ventas (+/- Canjes)
+        - Stock actual = Stock mes anterior + Compras - Ventas - Canjes entregados
+          + Canjes recibidos
         - Agrupado por (tipo_especie, codigo_especie, codigo_afectacion, tipo_valuacion, libre_disponibilidad)
         
         Nota: libre_disponibilidad se incluye en la key porque SSN trata como registros
         separados la misma especie con diferente disponibilidad (ej: en garantía vs libres).
         """
-        from ..models import InversionStock
-        
+        from ..models import CanjeOperacion, InversionStock
+
         stocks = []
         warnings = []
 
@@ -306,9 +367,9 @@ class MonthlyReportGeneratorService:
         # key = (tipo_especie, codigo_especie, codigo_afectacion, tipo_valuacion, libre_disponibilidad)
         stock_registry: dict[tuple[str, str, str, str, bool], dict] = {}
 
-        # 1. Cargar stocks del mes anterior (si existe)
-        if prev_request:
-            for inv_stock in prev_request.stocks_inversion_mensuales.all():
+        # 1. Cargar stocks del mes anterior (si existe, de la base o en memoria)
+        if prev_stocks:
+            for inv_stock in prev_stocks:
                 key = (
                     inv_stock.tipo_especie,
                     inv_stock.codigo_especie,
@@ -336,99 +397,107 @@ class MonthlyReportGeneratorService:
                     "valor_financiero": inv_stock.valor_financiero,
                 }
 
-        # 2. Procesar compras del mes
-        # Las compras siempre se asignan a libre_disponibilidad=True
-        for weekly_req in weekly_requests:
-            for compra in weekly_req.compras.all():
-                key = (
-                    compra.tipo_especie,
-                    compra.codigo_especie,
-                    compra.codigo_afectacion,
-                    compra.tipo_valuacion,
-                    True,  # libre_disponibilidad
+        # 2. Compras y ventas del mes desde el libro de posiciones: una consulta
+        # O(posiciones), sin recorrer las operaciones de las semanas.
+        # Compras y ventas siempre van contra libre_disponibilidad=True.
+        movimientos = list(PosicionesService.movimientos(weekly_requests))
+        compras = [mov for mov in movimientos if mov["n_compras"]]
+        ventas = [mov for mov in movimientos if mov["n_ventas"]]
+
+        for mov in compras:
+            key = (
+                mov["tipo_especie"],
+                mov["codigo_especie"],
+                mov["codigo_afectacion"],
+                mov["tipo_valuacion"],
+                True,  # libre_disponibilidad
+            )
+            cantidad = mov["total_compras"]
+
+            if key in stock_registry:
+                # Incrementar cantidad
+                stock_registry[key]["cantidad_devengado_especies"] += cantidad
+                stock_registry[key]["cantidad_percibido_especies"] += cantidad
+                logger.info(
+                    f"Compras agregadas: {mov['codigo_especie']} +{cantidad} ({mov['n_compras']} ops)"
                 )
-
-                if key in stock_registry:
-                    # Incrementar cantidad
-                    stock_registry[key]["cantidad_devengado_especies"] += Decimal(
-                        str(compra.cant_especies)
-                    )
-                    stock_registry[key]["cantidad_percibido_especies"] += Decimal(
-                        str(compra.cant_especies)
-                    )
-                    logger.info(
-                        f"Compra agregada: {compra.codigo_especie} +{compra.cant_especies}"
-                    )
-                else:
-                    # Nueva posición
-                    stock_registry[key] = {
-                        "codigo_afectacion": compra.codigo_afectacion,
-                        "libre_disponibilidad": True,  # Default
-                        "en_custodia": True,  # Default
-                        "financiera": True,  # Default
-                        "valor_contable": Decimal("0"),  # Se debe calcular manualmente
-                        "tipo_especie": compra.tipo_especie,
-                        "codigo_especie": compra.codigo_especie,
-                        "cantidad_devengado_especies": Decimal(str(compra.cant_especies)),
-                        "cantidad_percibido_especies": Decimal(str(compra.cant_especies)),
-                        "tipo_valuacion": compra.tipo_valuacion,
-                        "con_cotizacion": True,  # Default
-                        "emisor_grupo_economico": False,  # Default
-                        "emisor_art_ret": False,  # Default
-                        "prevision_desvalorizacion": None,
-                        "fecha_pase_vt": None,
-                        "precio_pase_vt": None,
-                        "valor_financiero": None,
-                    }
-                    logger.info(
-                        f"Nueva posición: {compra.codigo_especie} x {compra.cant_especies}"
-                    )
-
-        # 3. Procesar ventas del mes
-        # Las ventas se restan del stock con libre_disponibilidad=True
-        for weekly_req in weekly_requests:
-            for venta in weekly_req.ventas.all():
-                key = (
-                    venta.tipo_especie,
-                    venta.codigo_especie,
-                    venta.codigo_afectacion,
-                    venta.tipo_valuacion,
-                    True,  # libre_disponibilidad
+            else:
+                # Nueva posición
+                stock_registry[key] = MonthlyReportGeneratorService._nueva_posicion_inversion(
+                    mov, cantidad
+                )
+                logger.info(f"Nueva posición: {mov['codigo_especie']} x {cantidad}")
+
+        # 3. Ventas del mes: se restan del stock con libre_disponibilidad=True
+        for mov in ventas:
+            key = (
+                mov["tipo_especie"],
+                mov["codigo_especie"],
+                mov["codigo_afectacion"],
+                mov["tipo_valuacion"],
+                True,  # libre_disponibilidad
+            )
+            cantidad = mov["total_ventas"]
+
+            if key in stock_registry:
+                # Decrementar cantidad
+                stock_registry[key]["cantidad_devengado_especies"] -= cantidad
+                stock_registry[key]["cantidad_percibido_especies"] -= cantidad
+                logger.info(
+                    f"Ventas procesadas: {mov['codigo_especie']} -{cantidad} ({mov['n_ventas']} ops)"
                 )
 
-                if key in stock_registry:
-                    # Decrementar cantidad
-                    stock_registry[key]["cantidad_devengado_especies"] -= Decimal(
-                        str(venta.cant_especies)
-                    )
-                    stock_registry[key]["cantidad_percibido_especies"] -= Decimal(
-                        str(venta.cant_especies)
-                    )
-                    logger.info(
-                        f"Venta procesada: {venta.codigo_especie} -{venta.cant_especies}"
-                    )
+                # Verificar si la cantidad queda en cero o negativa
+                if stock_registry[key]["cantidad_percibido_especies"] <= 0:
+                    logger.info(f"Posición cerrada: {mov['codigo_especie']}")
+            else:
+                warnings.append(
+                    f"Venta sin posición previa: {mov['codigo_especie']}. "
+                    "Verifique los datos del mes anterior."
+                )
 
-                    # Verificar si la cantidad queda en cero o negativa
-                    if stock_registry[key]["cantidad_percibido_especies"] <= 0:
-                        logger.info(
-                            f"Posición cerrada: {venta.codigo_especie}"
-                        )
-                else:
+        # 4. Canjes del mes, en orden cronológico: el detalle A (entrega) se
+        # resta y el detalle B (recibe) se suma. Una sola consulta con los
+        # detalles cargados por select_related.
+        canjes = (
+            CanjeOperacion.objects.filter(solicitud__in=weekly_requests)
+            .select_related("detalle_a", "detalle_b", "solicitud")
+            .order_by("solicitud__cronograma", "fecha_movimiento", "pk")
+        )
+        for canje in canjes:
+            entrega, recibe = canje.detalle_a, canje.detalle_b
+            semana = canje.solicitud.cronograma
+
+            key = MonthlyReportGeneratorService._clave_posicion(entrega)
+            if key in stock_registry:
+                stock_registry[key]["cantidad_devengado_especies"] -= entrega.cant_especies
+                stock_registry[key]["cantidad_percibido_especies"] -= entrega.cant_especies
+                logger.info(
+                    f"Canje {semana}: {entrega.codigo_especie} -{entrega.cant_especies}"
+                )
+                if stock_registry[key]["cantidad_percibido_especies"] < 0:
                     warnings.append(
-                        f"Venta sin posición previa: {venta.codigo_especie}. "
-                        "Verifique los datos del mes anterior."
+                        f"Canje en semana {semana} entrega más {entrega.codigo_especie} "
+                        "que el stock disponible. Verifique los datos del mes anterior."
                     )
-
-        # 4. Procesar canjes del mes
-        for weekly_req in weekly_requests:
-            for canje in weekly_req.canjes.all():
-                # Los canjes tienen especie_origen y especie_destino
-                # Aquí depende de la estructura del modelo de canje
-                # Por ahora, solo registramos una advertencia
+            else:
                 warnings.append(
-                    f"Canje detectado en semana {weekly_req.cronograma}. "
-                    "Los canjes requieren procesamiento manual."
+                    f"Canje sin posición previa: {entrega.codigo_especie} "
+                    f"(semana {semana}). Verifique los datos del mes anterior."
+                )
+
+            key = MonthlyReportGeneratorService._clave_posicion(recibe)
+            if key in stock_registry:
+                stock_registry[key]["cantidad_devengado_especies"] += recibe.cant_especies
+                stock_registry[key]["cantidad_percibido_especies"] += recibe.cant_especies
+            else:
+                stock_registry[key] = MonthlyReportGeneratorService._nueva_posicion_inversion(
+                    {field: getattr(recibe, field) for field in KEY_FIELDS},
+                    recibe.cant_especies,
+                    fecha_pase_vt=recibe.fecha_pase_vt,
+                    precio_pase_vt=recibe.precio_pase_vt,
                 )
+            logger.info(f"Canje {semana}: {recibe.codigo_especie} +{recibe.cant_especies}")
 
         # 5. Crear objetos InversionStock (solo posiciones con cantidad > 0)
         for key, inv_data in stock_registry.items():
@@ -445,7 +514,7 @@ class MonthlyReportGeneratorService:
     @staticmethod
     def _generate_cheque_pd_stocks(
         target_request,
-        prev_request,
+        prev_stocks: Optional[list],
         weekly_requests,
     ) -> tuple[list, list[str]]:
         """
@@ -462,8 +531,8 @@ class MonthlyReportGeneratorService:
             target_request.cronograma
         )
 
-        if prev_request:
-            for cpd_stock in prev_request.stocks_chequespd_mensuales.all():
+        if prev_stocks:
+            for cpd_stock in prev_stocks:
                 # Solo incluir si no está vencido al cierre del mes
                 if cpd_stock.fecha_vencimiento > month_end:
                     stocks.append(
@@ -488,7 +557,7 @@ class MonthlyReportGeneratorService:
                         )
                     )
 
-        if not stocks and not prev_request:
+        if not stocks and prev_stocks is None:
             warnings.append(
                 "No hay stock de Cheques Pago Diferido del mes anterior. "
                 "Si la compañía opera con CPD, ingrese los stocks manualmente."
@@ -498,12 +567,16 @@ class MonthlyReportGeneratorService:
 
     @staticmethod
     @transaction.atomic
-    def generate_monthly_stocks(target_request) -> GenerationResult:
+    def generate_monthly_stocks(
+        target_request, prev_stocks: Optional[MonthlyStocks] = None
+    ) -> GenerationResult:
         """
         Genera todos los stocks mensuales para una solicitud dada.
 
         Args:
             target_request: Solicitud mensual donde se generarán los stocks.
+            prev_stocks: Stocks del mes anterior ya cargados en memoria (los
+                encadena generate_monthly_range). Si es None se leen de la base.
 
         Returns:
             GenerationResult con el resultado de la operación.
@@ -514,7 +587,8 @@ class MonthlyReportGeneratorService:
             ChequePagoDiferidoStock,
             TipoEntrega,
         )
-        
+        from .operacion_service import OperacionesService
+
         if target_request.tipo_entrega != TipoEntrega.MENSUAL:
             return GenerationResult(
                 success=False,
@@ -525,11 +599,7 @@ class MonthlyReportGeneratorService:
         all_warnings = []
 
         # Verificar si ya tiene stocks
-        existing_count = (
-            target_request.stocks_inversion_mensuales.count()
-            + target_request.stocks_plazofijo_mensuales.count()
-            + target_request.stocks_chequespd_mensuales.count()
-        )
+        existing_count = OperacionesService.get_total_operaciones(target_request)
         if existing_count > 0:
             return GenerationResult(
                 success=False,
@@ -538,7 +608,10 @@ class MonthlyReportGeneratorService:
             )
 
         # Obtener solicitudes relacionadas
-        prev_request = MonthlyReportGeneratorService.get_previous_month_stock(cronograma)
+        if prev_stocks is None:
+            prev_request = MonthlyReportGeneratorService.get_previous_month_stock(cronograma)
+            if prev_request:
+                prev_stocks = MonthlyStocks.from_request(prev_request)
         weekly_requests = MonthlyReportGeneratorService.get_weekly_requests_for_month(
             cronograma
         )
@@ -554,14 +627,14 @@ class MonthlyReportGeneratorService:
             )
 
         # Verificar si hay datos previos
-        if not prev_request and weekly_requests.count() == 0:
+        if prev_stocks is None and weekly_requests.count() == 0:
             return GenerationResult(
                 success=False,
                 message="No hay stock del mes anterior ni operaciones semanales. "
                 "No es posible generar el reporte mensual.",
             )
 
-        if not prev_request:
+        if prev_stocks is None:
             all_warnings.append(
                 "No existe stock del mes anterior. "
                 "Los stocks se generarán solo con las operaciones del mes."
@@ -570,21 +643,21 @@ class MonthlyReportGeneratorService:
         # Generar stocks
         pf_stocks, pf_warnings = (
             MonthlyReportGeneratorService._generate_plazo_fijo_stocks(
-                target_request, prev_request, weekly_requests
+                target_request, prev_stocks.plazos_fijos if prev_stocks else None, weekly_requests
             )
         )
         all_warnings.extend(pf_warnings)
 
         inv_stocks, inv_warnings = (
             MonthlyReportGeneratorService._generate_inversion_stocks(
-                target_request, prev_request, weekly_requests
+                target_request, prev_stocks.inversiones if prev_stocks else None, weekly_requests
             )
         )
         all_warnings.extend(inv_warnings)
 
         cpd_stocks, cpd_warnings = (
             MonthlyReportGeneratorService._generate_cheque_pd_stocks(
-                target_request, prev_request, weekly_requests
+                target_request, prev_stocks.cheques_pd if prev_stocks else None, weekly_requests
             )
         )
         all_warnings.extend(cpd_warnings)
@@ -610,6 +683,92 @@ class MonthlyReportGeneratorService:
             plazos_fijos_count=len(pf_stocks),
             cheques_pd_count=len(cpd_stocks),
             warnings=all_warnings,
+            stocks=MonthlyStocks(inv_stocks, pf_stocks, cpd_stocks),
+        )
+
+    @staticmethod
+    def get_month_range(desde: str, hasta: str) -> list[str]:
+        """
+        Devuelve los cronogramas mensuales entre desde y hasta (YYYY-MM, inclusive).
+        """
+        year, month = map(int, desde.split("-"))
+        end_year, end_month = map(int, hasta.split("-"))
+        months = []
+        while (year, month) <= (end_year, end_month):
+            months.append(f"{year}-{month:02d}")
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return months
+
+    @staticmethod
+    def generate_monthly_range(
+        desde: str, hasta: str, codigo_compania: str, force: bool = False
+    ) -> Iterator[tuple[str, GenerationResult, float]]:
+        """
+        Genera los stocks de varios meses seguidos, encadenando el roll-forward.
+
+        Los stocks generados para un mes se pasan en memoria como stock anterior
+        del mes siguiente, así que no se vuelven a leer de la base. Cada mes se
+        guarda con bulk_create en su propia transacción: si un mes falla, los
+        anteriores quedan guardados. Crea la solicitud mensual si no existe
+        (y la descarta si ese mes no se pudo generar).
+
+        Args:
+            desde: Primer mes (YYYY-MM)
+            hasta: Último mes (YYYY-MM)
+            codigo_compania: Compañía de las solicitudes mensuales que se creen
+            force: Elimina y regenera los stocks de solicitudes editables que ya tengan
+
+        Yields:
+            (cronograma, GenerationResult, segundos) a medida que termina cada mes
+        """
+        from ..models import BaseRequestModel, TipoEntrega
+
+        prev_stocks = None
+        for cronograma in MonthlyReportGeneratorService.get_month_range(desde, hasta):
+            start = time.perf_counter()
+            with transaction.atomic():
+                target, created = BaseRequestModel.objects.get_or_create(
+                    tipo_entrega=TipoEntrega.MENSUAL,
+                    cronograma=cronograma,
+                    defaults={"codigo_compania": codigo_compania},
+                )
+                if force and target.is_editable:
+                    MonthlyReportGeneratorService.delete_generated_stocks(target)
+                result = MonthlyReportGeneratorService.generate_monthly_stocks(
+                    target, prev_stocks
+                )
+                if created and not result.success:
+                    # No dejar solicitudes vacías creadas por el batch
+                    transaction.set_rollback(True)
+            # Si el mes no se generó (por ejemplo, ya tenía stocks) el siguiente
+            # vuelve a leer el stock anterior de la base
+            prev_stocks = result.stocks
+            yield cronograma, result, time.perf_counter() - start
+
+    @staticmethod
+    def preview_inversion_stocks(cronograma: str) -> tuple[list, list[str]]:
+        """
+        Proyecta el stock de inversión de un mes sin guardar nada.
+
+        Lee el stock del mes anterior y el libro de posiciones de las semanas
+        del mes, así que el costo depende de la cantidad de posiciones y no de
+        la de operaciones.
+
+        Args:
+            cronograma: Mes a proyectar (YYYY-MM)
+
+        Returns:
+            (lista de InversionStock sin solicitud ni guardar, advertencias)
+        """
+        prev_request = MonthlyReportGeneratorService.get_previous_month_stock(cronograma)
+        weekly_requests = MonthlyReportGeneratorService.get_weekly_requests_for_month(
+            cronograma
+        )
+        prev_stocks = (
+            list(prev_request.stocks_inversion_mensuales.all()) if prev_request else None
+        )
+        return MonthlyReportGeneratorService._generate_inversion_stocks(
+            None, prev_stocks, weekly_requests
         )
 
     @staticmethod
@@ -1,24 +1,153 @@
+import hashlib
+import json
 import logging
+import operator
+from collections import defaultdict
+from functools import reduce
 
-from ..models import TipoEntrega
+from django.db.models import (
+    Count,
+    DateTimeField,
+    F,
+    IntegerField,
+    Max,
+    OuterRef,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+from ..models import BaseRequestModel, TipoEntrega
 
 logger = logging.getLogger("operaciones")
 
+# (tipo_operacion, related_name en BaseRequestModel, columna de orden dentro del listado)
+# Semanal: por fecha de la operación. Mensual: por el ordering de cada modelo.
+FUENTES_SEMANALES = [
+    ("C", "compras", "fecha_movimiento"),
+    ("V", "ventas", "fecha_movimiento"),
+    ("J", "canjes", "fecha_movimiento"),
+    ("P", "plazos_fijos", "fecha_constitucion"),
+]
+FUENTES_MENSUALES = [
+    ("SI", "stocks_inversion_mensuales", "codigo_especie"),
+    ("SP", "stocks_plazofijo_mensuales", "bic"),
+    ("SC", "stocks_chequespd_mensuales", "codigo_cheque"),
+]
+
+# Relaciones que cuentan como "operaciones" de una solicitud (semanales y stocks)
+RELACIONES_OPERACIONES = [
+    related_name for _, related_name, _ in FUENTES_SEMANALES + FUENTES_MENSUALES
+]
+
+
+class OperacionesIndex:
+    """
+    Listado ordenado de las operaciones de una solicitud, paginable en SQL.
+
+    Arma un UNION ALL de (id, tipo, orden del tipo, clave de orden) sobre las
+    tablas de cada tipo, lo ordena y lo corta en la base con LIMIT/OFFSET.
+    Solo se instancian las filas de la página pedida (una consulta por pk por
+    cada tipo presente en la página). El orden es el mismo que el de
+    get_all_operaciones: semanal por fecha, estable entre tipos; mensual por
+    tipo y el ordering de cada modelo.
+
+    Se comporta como el object_list que espera el Paginator de Django
+    (count() y slicing).
+    """
+
+    # El Paginator advierte si el object_list no está ordenado
+    ordered = True
+
+    def __init__(self, base_request):
+        self.base_request = base_request
+        self.is_monthly = base_request.tipo_entrega == TipoEntrega.MENSUAL
+        self.fuentes = FUENTES_MENSUALES if self.is_monthly else FUENTES_SEMANALES
+        self._count = None
+
+    def _union(self):
+        partes = [
+            getattr(self.base_request, related_name)
+            .order_by()
+            .annotate(
+                tipo_index=Value(tipo),
+                orden_index=Value(orden),
+                clave_index=F(campo),
+            )
+            .values_list("id", "tipo_index", "orden_index", "clave_index")
+            for orden, (tipo, related_name, campo) in enumerate(self.fuentes)
+        ]
+        union = partes[0].union(*partes[1:], all=True)
+        if self.is_monthly:
+            return union.order_by("orden_index", "clave_index", "id")
+        return union.order_by("clave_index", "orden_index", "id")
+
+    def count(self):
+        if self._count is None:
+            self._count = self._union().count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __bool__(self):
+        return self.count() > 0
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+
+        filas = list(self._union()[key])
+
+        pks_por_tipo = defaultdict(list)
+        for pk, tipo, _, _ in filas:
+            pks_por_tipo[tipo].append(pk)
+
+        instancias = {}
+        for tipo, related_name, _ in self.fuentes:
+            if not pks_por_tipo[tipo]:
+                continue
+            # Por el related manager: las filas traen la solicitud ya cacheada
+            queryset = getattr(self.base_request, related_name).filter(pk__in=pks_por_tipo[tipo])
+            if tipo == "J":
+                queryset = queryset.select_related("detalle_a", "detalle_b")
+            instancias.update({(tipo, obj.pk): obj for obj in queryset})
+
+        return [instancias[(tipo, pk)] for pk, tipo, _, _ in filas]
+
 
 class OperacionesService:
     """
     Service central para lógica de consulta y agrupación de operaciones.
     """
 
+    # Atributo de la instancia de BaseRequestModel donde se memoiza la lista.
+    # Las vistas cargan la solicitud en cada request, así que el memo vive
+    # lo que dura el request (o el job que la cargó).
+    _CACHE_ATTR = "_operaciones_cache"
+
     @staticmethod
     def get_all_operaciones(base_request):
         """
         Devuelve TODAS las operaciones asociadas a una solicitud, como una lista única ordenada.
+
+        Hace una consulta por tipo (4 semanales, 3 mensuales) sin importar la
+        cantidad de filas: los canjes traen detalle_a y detalle_b en el mismo
+        JOIN. El resultado se memoiza en la instancia; llamadas repetidas en el
+        mismo request (get_queryset, botones del header) no vuelven a la base.
+        Después de modificar operaciones usar invalidate_operaciones().
         """
+        cached = base_request.__dict__.get(OperacionesService._CACHE_ATTR)
+        if cached is not None:
+            return cached
+
         if base_request.tipo_entrega == TipoEntrega.SEMANAL:
             compras = base_request.compras.all()
             ventas = base_request.ventas.all()
-            canjes = base_request.canjes.all()
+            canjes = base_request.canjes.select_related("detalle_a", "detalle_b")
             plazos_fijos = base_request.plazos_fijos.all()
             operaciones = (
                 list(compras) + list(ventas) + list(canjes) + list(plazos_fijos)
@@ -30,20 +159,80 @@ class OperacionesService:
             plazos_fijos = base_request.stocks_plazofijo_mensuales.all()
             cheques_pd = base_request.stocks_chequespd_mensuales.all()
             operaciones = list(inversiones) + list(plazos_fijos) + list(cheques_pd)
+        else:
+            operaciones = []
+
+        base_request.__dict__[OperacionesService._CACHE_ATTR] = operaciones
         return operaciones
 
     @staticmethod
-    def get_count_by_tipo(base_request):
+    def get_operaciones_index(base_request):
+        """
+        Devuelve las operaciones de la solicitud como un OperacionesIndex:
+        mismo orden que get_all_operaciones, pero ordenado y paginado en SQL.
+        """
+        return OperacionesIndex(base_request)
+
+    @staticmethod
+    def invalidate_operaciones(base_request):
+        """Descarta la lista memoizada por get_all_operaciones."""
+        base_request.__dict__.pop(OperacionesService._CACHE_ATTR, None)
+
+    @staticmethod
+    def annotate_counts(queryset):
         """
-        Devuelve un dict con el conteo de operaciones por tipo.
+        Anota en un queryset de BaseRequestModel la cantidad de filas de cada tipo.
+
+        Agrega n_<related_name> por cada relación de RELACIONES_OPERACIONES y
+        n_operaciones con el total. Cada conteo es una subconsulta correlacionada
+        (sin JOINs que multipliquen filas), así que cualquier cantidad de
+        solicitudes se cuenta en una sola consulta y se puede filtrar por
+        los conteos (ej: n_operaciones=0).
         """
+        annotations = {}
+        for related_name in RELACIONES_OPERACIONES:
+            model = BaseRequestModel._meta.get_field(related_name).related_model
+            conteo = (
+                model.objects.filter(solicitud=OuterRef("pk"))
+                .order_by()
+                .values("solicitud")
+                .annotate(n=Count("pk"))
+                .values("n")
+            )
+            annotations[f"n_{related_name}"] = Coalesce(
+                Subquery(conteo, output_field=IntegerField()), 0
+            )
+        total = reduce(operator.add, (F(name) for name in annotations))
+        return queryset.annotate(**annotations).annotate(n_operaciones=total)
+
+    @staticmethod
+    def get_counts_by_solicitud(queryset):
+        """
+        Conteo por tipo para muchas solicitudes en una sola consulta.
+
+        Returns:
+            dict: {pk: {related_name: cantidad}}
+        """
+        nombres = [f"n_{related_name}" for related_name in RELACIONES_OPERACIONES]
+        filas = OperacionesService.annotate_counts(queryset.order_by()).values("pk", *nombres)
         return {
-            "compras": base_request.compras.count(),
-            "ventas": base_request.ventas.count(),
-            "canjes": base_request.canjes.count(),
-            "plazos_fijos": base_request.plazos_fijos.count(),
+            fila["pk"]: {
+                related_name: fila[f"n_{related_name}"] for related_name in RELACIONES_OPERACIONES
+            }
+            for fila in filas
         }
 
+    @staticmethod
+    def get_count_by_tipo(base_request):
+        """
+        Devuelve un dict con el conteo de operaciones por tipo (semanales y
+        stocks mensuales), resuelto en una única consulta.
+        """
+        counts = OperacionesService.get_counts_by_solicitud(
+            BaseRequestModel.objects.filter(pk=base_request.pk)
+        )
+        return counts.get(base_request.pk, dict.fromkeys(RELACIONES_OPERACIONES, 0))
+
     @staticmethod
     def get_total_operaciones(base_request):
         """
@@ -52,6 +241,40 @@ class OperacionesService:
         counts = OperacionesService.get_count_by_tipo(base_request)
         return sum(counts.values())
 
+    @staticmethod
+    def get_content_version(base_request) -> str:
+        """
+        Huella del contenido de una solicitud, para cachear lo que se deriva de
+        ella (vista previa JSON, Excel).
+
+        Combina el updated_at de la solicitud con el último updated_at y la
+        cantidad de filas de cada tipo de operación: las ediciones cambian el
+        updated_at y los borrados la cantidad. Se resuelve en una sola consulta.
+
+        Returns:
+            str: 16 caracteres hexadecimales
+        """
+        ultimos = {}
+        for related_name in RELACIONES_OPERACIONES:
+            model = BaseRequestModel._meta.get_field(related_name).related_model
+            ultimo = (
+                model.objects.filter(solicitud=OuterRef("pk"))
+                .order_by()
+                .values("solicitud")
+                .annotate(m=Max("updated_at"))
+                .values("m")
+            )
+            ultimos[f"max_{related_name}"] = Subquery(ultimo, output_field=DateTimeField())
+        conteos = [f"n_{related_name}" for related_name in RELACIONES_OPERACIONES]
+        fila = (
+            OperacionesService.annotate_counts(BaseRequestModel.objects.filter(pk=base_request.pk))
+            .annotate(**ultimos)
+            .values("updated_at", *conteos, *ultimos)
+            .get()
+        )
+        raw = json.dumps(fila, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
     @staticmethod
     def get_extra_info(base_request):
         """
@@ -121,6 +344,7 @@ class OperacionesService:
             if ops_to_delete.exists():
                 count, _ = ops_to_delete.delete()
                 total_deleted_count += count
+                OperacionesService.invalidate_operaciones(base_request)
                 logger.info(
                     f"Reversión: Se eliminaron {count} operaciones de '{manager_name}' "
                     f"para la solicitud {base_request.uuid}."
@@ -0,0 +1,220 @@
+"""
+Mantenimiento del libro de posiciones semanales (PosicionSemanal).
+
+Cada compra, venta o detalle de canje aporta una "contribución" a una fila del
+libro: (solicitud, clave de posición, columna de cantidad, columna de conteo,
+cantidad). Los signals de operaciones/signals.py suman la contribución nueva y
+restan la anterior con UPDATE ... SET col = col + delta, así que el libro se
+mantiene sin recorrer la semana. Los caminos bulk (sync_ssn_data) no disparan
+signals y llaman a rebuild() al terminar.
+"""
+
+import logging
+from decimal import Decimal
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from ..models import CanjeOperacion, CompraOperacion, PosicionSemanal, VentaOperacion
+
+logger = logging.getLogger("operaciones")
+
+# Clave de una posición de inversión (la misma que usa la generación mensual)
+KEY_FIELDS = ("tipo_especie", "codigo_especie", "codigo_afectacion", "tipo_valuacion")
+
+# Modelo -> (columna de cantidad, columna de conteo) en PosicionSemanal
+MOVIMIENTOS = {
+    CompraOperacion: ("cantidad_compras", "compras"),
+    VentaOperacion: ("cantidad_ventas", "ventas"),
+}
+# Lado del canje -> columna de cantidad (el conteo va a "canjes")
+LADOS_CANJE = {
+    "detalle_a": "cantidad_canje_egreso",
+    "detalle_b": "cantidad_canje_ingreso",
+}
+
+
+class Contribucion(NamedTuple):
+    """Aporte de una operación (o detalle de canje) a una fila del libro."""
+
+    solicitud_id: int
+    clave: Tuple[str, str, str, str]
+    campo_cantidad: str
+    campo_conteo: str
+    cantidad: Decimal
+
+
+class PosicionesService:
+    """Altas, bajas y reconstrucción del libro de posiciones."""
+
+    @staticmethod
+    def clave(obj) -> Tuple[str, str, str, str]:
+        return tuple(getattr(obj, field) for field in KEY_FIELDS)
+
+    @staticmethod
+    def contribucion(op) -> Optional[Contribucion]:
+        """Contribución de una compra o venta (None si no pertenece a una solicitud)."""
+        if not op.solicitud_id or op.cant_especies is None:
+            return None
+        campo_cantidad, campo_conteo = MOVIMIENTOS[type(op)]
+        return Contribucion(
+            op.solicitud_id, PosicionesService.clave(op),
+            campo_cantidad, campo_conteo, Decimal(op.cant_especies),
+        )
+
+    @staticmethod
+    def contribuciones_canje(solicitud_id, detalles) -> List[Contribucion]:
+        """
+        Contribuciones de un canje: el detalle A egresa y el B ingresa.
+
+        Args:
+            solicitud_id: Solicitud semanal del canje
+            detalles: dict {"detalle_a": DetalleOperacionCanje | None, "detalle_b": ...}
+        """
+        if not solicitud_id:
+            return []
+        return [
+            Contribucion(
+                solicitud_id, PosicionesService.clave(detalle),
+                LADOS_CANJE[lado], "canjes", Decimal(detalle.cant_especies),
+            )
+            for lado, detalle in detalles.items()
+            if detalle is not None and detalle.cant_especies is not None
+        ]
+
+    @staticmethod
+    def aplicar(contribuciones: Iterable[Optional[Contribucion]], signo: int) -> None:
+        """
+        Suma (signo=1) o resta (signo=-1) contribuciones al libro.
+
+        Las restas solo actualizan filas existentes (nunca crean) y borran las
+        filas que quedan sin movimientos: durante el borrado en cascada de una
+        solicitud sus filas del libro pueden haberse borrado antes.
+        """
+        for c in contribuciones:
+            if c is None:
+                continue
+            filtro = dict(zip(KEY_FIELDS, c.clave), solicitud_id=c.solicitud_id)
+            cambios = {
+                c.campo_cantidad: F(c.campo_cantidad) + signo * c.cantidad,
+                c.campo_conteo: F(c.campo_conteo) + signo,
+                "updated_at": timezone.now(),
+            }
+            filas = PosicionSemanal.objects.filter(**filtro)
+
+            if signo < 0:
+                filas.update(**cambios)
+                filas.filter(compras__lte=0, ventas__lte=0, canjes__lte=0).delete()
+                continue
+
+            if filas.update(**cambios):
+                continue
+            try:
+                with transaction.atomic():
+                    PosicionSemanal.objects.create(
+                        **filtro, **{c.campo_cantidad: c.cantidad, c.campo_conteo: 1}
+                    )
+            except IntegrityError:
+                # Otra transacción creó la fila entre el UPDATE y el INSERT
+                filas.update(**cambios)
+
+    @staticmethod
+    def reemplazar(anteriores, nuevas) -> None:
+        """Resta las contribuciones anteriores y suma las nuevas (si cambiaron)."""
+        anteriores = [c for c in anteriores if c is not None]
+        nuevas = [c for c in nuevas if c is not None]
+        if anteriores == nuevas:
+            return
+        PosicionesService.aplicar(anteriores, -1)
+        PosicionesService.aplicar(nuevas, 1)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(solicitudes) -> int:
+        """
+        Reconstruye el libro de las solicitudes indicadas desde sus operaciones.
+
+        Usa una consulta agrupada por tipo de movimiento (compras, ventas y cada
+        lado de los canjes), sin importar cuántas operaciones haya.
+
+        Args:
+            solicitudes: Iterable de BaseRequestModel (o queryset)
+
+        Returns:
+            Cantidad de filas del libro creadas
+        """
+        ids = [s.pk for s in solicitudes]
+        if not ids:
+            return 0
+
+        PosicionSemanal.objects.filter(solicitud_id__in=ids).delete()
+
+        filas = {}
+
+        def acumular(solicitud_id, clave, campo_cantidad, campo_conteo, cantidad, conteo):
+            fila = filas.get((solicitud_id, clave))
+            if fila is None:
+                fila = filas[(solicitud_id, clave)] = PosicionSemanal(
+                    solicitud_id=solicitud_id, **dict(zip(KEY_FIELDS, clave))
+                )
+            setattr(fila, campo_cantidad, getattr(fila, campo_cantidad) + cantidad)
+            setattr(fila, campo_conteo, getattr(fila, campo_conteo) + conteo)
+
+        for model, (campo_cantidad, campo_conteo) in MOVIMIENTOS.items():
+            agregados = (
+                model.objects.filter(solicitud_id__in=ids)
+                .values("solicitud_id", *KEY_FIELDS)
+                .annotate(cantidad=Sum("cant_especies"), n=Count("pk"))
+                .order_by()
+            )
+            for fila in agregados:
+                clave = tuple(fila[field] for field in KEY_FIELDS)
+                acumular(
+                    fila["solicitud_id"], clave, campo_cantidad, campo_conteo,
+                    fila["cantidad"], fila["n"],
+                )
+
+        for lado, campo_cantidad in LADOS_CANJE.items():
+            campos = [f"{lado}__{field}" for field in KEY_FIELDS]
+            agregados = (
+                CanjeOperacion.objects.filter(solicitud_id__in=ids)
+                .values("solicitud_id", *campos)
+                .annotate(cantidad=Sum(f"{lado}__cant_especies"), n=Count("pk"))
+                .order_by()
+            )
+            for fila in agregados:
+                clave = tuple(fila[campo] for campo in campos)
+                acumular(
+                    fila["solicitud_id"], clave, campo_cantidad, "canjes",
+                    fila["cantidad"], fila["n"],
+                )
+
+        PosicionSemanal.objects.bulk_create(filas.values())
+        logger.info(f"Libro de posiciones reconstruido: {len(ids)} solicitudes, {len(filas)} filas")
+        return len(filas)
+
+    @staticmethod
+    def movimientos(weekly_requests):
+        """
+        Movimientos netos por posición de un conjunto de semanas (una consulta
+        sobre el libro, O(posiciones)).
+
+        Returns:
+            QuerySet de dicts con KEY_FIELDS y total_compras, n_compras,
+            total_ventas, n_ventas, total_canje_ingreso, total_canje_egreso.
+        """
+        return (
+            PosicionSemanal.objects.filter(solicitud__in=weekly_requests)
+            .values(*KEY_FIELDS)
+            .annotate(
+                total_compras=Sum("cantidad_compras"),
+                n_compras=Sum("compras"),
+                total_ventas=Sum("cantidad_ventas"),
+                n_ventas=Sum("ventas"),
+                total_canje_ingreso=Sum("cantidad_canje_ingreso"),
+                total_canje_egreso=Sum("cantidad_canje_egreso"),
+            )
+            .order_by(*KEY_FIELDS)
+        )
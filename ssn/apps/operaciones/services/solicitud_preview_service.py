@@ -1,25 +1,144 @@
-import re
+import hashlib
+import json
+import logging
+import math
 from io import BytesIO
 from urllib.parse import quote
 
-import numpy as np
-import pandas as pd
+import xlsxwriter
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 
+from ..helpers.number_utils import is_number, parse_numeric_str, to_decimal
 from ..helpers.text_utils import pretty_json
 from ..serializers import serialize_operations
+from .operacion_service import OperacionesService
+
+logger = logging.getLogger("operaciones")
+
+# Versión del formato de los artefactos de la vista previa: cambiarla invalida
+# todo lo cacheado en previews/ (por ejemplo, al cambiar el armado del Excel)
+PREVIEW_FORMAT_VERSION = "1"
+
+# Tipo de escritura de una celda de tabla (ver SolicitudPreviewService._cell_spec).
+# Los strings se escriben con write_string: nunca se interpretan como fórmula o URL.
+_NUMBER, _STRING, _BLANK, _OTHER = "number", "string", "blank", "other"
 
 
 class SolicitudPreviewService:
-    def __init__(self, base_request, operations):
+    """
+    Vista previa de una solicitud: JSON formateado, link mailto y Excel.
+
+    Los artefactos se cachean en previews/ bajo una clave derivada del
+    contenido de la solicitud (OperacionesService.get_content_version): si la
+    solicitud y sus operaciones no cambiaron, generar_preview_cacheado() los
+    lee del disco sin consultar operaciones ni serializar.
+
+    El Excel no se arma con la vista previa sino en la primera descarga
+    (obtener_excel), a partir del JSON cacheado.
+    """
+
+    def __init__(self, base_request, operations=None):
         self.base_request = base_request
-        self.operations = operations  # Lista de instancias de modelo
+        self.operations = operations  # Lista de instancias de modelo (None = cargar si hace falta)
         self.payload = None
         self.formatted_json = ""
         self.mailto_link = ""
         self.excel_link = ""
         self.is_monthly = base_request.tipo_entrega == "Mensual"
+        self._cache_key = None
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Caché por contenido
+    # ──────────────────────────────────────────────────────────────────────────
+
+    @property
+    def cache_key(self) -> str:
+        """Clave de los artefactos: cambia con cualquier edición de la solicitud o sus operaciones."""
+        if self._cache_key is None:
+            version = OperacionesService.get_content_version(self.base_request)
+            raw = f"{PREVIEW_FORMAT_VERSION}:{version}"
+            self._cache_key = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+        return self._cache_key
+
+    @property
+    def _prefix(self) -> str:
+        return f"solicitud_{self.base_request.uuid}_"
+
+    @property
+    def excel_filename(self) -> str:
+        return f"previews/{self._prefix}{self.cache_key}.xlsx"
+
+    @property
+    def json_filename(self) -> str:
+        return f"previews/{self._prefix}{self.cache_key}.json"
+
+    def _excel_url(self) -> str:
+        from django.urls import reverse
+        return reverse("operaciones:download_excel", kwargs={"uuid": str(self.base_request.uuid)})
+
+    def generar_preview_cacheado(self) -> bool:
+        """
+        Vista previa desde la caché; si no está (o la solicitud cambió) la genera
+        y la guarda.
+
+        Returns:
+            bool: False si la solicitud no tiene operaciones
+        """
+        if self._load_cache():
+            logger.debug(f"Vista previa de {self.base_request.uuid} servida desde caché")
+            return True
+
+        if self.operations is None:
+            self.operations = OperacionesService.get_all_operaciones(self.base_request)
+        if not self.generar_preview():
+            return False
+        self.excel_link = self._excel_url()
+        self._store(
+            self.json_filename,
+            json.dumps(
+                {"formatted_json": self.formatted_json, "mailto_link": self.mailto_link},
+                ensure_ascii=False,
+            ).encode("utf-8"),
+        )
+        self._purge_stale()
+        return True
+
+    def _load_cache(self) -> bool:
+        if not default_storage.exists(self.json_filename):
+            return False
+        try:
+            with default_storage.open(self.json_filename) as fh:
+                data = json.loads(fh.read().decode("utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Caché de vista previa ilegible ({self.json_filename}): {e}")
+            return False
+        self.formatted_json = data["formatted_json"]
+        self.mailto_link = data["mailto_link"]
+        self.excel_link = self._excel_url()
+        return True
+
+    @staticmethod
+    def _store(filename: str, content: bytes) -> None:
+        """Guarda un artefacto. El nombre depende del contenido: si ya existe, es idéntico."""
+        if default_storage.exists(filename):
+            return
+        saved = default_storage.save(filename, ContentFile(content))
+        if saved != filename:
+            # Otro request lo guardó primero y el storage le asignó otro nombre
+            default_storage.delete(saved)
+
+    def _purge_stale(self) -> None:
+        """Borra los artefactos de versiones anteriores de esta solicitud."""
+        try:
+            _, files = default_storage.listdir("previews")
+        except OSError:
+            return
+        current = {self.excel_filename, self.json_filename}
+        for name in files:
+            path = f"previews/{name}"
+            if name.startswith(self._prefix) and path not in current:
+                default_storage.delete(path)
 
     def generar_preview(self):
         if not self.operations:
@@ -33,7 +152,7 @@ class SolicitudPreviewService:
             for operacion in self.payload.get("operaciones", []):
                 if "cantEspecies" in operacion and operacion["cantEspecies"] is not None:
                     if operacion.get("tipoEspecie") != "FC":
-                        operacion["cantEspecies"] = int(float(operacion["cantEspecies"]))
+                        operacion["cantEspecies"] = int(to_decimal(operacion["cantEspecies"]))
 
         # Formateo JSON y mailto link
         self.formatted_json = pretty_json(self.payload)
@@ -45,10 +164,38 @@ class SolicitudPreviewService:
         )
         return True
 
-    def generar_excel(self):
-        if not self.payload:
+    def obtener_excel(self):
+        """
+        Nombre del Excel de la versión actual; lo arma y lo guarda si todavía no
+        existe (primera descarga desde el último cambio de la solicitud).
+
+        El payload se recupera del JSON cacheado por la vista previa (pretty_json
+        es reversible); solo si no está se serializan las operaciones.
+
+        Returns:
+            str | None: Ruta en default_storage, o None si no hay operaciones
+        """
+        if default_storage.exists(self.excel_filename):
+            return self.excel_filename
+
+        if self._load_cache():
+            self.payload = json.loads(self.formatted_json)
+        elif not self.generar_preview_cacheado():
             return None
 
+        self._store(self.excel_filename, self.build_excel())
+        logger.info(f"Excel de vista previa generado: {self.excel_filename}")
+        return self.excel_filename
+
+    def build_excel(self) -> bytes:
+        """Arma el xlsx de la vista previa y devuelve su contenido.
+
+        Recorre las filas serializadas una sola vez y escribe cada celda una
+        vez, en orden de filas, con xlsxwriter en modo constant_memory: cada
+        fila se vuelca a disco al pasar a la siguiente, así que la memoria no
+        crece con la cantidad de stocks. Totales y anchos de columna se
+        acumulan durante la misma pasada.
+        """
         from ..helpers import camel_to_title
 
         base_json = self.payload.copy()
@@ -62,43 +209,38 @@ class SolicitudPreviewService:
         else:
             operaciones_json = base_json.pop("operaciones", None)
 
-        # Info general
-        base_df = pd.DataFrame(list(base_json.items()), columns=["Campo", "Valor"])
-        base_df["Campo"] = base_df["Campo"].apply(camel_to_title)
-        base_df = base_df.replace([np.nan, np.inf, -np.inf], "")
+        # Info general (pares Campo / Valor)
+        base_rows = [
+            (camel_to_title(campo), self._clean_value(valor))
+            for campo, valor in base_json.items()
+        ]
 
         output = BytesIO()
-        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-            workbook = writer.book
-            formats = self._build_formats(workbook)
-
-            if self.is_monthly:
-                self._write_base_sheet(writer, base_df, "Solicitud", formats)
-
-                if stock_inversion:
-                    self._write_stock_sheet(
-                        writer, stock_inversion, "Stock Inversión", camel_to_title, formats
-                    )
-                if stock_plazo_fijo:
-                    self._write_stock_sheet(
-                        writer, stock_plazo_fijo, "Stock Plazo Fijo", camel_to_title, formats
-                    )
-                if stock_cheque_pd:
-                    self._write_stock_sheet(
-                        writer, stock_cheque_pd, "Stock Cheque PD", camel_to_title, formats
-                    )
-            else:
-                self._write_semanal_sheet(
-                    writer, base_df, operaciones_json or [], camel_to_title, formats
+        workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+        formats = self._build_formats(workbook)
+
+        if self.is_monthly:
+            self._write_base_sheet(workbook, base_rows, "Solicitud", formats)
+
+            if stock_inversion:
+                self._write_stock_sheet(
+                    workbook, stock_inversion, "Stock Inversión", camel_to_title, formats
+                )
+            if stock_plazo_fijo:
+                self._write_stock_sheet(
+                    workbook, stock_plazo_fijo, "Stock Plazo Fijo", camel_to_title, formats
                 )
+            if stock_cheque_pd:
+                self._write_stock_sheet(
+                    workbook, stock_cheque_pd, "Stock Cheque PD", camel_to_title, formats
+                )
+        else:
+            self._write_semanal_sheet(
+                workbook, base_rows, operaciones_json or [], camel_to_title, formats
+            )
 
-        output.seek(0)
-        filename = f"previews/solicitud_{self.base_request.uuid}.xlsx"
-        if default_storage.exists(filename):
-            default_storage.delete(filename)
-        default_storage.save(filename, ContentFile(output.read()))
-        from django.urls import reverse
-        return reverse("operaciones:download_excel", kwargs={"uuid": str(self.base_request.uuid)})
+        workbook.close()
+        return output.getvalue()
 
     # ──────────────────────────────────────────────────────────────────────────
     # Formatos xlsxwriter
@@ -125,186 +267,177 @@ class SolicitudPreviewService:
         }
 
     # ──────────────────────────────────────────────────────────────────────────
-    # Conversión numérica
+    # Conversión de filas
     # ──────────────────────────────────────────────────────────────────────────
 
-    # Detecta strings que son puramente numéricos (entero o decimal, con signo opcional).
-    # Excluye códigos alfanuméricos como "FC", "ARS", "TZXM7".
-    _NUMERIC_STR = re.compile(r"^-?\d+(\.\d+)?$")
+    @staticmethod
+    def _flatten(record, prefix=""):
+        """Aplana un dict anidado con claves "padre.hijo" (como pd.json_normalize).
 
-    def _convert_to_numeric(self, df):
-        """Convierte strings numéricos del serializador SSN a tipos Python nativos.
+        Un registro sin anidados se devuelve tal cual (solo se lee).
+        """
+        if not prefix and not any(isinstance(value, dict) for value in record.values()):
+            return record
+        flat = {}
+        for key, value in record.items():
+            if isinstance(value, dict):
+                flat.update(SolicitudPreviewService._flatten(value, f"{prefix}{key}."))
+            else:
+                flat[f"{prefix}{key}"] = value
+        return flat
+
+    @staticmethod
+    def _columns(flat_records):
+        """Columnas en orden de primera aparición (unión de todas las filas aplanadas)."""
+        columns = {}
+        for flat in flat_records:
+            columns.update(dict.fromkeys(flat))
+        return list(columns)
+
+    @staticmethod
+    def _clean_value(value):
+        """NaN e infinitos se escriben como celda vacía."""
+        if isinstance(value, float) and (value != value or value in (math.inf, -math.inf)):
+            return ""
+        return value
+
+    def _to_cell(self, value):
+        """Convierte un valor del serializador SSN al que se escribe en la celda.
 
         El serializador devuelve Decimal convertidos a str ("43937772.9914", "792868669").
         Para que Excel los reconozca como números (y permita SUM/avg), los convertimos
-        de vuelta a int o float antes de escribir la celda.
+        de vuelta a int (sin ".0") o Decimal antes de escribir la celda, sin pasar
+        por float: los totales se suman de forma exacta.
         """
-        def _to_num(v):
-            if isinstance(v, bool) or v is None or v == "":
-                return v
-            if isinstance(v, (int, float)):
-                return v if v == v else ""  # NaN → ""
-            if isinstance(v, str) and self._NUMERIC_STR.match(v.strip()):
-                try:
-                    f = float(v)
-                    # Preservar entero para que Excel no muestre ".0"
-                    return int(f) if f == int(f) else f
-                except (ValueError, OverflowError):
-                    return v
-            return v
-
-        return df.apply(lambda col: col.map(_to_num))
-
-    def _numeric_columns(self, df):
-        """Devuelve el conjunto de nombres de columnas que contienen al menos un número."""
-        return {
-            col for col in df.columns
-            if df[col].apply(
-                lambda v: isinstance(v, (int, float)) and not isinstance(v, bool)
-            ).any()
-        }
+        value = self._clean_value(value)
+        if isinstance(value, bool) or value is None or value == "":
+            return value
+        return parse_numeric_str(value)
+
+    def _cell_spec(self, raw):
+        """(valor de celda, tipo de escritura, ancho en caracteres) de un valor crudo."""
+        value = self._to_cell(raw)
+        if is_number(value):
+            kind = _NUMBER
+        elif value is None or value == "":
+            kind = _BLANK
+        elif isinstance(value, str):
+            kind = _STRING
+        else:
+            kind = _OTHER
+        return value, kind, len(str(value))
 
     # ──────────────────────────────────────────────────────────────────────────
     # Escritura de hojas
     # ──────────────────────────────────────────────────────────────────────────
 
-    def _write_base_sheet(self, writer, base_df, sheet_name, formats):
-        """Hoja de información general de la solicitud (pares Campo / Valor)."""
-        base_df.to_excel(
-            writer, index=False, header=False,
-            startrow=0, startcol=0, sheet_name=sheet_name,
-        )
-        worksheet = writer.sheets[sheet_name]
+    def _write_base_rows(self, worksheet, base_rows, formats):
+        """Pares Campo / Valor desde la fila 0. Devuelve el ancho de cada columna."""
+        widths = [len("Campo"), len("Valor")]
+        for row, (campo, valor) in enumerate(base_rows):
+            worksheet.write(row, 0, campo, formats["bold_border"])
+            worksheet.write(row, 1, valor, formats["border"])
+            widths[0] = max(widths[0], len(str(campo)))
+            widths[1] = max(widths[1], len(str(valor)))
+        return [width + 2 for width in widths]
+
+    def _write_table(self, worksheet, records, startrow, camel_to_title, formats):
+        """Tabla con encabezado, una fila por registro y fila de totales.
+
+        Escribe cada celda una sola vez y en orden de filas (requisito de
+        constant_memory). Las columnas con al menos un número llevan formato
+        numérico y total. Cada registro se aplana una sola vez: el resultado
+        sirve para el encabezado y para las filas. Devuelve el ancho de cada
+        columna.
+        """
+        flat_records = [self._flatten(record) for record in records]
+        columns = self._columns(flat_records)
+        headers = [camel_to_title(col) for col in columns]
+
+        for col_idx, header in enumerate(headers):
+            worksheet.write(startrow, col_idx, header, formats["header"])
+
+        widths = [max(len(header), 8) for header in headers]
+        totals = [None] * len(columns)  # None = columna sin valores numéricos
+
+        # Cada string distinto se convierte una sola vez: en las hojas de stock
+        # se repiten mucho (booleanos "1"/"0", códigos, fechas, monedas)
+        specs = {}
+        write_number = worksheet.write_number
+        write_string = worksheet.write_string
+        write_blank = worksheet.write_blank
+        num_fmt, border_fmt = formats["num"], formats["border"]
+
+        excel_row = startrow
+        for flat in flat_records:
+            excel_row += 1
+            for col_idx, col in enumerate(columns):
+                raw = flat.get(col, "")
+                cacheable = type(raw) is str
+                spec = specs.get(raw) if cacheable else None
+                if spec is None:
+                    spec = self._cell_spec(raw)
+                    if cacheable:
+                        specs[raw] = spec
+                value, kind, width = spec
+
+                if kind == _NUMBER:
+                    write_number(excel_row, col_idx, value, num_fmt)
+                    total = totals[col_idx]
+                    totals[col_idx] = value if total is None else total + value
+                elif kind == _STRING:
+                    write_string(excel_row, col_idx, value, border_fmt)
+                elif kind == _BLANK:
+                    write_blank(excel_row, col_idx, None, border_fmt)
+                else:
+                    worksheet.write(excel_row, col_idx, value, border_fmt)
+                if width > widths[col_idx]:
+                    widths[col_idx] = width
+
+        # Fila de totales
+        if records:
+            total_row = excel_row + 1
+            for col_idx, total in enumerate(totals):
+                if total is not None:
+                    worksheet.write(total_row, col_idx, total, formats["total_num"])
+                elif col_idx == 0:
+                    worksheet.write(total_row, col_idx, "Total", formats["total_label"])
+                else:
+                    worksheet.write(total_row, col_idx, "", formats["total_label"])
 
-        for row in range(len(base_df)):
-            worksheet.write(row, 0, base_df.iloc[row, 0], formats["bold_border"])
-            worksheet.write(row, 1, base_df.iloc[row, 1], formats["border"])
+        return [width + 2 for width in widths]
 
-        for i, col in enumerate(base_df.columns):
-            max_len = max(base_df[col].astype(str).map(len).max(), len(col))
-            worksheet.set_column(i, i, max_len + 2)
+    def _write_base_sheet(self, workbook, base_rows, sheet_name, formats):
+        """Hoja de información general de la solicitud (pares Campo / Valor)."""
+        worksheet = workbook.add_worksheet(sheet_name)
+        for i, width in enumerate(self._write_base_rows(worksheet, base_rows, formats)):
+            worksheet.set_column(i, i, width)
 
-    def _write_stock_sheet(self, writer, stock_data, sheet_name, camel_to_title, formats):
+    def _write_stock_sheet(self, workbook, stock_data, sheet_name, camel_to_title, formats):
         """Hoja de stock (inversión / plazo fijo / cheque PD).
 
-        Mejoras respecto a la versión anterior:
         - Valores numéricos escritos como números reales → Excel puede hacer SUM.
         - Formato de celda num_format para visualización con separadores.
         - Fila de totales al final de columnas numéricas.
         - Freeze del encabezado para facilitar el scroll.
         """
-        stock_df = pd.json_normalize(stock_data)
-        stock_df.columns = [camel_to_title(col) for col in stock_df.columns]
-        stock_df = stock_df.replace([np.nan, np.inf, -np.inf], "")
-        stock_df = self._convert_to_numeric(stock_df)
-
-        num_cols = self._numeric_columns(stock_df)
-        n_rows, n_cols = len(stock_df), len(stock_df.columns)
-
-        workbook = writer.book
-        # Necesitamos una hoja nueva; to_excel la crea automáticamente
-        stock_df.to_excel(writer, index=False, startrow=0, startcol=0, sheet_name=sheet_name)
-        worksheet = writer.sheets[sheet_name]
-
-        # Freeze de la fila de encabezado
+        worksheet = workbook.add_worksheet(sheet_name)
         worksheet.freeze_panes(1, 0)
+        widths = self._write_table(worksheet, stock_data, 0, camel_to_title, formats)
+        for i, width in enumerate(widths):
+            worksheet.set_column(i, i, width)
 
-        # Encabezado
-        for col_idx, col_name in enumerate(stock_df.columns):
-            worksheet.write(0, col_idx, col_name, formats["header"])
-
-        # Filas de datos
-        for row_idx, (_, row) in enumerate(stock_df.iterrows()):
-            excel_row = row_idx + 1  # row 0 = header
-            for col_idx, col_name in enumerate(stock_df.columns):
-                value = row[col_name]
-                is_num = isinstance(value, (int, float)) and not isinstance(value, bool)
-                fmt = formats["num"] if (col_name in num_cols and is_num) else formats["border"]
-                worksheet.write(excel_row, col_idx, value, fmt)
-
-        # Fila de totales
-        if n_rows > 0:
-            total_row = n_rows + 1  # justo después de la última fila de datos
-            for col_idx, col_name in enumerate(stock_df.columns):
-                if col_name in num_cols:
-                    col_total = stock_df[col_name].apply(
-                        lambda v: v if (isinstance(v, (int, float)) and not isinstance(v, bool)) else 0
-                    ).sum()
-                    worksheet.write(total_row, col_idx, col_total, formats["total_num"])
-                elif col_idx == 0:
-                    worksheet.write(total_row, col_idx, "Total", formats["total_label"])
-                else:
-                    worksheet.write(total_row, col_idx, "", formats["total_label"])
-
-        # Ancho de columnas (considera también la fila de totales)
-        for i, col in enumerate(stock_df.columns):
-            max_data_len = stock_df[col].astype(str).map(len).max() if n_rows > 0 else 0
-            col_width = max(max_data_len, len(col), 8)
-            worksheet.set_column(i, i, col_width + 2)
-
-    def _write_semanal_sheet(self, writer, base_df, operaciones_json, camel_to_title, formats):
+    def _write_semanal_sheet(self, workbook, base_rows, operaciones_json, camel_to_title, formats):
         """Hoja única para entrega semanal: info general + tabla de operaciones + totales."""
-        sheet_name = "Solicitud"
-
-        # Sección info general
-        base_df.to_excel(
-            writer, index=False, header=False,
-            startrow=0, startcol=0, sheet_name=sheet_name,
-        )
-
-        operaciones_df = pd.json_normalize(operaciones_json)
-        operaciones_df.columns = [camel_to_title(col) for col in operaciones_df.columns]
-        operaciones_df = operaciones_df.replace([np.nan, np.inf, -np.inf], "")
-        operaciones_df = self._convert_to_numeric(operaciones_df)
-
-        startrow = len(base_df) + 2
-        operaciones_df.to_excel(
-            writer, index=False, startrow=startrow, startcol=0, sheet_name=sheet_name,
-        )
-
-        worksheet = writer.sheets[sheet_name]
+        worksheet = workbook.add_worksheet("Solicitud")
+        startrow = len(base_rows) + 2
         worksheet.freeze_panes(startrow + 1, 0)
 
-        num_cols = self._numeric_columns(operaciones_df)
-        n_rows = len(operaciones_df)
-
-        # Estilo info general
-        for row in range(len(base_df)):
-            worksheet.write(row, 0, base_df.iloc[row, 0], formats["bold_border"])
-            worksheet.write(row, 1, base_df.iloc[row, 1], formats["border"])
-
-        # Encabezado operaciones
-        for col_idx, col_name in enumerate(operaciones_df.columns):
-            worksheet.write(startrow, col_idx, col_name, formats["header"])
-
-        # Filas de datos operaciones
-        for row_idx, (_, row) in enumerate(operaciones_df.iterrows()):
-            excel_row = startrow + 1 + row_idx
-            for col_idx, col_name in enumerate(operaciones_df.columns):
-                value = row[col_name]
-                is_num = isinstance(value, (int, float)) and not isinstance(value, bool)
-                fmt = formats["num"] if (col_name in num_cols and is_num) else formats["border"]
-                worksheet.write(excel_row, col_idx, value, fmt)
-
-        # Fila de totales
-        if n_rows > 0:
-            total_row = startrow + 1 + n_rows
-            for col_idx, col_name in enumerate(operaciones_df.columns):
-                if col_name in num_cols:
-                    col_total = operaciones_df[col_name].apply(
-                        lambda v: v if (isinstance(v, (int, float)) and not isinstance(v, bool)) else 0
-                    ).sum()
-                    worksheet.write(total_row, col_idx, col_total, formats["total_num"])
-                elif col_idx == 0:
-                    worksheet.write(total_row, col_idx, "Total", formats["total_label"])
-                else:
-                    worksheet.write(total_row, col_idx, "", formats["total_label"])
+        base_widths = self._write_base_rows(worksheet, base_rows, formats)
+        widths = self._write_table(worksheet, operaciones_json, startrow, camel_to_title, formats)
 
-        # Anchos de columna
-        for i, col in enumerate(base_df.columns):
-            max_len = max(base_df[col].astype(str).map(len).max(), len(col))
-            worksheet.set_column(i, i, max_len + 2)
-        for i, col in enumerate(operaciones_df.columns):
-            max_data_len = operaciones_df[col].astype(str).map(len).max() if n_rows > 0 else 0
-            col_width = max(max_data_len, len(col), 8)
-            worksheet.set_column(i, i, col_width + 2)
+        # Las columnas de la tabla de operaciones definen el ancho; si hay menos
+        # columnas que en la info general, esas conservan el ancho de la info
+        widths += base_widths[len(widths):]
+        for i, width in enumerate(widths):
+            worksheet.set_column(i, i, width)
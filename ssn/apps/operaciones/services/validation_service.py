@@ -10,7 +10,7 @@ from typing import TYPE_CHECKING
 
 from django.conf import settings
 
-from ssn_client.services import consultar_estado_ssn, EstadoSSN
+from ssn_client.services import consultar_estado_ssn_cacheado, EstadoSSN
 
 if TYPE_CHECKING:
     from ..models import BaseRequestModel
@@ -217,7 +217,7 @@ class SolicitudValidationService:
                 codigo_compania=settings.SSN_API_CIA,
             )
             
-            estado_ssn, response, status = consultar_estado_ssn(temp_request)
+            estado_ssn, response, status = consultar_estado_ssn_cacheado(temp_request)
             logger.info(f"Validación SSN para {cronograma} ({tipo_entrega}): estado={estado_ssn}, status={status}")
             
             # Si no se pudo obtener el estado (error de conexión, timeout, etc.)
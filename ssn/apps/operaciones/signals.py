@@ -0,0 +1,136 @@
+"""
+Signals de operaciones: mantienen el libro de posiciones (PosicionSemanal).
+
+Al guardar se resta la contribución anterior (leída en pre_save) y se suma la
+nueva; al borrar se resta. Los canjes aportan dos contribuciones (detalle A
+egresa, detalle B ingresa) y también se actualizan cuando se edita un detalle
+(que además actualiza el updated_at de su canje).
+
+bulk_create / bulk_update / update() no disparan signals: esos caminos deben
+llamar a PosicionesService.rebuild() al terminar.
+"""
+
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import CanjeOperacion, CompraOperacion, DetalleOperacionCanje, VentaOperacion
+from .services.posicion_service import PosicionesService
+
+
+# --- Compras y ventas ---------------------------------------------------------
+
+@receiver(pre_save, sender=CompraOperacion)
+@receiver(pre_save, sender=VentaOperacion)
+def movimiento_pre_save(sender, instance, raw=False, **kwargs):
+    instance._contribucion_anterior = None
+    if raw or instance._state.adding:
+        return
+    anterior = sender.objects.filter(pk=instance.pk).first()
+    if anterior is not None:
+        instance._contribucion_anterior = PosicionesService.contribucion(anterior)
+
+
+@receiver(post_save, sender=CompraOperacion)
+@receiver(post_save, sender=VentaOperacion)
+def movimiento_post_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    PosicionesService.reemplazar(
+        [getattr(instance, "_contribucion_anterior", None)],
+        [PosicionesService.contribucion(instance)],
+    )
+
+
+@receiver(post_delete, sender=CompraOperacion)
+@receiver(post_delete, sender=VentaOperacion)
+def movimiento_post_delete(sender, instance, **kwargs):
+    PosicionesService.aplicar([PosicionesService.contribucion(instance)], -1)
+
+
+# --- Canjes -------------------------------------------------------------------
+
+def _contribuciones_canje_guardado(solicitud_id, detalle_a_id, detalle_b_id):
+    """Contribuciones de un canje a partir de los detalles guardados en la base."""
+    detalles = DetalleOperacionCanje.objects.in_bulk([detalle_a_id, detalle_b_id])
+    return PosicionesService.contribuciones_canje(
+        solicitud_id,
+        {"detalle_a": detalles.get(detalle_a_id), "detalle_b": detalles.get(detalle_b_id)},
+    )
+
+
+@receiver(pre_save, sender=CanjeOperacion)
+def canje_pre_save(sender, instance, raw=False, **kwargs):
+    instance._canje_anterior = None
+    if raw or instance._state.adding:
+        return
+    instance._canje_anterior = (
+        CanjeOperacion.objects.filter(pk=instance.pk)
+        .values_list("solicitud_id", "detalle_a_id", "detalle_b_id")
+        .first()
+    )
+
+
+@receiver(post_save, sender=CanjeOperacion)
+def canje_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    actual = (instance.solicitud_id, instance.detalle_a_id, instance.detalle_b_id)
+    anterior = getattr(instance, "_canje_anterior", None)
+    if anterior == actual:
+        # Los cambios de los detalles los registra detalle_post_save
+        return
+    PosicionesService.reemplazar(
+        _contribuciones_canje_guardado(*anterior) if anterior else [],
+        _contribuciones_canje_guardado(*actual),
+    )
+
+
+@receiver(pre_delete, sender=CanjeOperacion)
+def canje_pre_delete(sender, instance, **kwargs):
+    # Los detalles se leen antes del borrado (pueden caer en la misma cascada)
+    instance._contribuciones = _contribuciones_canje_guardado(
+        instance.solicitud_id, instance.detalle_a_id, instance.detalle_b_id
+    )
+
+
+@receiver(post_delete, sender=CanjeOperacion)
+def canje_post_delete(sender, instance, **kwargs):
+    PosicionesService.aplicar(getattr(instance, "_contribuciones", []), -1)
+
+
+@receiver(pre_save, sender=DetalleOperacionCanje)
+def detalle_pre_save(sender, instance, raw=False, **kwargs):
+    instance._detalle_anterior = None
+    if raw or instance._state.adding:
+        return
+    instance._detalle_anterior = DetalleOperacionCanje.objects.filter(pk=instance.pk).first()
+
+
+@receiver(post_save, sender=DetalleOperacionCanje)
+def detalle_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        # Un detalle nuevo todavía no tiene canje: lo suma canje_post_save
+        return
+    canje = (
+        CanjeOperacion.objects.filter(Q(detalle_a_id=instance.pk) | Q(detalle_b_id=instance.pk))
+        .values_list("pk", "solicitud_id", "detalle_a_id")
+        .first()
+    )
+    if canje is None:
+        return
+    canje_id, solicitud_id, detalle_a_id = canje
+
+    # El detalle no tiene timestamps: la edición se refleja en el updated_at del
+    # canje (lo usa la huella de contenido de la vista previa)
+    CanjeOperacion.objects.filter(pk=canje_id).update(updated_at=timezone.now())
+
+    anterior = getattr(instance, "_detalle_anterior", None)
+    if anterior is None:
+        return
+    lado = "detalle_a" if detalle_a_id == instance.pk else "detalle_b"
+    PosicionesService.reemplazar(
+        PosicionesService.contribuciones_canje(solicitud_id, {lado: anterior}),
+        PosicionesService.contribuciones_canje(solicitud_id, {lado: instance}),
+    )
@@ -0,0 +1,1268 @@
+"""
+Tests for operaciones app.
+
+Test management commands, services and serialization paths.
+"""
+
+import json
+import tempfile
+import threading
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from operaciones.helpers.payload_utils import normalize_ssn_payload
+
+from operaciones.models import (
+    BaseRequestModel,
+    CanjeOperacion,
+    CompraOperacion,
+    EmailOutbox,
+    EstadoEmail,
+    EstadoSolicitud,
+    InversionStock,
+    PosicionSemanal,
+    TipoEntrega,
+)
+from ssn_client.apps import SsnClientConfig
+
+
+TESTDATA_DIR = Path(__file__).resolve().parent / "testdata"
+
+
+def load_fixture(name):
+    """Carga una respuesta grabada de la API de SSN desde testdata/."""
+    return json.loads((TESTDATA_DIR / name).read_text(encoding="utf-8"))
+
+
+class NormalizeSsnPayloadTests(SimpleTestCase):
+    """Tests for the single-pass SSN payload normalizer."""
+
+    def test_normalizes_recorded_weekly_response(self):
+        data = normalize_ssn_payload(load_fixture("entrega_semanal.json"))
+
+        self.assertEqual(data["codigo_compania"], "0744")
+        compra = data["operaciones"][0]
+        self.assertEqual(compra["fecha_movimiento"], "2025-04-07")
+        self.assertEqual(compra["cant_especies"], 150000)
+
+        venta = data["operaciones"][2]
+        self.assertNotIn("fecha_pase_vt", venta)
+        self.assertNotIn("precio_pase_vt", venta)
+
+        canje = data["operaciones"][3]
+        self.assertEqual(canje["detalle_a"]["fecha_pase_vt"], "2025-04-10")
+
+        plazo_fijo = data["operaciones"][4]
+        self.assertIsNone(plazo_fijo["valor_nominal_origen"])
+        self.assertNotIn("codigo_titulo", plazo_fijo)
+
+    def test_keeps_invalid_dates_and_list_items(self):
+        data = normalize_ssn_payload(
+            {"fechaX": "31022025", "otroCampo": "01012025", "lista": ["", "null", [{"aB": ""}]]}
+        )
+
+        self.assertEqual(
+            data, {"fecha_x": "31022025", "otro_campo": "01012025", "lista": ["", "null", [{}]]}
+        )
+
+
+class NumberFormattingTests(SimpleTestCase):
+    """Propiedades del formateo Decimal de helpers/number_utils frente al camino float anterior."""
+
+    SAMPLES = 2000
+
+    @staticmethod
+    def _legacy_entero(value):
+        return str(int(float(value)))
+
+    @staticmethod
+    def _legacy_max_decimales(value, places):
+        float_val = float(value)
+        if float_val == int(float_val):
+            return str(int(float_val))
+        return str(round(float_val, places)).rstrip('0').rstrip('.')
+
+    def _random_decimal(self, rng, max_digits, decimal_places):
+        """Decimal aleatorio que entra en un DecimalField(max_digits, decimal_places)."""
+        digits = rng.randint(1, max_digits)
+        unscaled = rng.randrange(10 ** (digits - 1), 10 ** digits) * rng.choice((1, -1))
+        return Decimal(unscaled).scaleb(-decimal_places)
+
+    def test_same_output_as_float_path_on_model_precisions(self):
+        import random
+
+        from operaciones.helpers.number_utils import format_entero, format_max_decimales
+
+        rng = random.Random(2025)
+        for _ in range(self.SAMPLES):
+            # valor_contable (14,0), valor_nominal_* (10,0)
+            value = str(self._random_decimal(rng, 14, 0))
+            self.assertEqual(format_entero(value), self._legacy_entero(value), value)
+            # cant_especies (20,6) no FCI: parte entera dentro de la precisión de float
+            value = str(self._random_decimal(rng, 15, 6))
+            self.assertEqual(format_entero(value), self._legacy_entero(value), value)
+            # tasa (5,3) y precio_pase_vt (8,2)
+            for max_digits, places in ((5, 3), (8, 2)):
+                value = str(self._random_decimal(rng, max_digits, places))
+                self.assertEqual(
+                    format_max_decimales(value, places),
+                    self._legacy_max_decimales(value, places),
+                    value,
+                )
+
+    def test_exact_above_2_pow_53(self):
+        from operaciones.helpers.number_utils import (
+            format_ar_number,
+            format_entero,
+            format_max_decimales,
+            parse_numeric_str,
+        )
+
+        huge = "12345678901234567891"  # > 2**53 y > 2**63
+        self.assertNotEqual(self._legacy_entero(huge), huge)
+        self.assertEqual(format_entero(huge), huge)
+        self.assertEqual(format_entero(huge + ".999999"), huge)
+        self.assertEqual(format_entero(Decimal(-(2 ** 53) - 1)), str(-(2 ** 53) - 1))
+        self.assertEqual(format_max_decimales("98765432109876543210.125", 2), "98765432109876543210.12")
+        self.assertEqual(format_ar_number(Decimal(huge + ".5")), "12.345.678.901.234.567.891,5")
+        self.assertEqual(parse_numeric_str(huge), int(huge))
+        self.assertEqual(parse_numeric_str("9007199254740993.25"), Decimal("9007199254740993.25"))
+
+    def test_format_ar_number(self):
+        from operaciones.helpers.number_utils import format_ar_number
+
+        casos = {
+            Decimal("2630913.678600"): "2.630.913,6786",
+            99421.04: "99.421,04",
+            Decimal("100000.00"): "100.000",
+            "180.05": "180,05",
+            685: "685",
+            Decimal("-1234.50"): "-1.234,5",
+            None: "",
+            "ARS": "ARS",
+        }
+        for value, esperado in casos.items():
+            self.assertEqual(format_ar_number(value), esperado, value)
+
+
+class FakeSsnClient:
+    """Cliente SSN en memoria que registra los cronogramas consultados."""
+
+    def __init__(self, payloads=None, failing=()):
+        self.payloads = payloads or {}
+        self.failing = set(failing)
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def set_pool_size(self, size):
+        self.pool_size = size
+
+    def warm_up(self, background=True):
+        return None
+
+    def get_resource(self, resource, params=None):
+        cronograma = resource.rsplit("cronograma=", 1)[-1]
+        with self._lock:
+            self.requested.append(cronograma)
+        if cronograma in self.failing:
+            return {"error": "timeout"}, 503
+        return self.payloads.get(cronograma, {"operaciones": []}), 200
+
+
+class SyncSsnDataCommandTests(TestCase):
+    """Tests for sync_ssn_data --workers / checkpoint."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.checkpoint = Path(self.tmpdir.name) / "sync.checkpoint.json"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _run(self, client, **options):
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            call_command(
+                "sync_ssn_data",
+                period="semanal",
+                year=2020,
+                checkpoint=str(self.checkpoint),
+                stdout=mock.MagicMock(),
+                **options,
+            )
+
+    def test_concurrent_sync_creates_every_cronograma(self):
+        client = FakeSsnClient()
+
+        self._run(client, workers=4)
+
+        self.assertEqual(len(client.requested), 53)
+        self.assertEqual(
+            BaseRequestModel.objects.filter(tipo_entrega=TipoEntrega.SEMANAL).count(), 53
+        )
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_failed_run_resumes_from_checkpoint(self):
+        self._run(FakeSsnClient(failing={"2020-10", "2020-11"}), workers=4, force=True)
+
+        saved = json.loads(self.checkpoint.read_text())
+        self.assertEqual(len(saved["completed"]), 51)
+        self.assertNotIn("2020-10", saved["completed"])
+
+        retry_client = FakeSsnClient()
+        self._run(retry_client, workers=4, force=True)
+
+        self.assertCountEqual(retry_client.requested, ["2020-10", "2020-11"])
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_single_cronograma_run_keeps_year_checkpoint(self):
+        self._run(FakeSsnClient(failing={"2020-10", "2020-11"}), workers=4, force=True)
+
+        self._run(FakeSsnClient(), cronograma="2020-10", force=True)
+
+        # La corrida puntual termina bien pero no descarta el progreso del año
+        saved = json.loads(self.checkpoint.read_text())
+        self.assertEqual(len(saved["completed"]), 51)
+        self.assertNotIn("2020-10", saved["completed"])
+
+        retry_client = FakeSsnClient()
+        self._run(retry_client, workers=4, force=True)
+
+        self.assertCountEqual(retry_client.requested, ["2020-10", "2020-11"])
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_checkpoint_is_scoped_to_the_run_mode(self):
+        self._run(FakeSsnClient(failing={"2020-10"}), workers=4)
+        self.assertEqual(json.loads(self.checkpoint.read_text())["mode"], "default")
+
+        # --force no saltea lo que marcó una corrida normal
+        force_client = FakeSsnClient()
+        self._run(force_client, workers=4, force=True)
+        self.assertEqual(len(force_client.requested), 53)
+
+    def test_explicit_cronograma_ignores_done_marks(self):
+        self._run(FakeSsnClient(failing={"2020-10"}), workers=4, force=True)
+        self.assertIn("2020-30", json.loads(self.checkpoint.read_text())["completed"])
+
+        client = FakeSsnClient()
+        self._run(client, cronograma="2020-30", force=True)
+
+        self.assertEqual(client.requested, ["2020-30"])
+
+    def test_bulk_sync_weekly_operations(self):
+        client = FakeSsnClient({"2025-15": load_fixture("entrega_semanal.json")})
+
+        self._run(client, cronograma="2025-15", batch_size=2)
+
+        solicitud = BaseRequestModel.objects.get(cronograma="2025-15")
+        self.assertEqual(solicitud.compras.count(), 2)
+        self.assertEqual(solicitud.ventas.count(), 1)
+        self.assertEqual(solicitud.plazos_fijos.count(), 1)
+
+        canje = CanjeOperacion.objects.select_related("detalle_a", "detalle_b").get(
+            solicitud=solicitud
+        )
+        self.assertEqual(canje.tipo_operacion, "J")
+        self.assertEqual(canje.detalle_a.codigo_especie, "TX26")
+        self.assertEqual(canje.detalle_b.codigo_especie, "TZX26")
+
+        # Redondeo de save() replicado en el camino bulk: entero salvo FCI
+        fci = CompraOperacion.objects.get(solicitud=solicitud, tipo_especie="FC")
+        self.assertEqual(str(fci.cant_especies), "12345.678901")
+        self.assertEqual(fci.tipo_operacion, "C")
+
+    def test_bulk_sync_monthly_stocks(self):
+        client = FakeSsnClient({"2025-03": load_fixture("entrega_mensual.json")})
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            call_command(
+                "sync_ssn_data", period="mensual", year=2025, cronograma="2025-03",
+                checkpoint=str(self.checkpoint), stdout=mock.MagicMock(),
+            )
+
+        solicitud = BaseRequestModel.objects.get(cronograma="2025-03")
+        self.assertEqual(solicitud.stocks_inversion_mensuales.count(), 2)
+        self.assertEqual(solicitud.stocks_plazofijo_mensuales.count(), 1)
+        self.assertEqual(solicitud.stocks_chequespd_mensuales.count(), 1)
+        self.assertTrue(
+            InversionStock.objects.get(solicitud=solicitud, codigo_especie="AL30").libre_disponibilidad
+        )
+
+    def test_incremental_sync_applies_row_diff(self):
+        self._run(FakeSsnClient({"2025-15": load_fixture("entrega_semanal.json")}), cronograma="2025-15")
+        solicitud = BaseRequestModel.objects.get(cronograma="2025-15")
+        self.assertTrue(solicitud.sync_hash)
+        # sync_hash es interno: no viaja en el payload a la SSN
+        from operaciones.serializers import serialize_operations
+        from operaciones.services import OperacionesService
+
+        payload = serialize_operations(solicitud, OperacionesService.get_all_operaciones(solicitud))
+        self.assertNotIn("syncHash", payload)
+        compra_id = CompraOperacion.objects.get(solicitud=solicitud, codigo_especie="AL30").pk
+
+        # Misma respuesta: no se toca nada
+        with mock.patch.object(BaseRequestModel, "save") as save:
+            self._run(
+                FakeSsnClient({"2025-15": load_fixture("entrega_semanal.json")}),
+                cronograma="2025-15", incremental=True,
+            )
+            save.assert_not_called()
+
+        changed = load_fixture("entrega_semanal.json")
+        operaciones = changed["operaciones"]
+        operaciones[0]["precioCompra"] = 72.1                 # update
+        del operaciones[2]                                     # delete venta
+        operaciones[2]["detalleB"]["cantEspecies"] = 19000     # canje distinto
+        self._run(FakeSsnClient({"2025-15": changed}), cronograma="2025-15", incremental=True)
+
+        solicitud.refresh_from_db()
+        compra = CompraOperacion.objects.get(solicitud=solicitud, codigo_especie="AL30")
+        self.assertEqual(compra.pk, compra_id)
+        self.assertEqual(str(compra.precio_compra), "72.10")
+        self.assertEqual(solicitud.ventas.count(), 0)
+        self.assertEqual(solicitud.canjes.get().detalle_b.cant_especies, 19000)
+        self.assertEqual(solicitud.compras.count(), 2)
+        self.assertEqual(solicitud.plazos_fijos.count(), 1)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "ssn_status": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "reconcile-tests",
+        },
+    }
+)
+class ReconcileSsnStatusCommandTests(TestCase):
+    """Tests for reconcile_ssn_status."""
+
+    def setUp(self):
+        from ssn_client import services
+
+        self.services = services
+
+    def _solicitud(self, cronograma, estado):
+        return BaseRequestModel.objects.create(
+            codigo_compania="0744", tipo_entrega=TipoEntrega.SEMANAL,
+            cronograma=cronograma, estado=estado,
+        )
+
+    def test_applies_transitions_with_no_regression(self):
+        EstadoSSN = self.services.EstadoSSN
+        cargado = self._solicitud("2025-10", EstadoSolicitud.CARGADO)
+        pendiente = self._solicitud("2025-11", EstadoSolicitud.RECTIFICACION_PENDIENTE)
+        a_rectificar = self._solicitud("2025-12", EstadoSolicitud.A_RECTIFICAR)
+        caido = self._solicitud("2025-13", EstadoSolicitud.CARGADO)
+        presentado = self._solicitud("2025-14", EstadoSolicitud.PRESENTADO)
+
+        respuestas = {
+            "2025-10": (EstadoSSN.PRESENTADO, {}, 200),
+            "2025-11": (EstadoSSN.PRESENTADO, {}, 200),   # no-regresión
+            "2025-12": (EstadoSSN.PRESENTADO, {}, 200),
+            "2025-13": (None, {"error": "timeout"}, 503),
+        }
+        consultados = []
+
+        def consultar(solicitud):
+            consultados.append(solicitud.cronograma)
+            return respuestas[solicitud.cronograma]
+
+        with mock.patch.object(self.services, "consultar_estado_ssn", side_effect=consultar):
+            # select + savepoint, select_for_update, bulk_update, release
+            with self.assertNumQueries(5):
+                call_command("reconcile_ssn_status", workers=3, stdout=mock.MagicMock())
+
+        self.assertCountEqual(consultados, ["2025-10", "2025-11", "2025-12", "2025-13"])
+        for solicitud in (cargado, pendiente, a_rectificar, caido, presentado):
+            solicitud.refresh_from_db()
+        self.assertEqual(cargado.estado, EstadoSolicitud.PRESENTADO)
+        self.assertEqual(pendiente.estado, EstadoSolicitud.RECTIFICACION_PENDIENTE)
+        self.assertEqual(a_rectificar.estado, EstadoSolicitud.PRESENTADO)
+        self.assertEqual(caido.estado, EstadoSolicitud.CARGADO)
+
+        # Las consultas quedan en caché para las vistas
+        with mock.patch.object(self.services, "consultar_estado_ssn") as consultar_vivo:
+            estado, _, _ = self.services.consultar_estado_ssn_cacheado(cargado)
+            consultar_vivo.assert_not_called()
+        self.assertEqual(estado, EstadoSSN.PRESENTADO)
+
+    def test_dry_run_does_not_write(self):
+        solicitud = self._solicitud("2025-20", EstadoSolicitud.CARGADO)
+        respuesta = (self.services.EstadoSSN.PRESENTADO, {}, 200)
+
+        with mock.patch.object(self.services, "consultar_estado_ssn", return_value=respuesta):
+            call_command("reconcile_ssn_status", dry_run=True, stdout=mock.MagicMock())
+
+        solicitud.refresh_from_db()
+        self.assertEqual(solicitud.estado, EstadoSolicitud.CARGADO)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "ssn_status": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "decision-tests",
+        },
+    },
+    SSN_STATUS_CACHE_TTL=300,
+)
+class SsnStatusDecisionTests(TestCase):
+    """Envío y rectificación deciden con el estado SSN en vivo, no con la caché."""
+
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from ssn_client import services
+
+        self.services = services
+        self.client.force_login(get_user_model().objects.create_user("estado", password="x"))
+
+    def _solicitud(self, estado):
+        solicitud = BaseRequestModel.objects.create(
+            codigo_compania="0744", tipo_entrega=TipoEntrega.SEMANAL,
+            cronograma="2025-30", estado=estado,
+        )
+        self.addCleanup(self.services.invalidar_estado_ssn, solicitud)
+        return solicitud
+
+    def test_send_ignores_stale_cached_status(self):
+        from django.urls import reverse
+
+        EstadoSSN = self.services.EstadoSSN
+        solicitud = self._solicitud(EstadoSolicitud.CARGADO)
+        self.services.guardar_estado_en_cache(solicitud, EstadoSSN.CARGADO, {}, 200)
+
+        with mock.patch("operaciones.views.consultar_estado_ssn",
+                        return_value=(EstadoSSN.PRESENTADO, {}, 200)), \
+                mock.patch("operaciones.views.enviar_y_guardar_solicitud") as enviar:
+            self.client.get(reverse("operaciones:enviar_operaciones", kwargs={"uuid": solicitud.uuid}))
+
+        enviar.assert_not_called()
+        # La consulta en vivo refresca la caché que usan las vistas
+        with mock.patch.object(self.services, "consultar_estado_ssn") as consultar_vivo:
+            estado, _, _ = self.services.consultar_estado_ssn_cacheado(solicitud)
+            consultar_vivo.assert_not_called()
+        self.assertEqual(estado, EstadoSSN.PRESENTADO)
+
+    def test_rectify_uses_live_status(self):
+        from django.urls import reverse
+
+        EstadoSSN = self.services.EstadoSSN
+        solicitud = self._solicitud(EstadoSolicitud.PRESENTADO)
+        self.services.guardar_estado_en_cache(solicitud, EstadoSSN.A_RECTIFICAR, {}, 200)
+
+        with mock.patch("operaciones.views.consultar_estado_ssn",
+                        return_value=(EstadoSSN.PRESENTADO, {}, 200)) as consultar, \
+                mock.patch("operaciones.views.solicitar_rectificacion_ssn",
+                           return_value=({}, 200, None)) as rectificar:
+            self.client.post(
+                reverse("operaciones:lista_operaciones", kwargs={"uuid": solicitud.uuid}),
+                {"rectify_action": "1"},
+            )
+
+        consultar.assert_called_once()
+        rectificar.assert_called_once()
+        self.assertEqual(rectificar.call_args.kwargs["estado_ssn_conocido"], EstadoSSN.PRESENTADO)
+
+@override_settings(
+    ALERT_EMAIL_RECIPIENTS="a@x.com,b@x.com,c@x.com,d@x.com,e@x.com",
+    MAILSENDER_URL="",
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+class EmailOutboxTests(TestCase):
+    """Tests for the email outbox and dispatch_emails."""
+
+    def setUp(self):
+        self.solicitud = BaseRequestModel.objects.create(
+            codigo_compania="0744", tipo_entrega=TipoEntrega.SEMANAL,
+            cronograma="2025-15", estado=EstadoSolicitud.PRESENTADO,
+        )
+
+    def _queue(self):
+        from operaciones.services.email_service import PresentacionEmailService
+
+        return PresentacionEmailService.queue_confirmacion(self.solicitud, [], ssn_message="OK")
+
+    def test_queue_does_not_send(self):
+        email = self._queue()
+
+        self.assertEqual(email.estado, EstadoEmail.PENDIENTE)
+        self.assertIn("2025-15", email.subject)
+        self.assertEqual(len(email.recipients), 5)
+        self.assertEqual(mail.outbox, [])
+
+    def test_deliver_sends_inline_unless_outbox_enabled(self):
+        from operaciones.services.email_service import PresentacionEmailService
+
+        self.assertTrue(PresentacionEmailService.deliver_confirmacion(self.solicitud, [], "OK"))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(EmailOutbox.objects.exists())
+
+        with override_settings(EMAIL_OUTBOX_ENABLED=True):
+            self.assertTrue(PresentacionEmailService.deliver_confirmacion(self.solicitud, [], "OK"))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(EmailOutbox.objects.get().estado, EstadoEmail.PENDIENTE)
+
+    def test_dispatch_batches_recipients(self):
+        email = self._queue()
+
+        call_command("dispatch_emails", batch_size=2, stdout=mock.MagicMock())
+
+        email.refresh_from_db()
+        self.assertEqual(email.estado, EstadoEmail.ENVIADO)
+        self.assertEqual([m.to for m in mail.outbox], [
+            ["a@x.com", "b@x.com"], ["c@x.com", "d@x.com"], ["e@x.com"],
+        ])
+
+    def test_progress_is_saved_after_each_batch(self):
+        from operaciones.services import email_service
+
+        email = self._queue()
+        original = email_service._send_html_via_smtp
+        llamadas = []
+
+        def muere(recipients, subject, html_message, connection=None):
+            llamadas.append(recipients)
+            if len(llamadas) == 2:
+                raise KeyboardInterrupt  # el proceso muere a mitad del email
+            original(recipients, subject, html_message, connection=connection)
+
+        with mock.patch.object(email_service, "_send_html_via_smtp", side_effect=muere):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command("dispatch_emails", batch_size=2, stdout=mock.MagicMock())
+
+        email.refresh_from_db()
+        self.assertEqual(email.enviados, 2)
+        self.assertEqual(email.estado, EstadoEmail.PENDIENTE)
+
+    def test_failed_batch_is_retried_with_backoff(self):
+        from operaciones.services import email_service
+
+        email = self._queue()
+        original = email_service._send_html_via_smtp
+        llamadas = []
+
+        def flaky(recipients, subject, html_message, connection=None):
+            llamadas.append(recipients)
+            if len(llamadas) == 2:
+                raise ConnectionError("SMTP caído")
+            original(recipients, subject, html_message, connection=connection)
+
+        with mock.patch.object(email_service, "_send_html_via_smtp", side_effect=flaky):
+            call_command("dispatch_emails", batch_size=2, stdout=mock.MagicMock())
+            email.refresh_from_db()
+            self.assertEqual(email.estado, EstadoEmail.PENDIENTE)
+            self.assertEqual((email.enviados, email.intentos), (2, 1))
+            self.assertIn("SMTP caído", email.last_error)
+
+            # Backoff: todavía no corresponde reintentar
+            call_command("dispatch_emails", batch_size=2, stdout=mock.MagicMock())
+            self.assertEqual(len(llamadas), 2)
+
+            EmailOutbox.objects.filter(pk=email.pk).update(next_attempt_at=email.created_at)
+            call_command("dispatch_emails", batch_size=2, stdout=mock.MagicMock())
+
+        email.refresh_from_db()
+        self.assertEqual(email.estado, EstadoEmail.ENVIADO)
+        self.assertEqual(llamadas[2:], [["c@x.com", "d@x.com"], ["e@x.com"]])
+        self.assertEqual(sum(len(m.to) for m in mail.outbox), 5)
+
+
+class SerializerRegistryTests(TestCase):
+    """Tests for the per-tipo serializer registry used by serialize_operations."""
+
+    def setUp(self):
+        client = FakeSsnClient({"2025-15": load_fixture("entrega_semanal.json")})
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            call_command(
+                "sync_ssn_data", period="semanal", year=2025, cronograma="2025-15",
+                checkpoint=str(Path(tempfile.gettempdir()) / "registry.checkpoint.json"),
+                stdout=mock.MagicMock(),
+            )
+        self.solicitud = BaseRequestModel.objects.get(cronograma="2025-15")
+        self.operations = (
+            list(self.solicitud.compras.all()) + list(self.solicitud.ventas.all())
+            + list(self.solicitud.canjes.all()) + list(self.solicitud.plazos_fijos.all())
+        )
+
+    def _clone_canjes(self, n):
+        """Agrega n copias del canje del fixture (con sus dos detalles)."""
+        original = CanjeOperacion.objects.select_related("detalle_a", "detalle_b").get(
+            solicitud=self.solicitud
+        )
+        for _ in range(n):
+            copia = CanjeOperacion.objects.get(pk=original.pk)
+            for detalle in ("detalle_a", "detalle_b"):
+                nuevo = getattr(original, detalle)
+                nuevo.pk = None
+                nuevo.save()
+                setattr(copia, detalle, nuevo)
+            copia.pk = None
+            copia.save()
+
+    def test_get_all_operaciones_query_count_is_constant(self):
+        from operaciones.serializers import serialize_operations
+        from operaciones.services import OperacionesService
+
+        for extra in (0, 5):
+            with self.subTest(canjes_extra=extra):
+                self._clone_canjes(extra)
+                solicitud = BaseRequestModel.objects.get(pk=self.solicitud.pk)
+                # compras, ventas, canjes (JOIN detalles) y plazos fijos
+                with self.assertNumQueries(4):
+                    operations = OperacionesService.get_all_operaciones(solicitud)
+                    payload = serialize_operations(solicitud, operations)
+                self.assertEqual(
+                    sum(op["tipoOperacion"] == "J" for op in payload["operaciones"]), 1 + extra
+                )
+
+                # Memoizada en la instancia: la segunda llamada no consulta
+                with self.assertNumQueries(0):
+                    self.assertIs(OperacionesService.get_all_operaciones(solicitud), operations)
+                OperacionesService.invalidate_operaciones(solicitud)
+                with self.assertNumQueries(4):
+                    OperacionesService.get_all_operaciones(solicitud)
+
+    def test_registry_builds_each_class_once(self):
+        from operaciones.serializers import get_operation_serializer
+
+        self.assertIs(get_operation_serializer("C"), get_operation_serializer("C"))
+        self.assertIsNot(get_operation_serializer("C"), get_operation_serializer("V"))
+        with self.assertRaises(ValueError):
+            get_operation_serializer("X")
+
+    def test_matches_per_row_serializers(self):
+        from operaciones.serializers import create_model_serializer, serialize_operations
+
+        payload = serialize_operations(self.solicitud, self.operations)
+
+        expected = [create_model_serializer(op.tipo_operacion)(op).data for op in self.operations]
+        self.assertEqual(payload["operaciones"], expected)
+        self.assertNotIn("syncHash", payload)
+
+        canje = next(op for op in payload["operaciones"] if op["tipoOperacion"] == "J")
+        self.assertEqual(canje["detalleA"]["codigoEspecie"], "TX26")
+        self.assertEqual(canje["detalleB"]["fechaPaseVt"], "10042025")
+        self.assertNotIn("comprobante", canje["detalleA"])
+
+    def test_no_debug_logging_per_field_when_debug_is_off(self):
+        from operaciones import serializers as ser
+
+        with mock.patch.object(ser.logger, "isEnabledFor", return_value=False), \
+                mock.patch.object(ser.logger, "debug") as debug:
+            ser.serialize_operations(self.solicitud, self.operations)
+        debug.assert_not_called()
+
+    @override_settings(SSN_SERIALIZER_STATS=True)
+    def test_payload_summary_logged_once(self):
+        from operaciones.serializers import serialize_operations
+
+        with self.assertLogs("operaciones", level="INFO") as logs:
+            serialize_operations(self.solicitud, self.operations)
+        resumen = [line for line in logs.output if "Payload " in line]
+        self.assertEqual(len(resumen), 1)
+        self.assertIn(f"{len(self.operations)} filas", resumen[0])
+        self.assertIn("0 errores", resumen[0])
+
+
+class OperacionesIndexTests(TestCase):
+    """Listado de operaciones ordenado y paginado en SQL (UNION ALL + LIMIT/OFFSET)."""
+
+    def _sync(self, period, cronograma, fixture):
+        client = FakeSsnClient({cronograma: load_fixture(fixture)})
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            call_command(
+                "sync_ssn_data", period=period, year=2025, cronograma=cronograma,
+                checkpoint=str(Path(tempfile.gettempdir()) / f"index.{period}.json"),
+                stdout=mock.MagicMock(),
+            )
+        return BaseRequestModel.objects.get(cronograma=cronograma)
+
+    def _keys(self, operaciones):
+        return [(op.tipo_operacion, op.pk) for op in operaciones]
+
+    def test_same_order_as_get_all_operaciones(self):
+        from operaciones.services import OperacionesService
+
+        for args in (("semanal", "2025-15", "entrega_semanal.json"),
+                     ("mensual", "2025-03", "entrega_mensual.json")):
+            with self.subTest(period=args[0]):
+                solicitud = self._sync(*args)
+                index = OperacionesService.get_operaciones_index(solicitud)
+                esperado = self._keys(OperacionesService.get_all_operaciones(solicitud))
+                self.assertEqual(index.count(), len(esperado))
+                self.assertEqual(self._keys(index), esperado)
+
+    def test_page_is_one_limit_offset_query(self):
+        from django.core.paginator import Paginator
+
+        from operaciones.services import OperacionesService
+
+        solicitud = self._sync("semanal", "2025-15", "entrega_semanal.json")
+        compra = solicitud.compras.first()
+        for _ in range(40):
+            compra.pk = None
+            compra.save()
+
+        solicitud = BaseRequestModel.objects.get(pk=solicitud.pk)
+        esperado = self._keys(OperacionesService.get_all_operaciones(solicitud))
+
+        index = OperacionesService.get_operaciones_index(solicitud)
+        paginator = Paginator(index, 10)
+        self.assertEqual(paginator.count, len(esperado))
+        # UNION ALL con LIMIT/OFFSET + un SELECT por pk de cada tipo presente en la página
+        with self.assertNumQueries(2) as ctx:
+            page = paginator.page(2)
+            self.assertEqual(self._keys(page.object_list), esperado[10:20])
+        self.assertIn("UNION ALL", ctx.captured_queries[0]["sql"])
+        self.assertIn("LIMIT 10 OFFSET 10", ctx.captured_queries[0]["sql"])
+        self.assertTrue(index)
+
+
+class OperationCountsTests(TestCase):
+    """Conteos por tipo en una sola consulta y clean_requests como DELETE filtrado."""
+
+    def setUp(self):
+        for period, cronograma, fixture in (("semanal", "2025-15", "entrega_semanal.json"),
+                                             ("mensual", "2025-03", "entrega_mensual.json")):
+            client = FakeSsnClient({cronograma: load_fixture(fixture)})
+            with mock.patch.object(SsnClientConfig, "ssn_client", client):
+                call_command(
+                    "sync_ssn_data", period=period, year=2025, cronograma=cronograma,
+                    checkpoint=str(Path(tempfile.gettempdir()) / f"counts.{period}.json"),
+                    stdout=mock.MagicMock(),
+                )
+        self.semanal = BaseRequestModel.objects.get(cronograma="2025-15")
+        self.mensual = BaseRequestModel.objects.get(cronograma="2025-03")
+        self.vacia = BaseRequestModel.objects.create(
+            codigo_compania="0744", tipo_entrega=TipoEntrega.SEMANAL, cronograma="2025-16",
+        )
+
+    def test_counts_for_many_solicitudes_in_one_query(self):
+        from operaciones.services import OperacionesService
+
+        with self.assertNumQueries(1):
+            counts = OperacionesService.get_counts_by_solicitud(BaseRequestModel.objects.all())
+
+        self.assertEqual(
+            counts[self.semanal.pk],
+            {
+                "compras": 2, "ventas": 1, "canjes": 1, "plazos_fijos": 1,
+                "stocks_inversion_mensuales": 0, "stocks_plazofijo_mensuales": 0,
+                "stocks_chequespd_mensuales": 0,
+            },
+        )
+        self.assertGreater(sum(counts[self.mensual.pk].values()), 0)
+        self.assertFalse(any(counts[self.vacia.pk].values()))
+        with self.assertNumQueries(1):
+            self.assertEqual(OperacionesService.get_total_operaciones(self.semanal), 5)
+
+    def test_clean_requests_deletes_only_empty_unsent(self):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        # Todas viejas y sin enviar: la mensual con stocks no debe borrarse
+        BaseRequestModel.objects.update(
+            send_at=None, created_at=timezone.now() - timedelta(days=30)
+        )
+        reciente = BaseRequestModel.objects.create(
+            codigo_compania="0744", tipo_entrega=TipoEntrega.SEMANAL, cronograma="2025-17",
+        )
+
+        call_command("clean_requests", days=7, stdout=mock.MagicMock())
+
+        self.assertCountEqual(
+            BaseRequestModel.objects.values_list("pk", flat=True),
+            [self.semanal.pk, self.mensual.pk, reciente.pk],
+        )
+
+
+class MonthlyStockGenerationTests(TestCase):
+    """Generación de stocks mensuales a partir del mes anterior y las semanas del mes."""
+
+    def setUp(self):
+        client = FakeSsnClient({"2025-15": load_fixture("entrega_semanal.json")})
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            call_command(
+                "sync_ssn_data", period="semanal", year=2025, cronograma="2025-15",
+                checkpoint=str(Path(tempfile.gettempdir()) / "monthly.checkpoint.json"),
+                stdout=mock.MagicMock(),
+            )
+        self.semana = BaseRequestModel.objects.get(cronograma="2025-15")
+
+    def _mensual(self, cronograma="2025-04"):
+        return BaseRequestModel.objects.create(
+            codigo_compania="0744", tipo_entrega=TipoEntrega.MENSUAL, cronograma=cronograma,
+        )
+
+    def _semana_con(self, cronograma, compras=(), ventas=()):
+        """Semana nueva con copias de la compra/venta del fixture y las cantidades dadas."""
+        semana = BaseRequestModel.objects.create(
+            codigo_compania="0744", tipo_entrega=TipoEntrega.SEMANAL, cronograma=cronograma,
+        )
+        for manager, cantidades in ((self.semana.compras, compras), (self.semana.ventas, ventas)):
+            for codigo, cantidad in cantidades:
+                op = manager.filter(codigo_especie=codigo).first() or manager.first()
+                op.pk = None
+                op.solicitud = semana
+                op.codigo_especie = codigo
+                op.cant_especies = Decimal(cantidad)
+                op.save()
+        return semana
+
+    def _generar(self, target):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from operaciones.services import MonthlyReportGeneratorService
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = MonthlyReportGeneratorService.generate_monthly_stocks(target)
+        self.assertTrue(result.success, result.message)
+        cantidades = {
+            stock.codigo_especie: stock.cantidad_percibido_especies
+            for stock in target.stocks_inversion_mensuales.all()
+        }
+        return result, cantidades, len(ctx.captured_queries)
+
+    def test_roll_forward_with_constant_queries(self):
+        _, cantidades, queries_una_semana = self._generar(self._mensual())
+        # El canje TX26 -> TZX26 de la semana suma la especie recibida
+        self.assertEqual(
+            cantidades,
+            {"AL30": Decimal("150000"), "4521": Decimal("12345.678901"), "TZX26": Decimal("18000")},
+        )
+
+        # Mismo mes con más semanas y operaciones: mismas consultas
+        BaseRequestModel.objects.filter(cronograma="2025-04").delete()
+        self._semana_con("2025-16", compras=[("AL30", "100"), ("GD30", "70000")])
+        self._semana_con("2025-17", compras=[("AL30", "25")], ventas=[("AL30", "50"), ("GD30", "5000")])
+        _, cantidades, queries_tres_semanas = self._generar(self._mensual())
+
+        self.assertEqual(queries_tres_semanas, queries_una_semana)
+        self.assertEqual(cantidades["AL30"], Decimal("150075"))
+        # La venta de GD30 de la semana 15 (50000) y la de la 17 se restan de la compra de la 16
+        self.assertEqual(cantidades["GD30"], Decimal("15000"))
+
+    def test_canjes_move_stock_between_especies(self):
+        canje = self.semana.canjes.select_related("detalle_a", "detalle_b").get()
+        entrega = canje.detalle_a
+        marzo = self._mensual("2025-03")
+        InversionStock.objects.create(
+            solicitud=marzo, tipo_especie=entrega.tipo_especie,
+            codigo_especie=entrega.codigo_especie, codigo_afectacion=entrega.codigo_afectacion,
+            tipo_valuacion=entrega.tipo_valuacion, libre_disponibilidad=True, en_custodia=True,
+            financiera=True, valor_contable=Decimal("0"), con_cotizacion=True,
+            emisor_grupo_economico=False, emisor_art_ret=False,
+            cantidad_devengado_especies=Decimal("50000"),
+            cantidad_percibido_especies=Decimal("50000"),
+        )
+
+        result, cantidades, _ = self._generar(self._mensual())
+
+        self.assertEqual(cantidades["TX26"], Decimal("30000"))
+        self.assertEqual(cantidades["TZX26"], Decimal("18000"))
+        self.assertFalse([w for w in result.warnings if "Canje" in w])
+        recibido = InversionStock.objects.get(
+            solicitud__cronograma="2025-04", codigo_especie="TZX26"
+        )
+        self.assertEqual(recibido.fecha_pase_vt, canje.detalle_b.fecha_pase_vt)
+
+    def test_canje_without_previous_position_warns(self):
+        result, cantidades, _ = self._generar(self._mensual())
+        self.assertNotIn("TX26", cantidades)
+        self.assertTrue(any("Canje sin posición previa: TX26" in w for w in result.warnings))
+
+    def test_generate_range_chains_months_in_memory(self):
+        from io import StringIO
+
+        self._semana_con("2025-20", compras=[("AL30", "100")], ventas=[("AL30", "30")])
+        out = StringIO()
+        call_command("generate_monthly_stocks", desde="2025-03", hasta="2025-05", stdout=out)
+
+        # Marzo no tiene stock anterior ni semanas: no se deja una solicitud vacía
+        self.assertIn("❌ 2025-03", out.getvalue())
+        self.assertFalse(BaseRequestModel.objects.filter(cronograma="2025-03").exists())
+        mayo = BaseRequestModel.objects.get(cronograma="2025-05", tipo_entrega=TipoEntrega.MENSUAL)
+        cantidades = {
+            s.codigo_especie: s.cantidad_percibido_especies
+            for s in mayo.stocks_inversion_mensuales.all()
+        }
+        self.assertEqual(cantidades["AL30"], Decimal("150070"))
+        self.assertEqual(cantidades["4521"], Decimal("12345.678901"))
+        self.assertEqual(cantidades["TZX26"], Decimal("18000"))
+
+        # Sin --force los meses ya generados se saltean
+        out = StringIO()
+        call_command("generate_monthly_stocks", desde="2025-04", hasta="2025-05", stdout=out)
+        self.assertIn("ya tiene", out.getvalue())
+        self.assertEqual(mayo.stocks_inversion_mensuales.count(), len(cantidades))
+
+    def test_preview_reads_ledger_without_saving(self):
+        from operaciones.services import MonthlyReportGeneratorService
+
+        self._semana_con("2025-16", compras=[("AL30", "100")])
+        stocks, _ = MonthlyReportGeneratorService.preview_inversion_stocks("2025-04")
+        self.assertEqual(
+            {s.codigo_especie: s.cantidad_percibido_especies for s in stocks}["AL30"],
+            Decimal("150100"),
+        )
+        self.assertFalse(InversionStock.objects.exists())
+
+
+class PosicionSemanalLedgerTests(TestCase):
+    """El libro de posiciones mantenido por signals coincide con rebuild()."""
+
+    CAMPOS = (
+        "tipo_especie", "codigo_especie", "codigo_afectacion", "tipo_valuacion",
+        "cantidad_compras", "compras", "cantidad_ventas", "ventas",
+        "cantidad_canje_ingreso", "cantidad_canje_egreso", "canjes",
+    )
+
+    def setUp(self):
+        client = FakeSsnClient({"2025-15": load_fixture("entrega_semanal.json")})
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            call_command(
+                "sync_ssn_data", period="semanal", year=2025, cronograma="2025-15",
+                checkpoint=str(Path(tempfile.gettempdir()) / "ledger.checkpoint.json"),
+                stdout=mock.MagicMock(),
+            )
+        self.semana = BaseRequestModel.objects.get(cronograma="2025-15")
+
+    def _libro(self):
+        return sorted(
+            PosicionSemanal.objects.filter(solicitud=self.semana).values_list(*self.CAMPOS)
+        )
+
+    def assertLibroConsistente(self):
+        from operaciones.services import PosicionesService
+
+        incremental = self._libro()
+        PosicionesService.rebuild([self.semana])
+        self.assertEqual(incremental, self._libro())
+        return incremental
+
+    def test_sync_builds_ledger(self):
+        libro = {fila[1]: fila for fila in self.assertLibroConsistente()}
+        self.assertEqual(libro["AL30"][4:6], (Decimal("150000"), 1))
+        self.assertEqual(libro["GD30"][6:8], (Decimal("50000"), 1))
+        # Canje: el detalle A egresa y el B ingresa
+        self.assertEqual(libro["TX26"][-3:], (Decimal("0"), Decimal("20000"), 1))
+        self.assertEqual(libro["TZX26"][-3:], (Decimal("18000"), Decimal("0"), 1))
+
+    def test_signals_follow_edits_and_deletes(self):
+        compra = self.semana.compras.get(codigo_especie="AL30")
+        copia = self.semana.compras.get(pk=compra.pk)
+        copia.pk = None
+        copia.cant_especies = Decimal("25")
+        copia.save()
+        self.assertLibroConsistente()
+
+        # Cambio de cantidad y de clave
+        compra.cant_especies = Decimal("149000")
+        compra.codigo_especie = "AL35"
+        compra.save()
+        self.assertLibroConsistente()
+
+        self.semana.ventas.get().delete()
+        self.assertFalse(
+            PosicionSemanal.objects.filter(solicitud=self.semana, codigo_especie="GD30").exists()
+        )
+        self.assertLibroConsistente()
+
+        canje = self.semana.canjes.select_related("detalle_b").get()
+        canje.detalle_b.cant_especies = Decimal("777")
+        canje.detalle_b.save()
+        self.assertLibroConsistente()
+
+        canje.delete()
+        self.assertLibroConsistente()
+        self.assertEqual(
+            PosicionSemanal.objects.filter(solicitud=self.semana, canjes__gt=0).count(), 0
+        )
+
+    def test_deleting_solicitud_cascades_ledger(self):
+        self.semana.delete()
+        self.assertFalse(PosicionSemanal.objects.exists())
+
+
+class BackfillPosicionesMigrationTests(TransactionTestCase):
+    """La migración 0005 carga el libro desde las operaciones existentes."""
+
+    def setUp(self):
+        from django.db import connection
+        from django.db.migrations.executor import MigrationExecutor
+
+        self.executor = MigrationExecutor(connection)
+        self.addCleanup(self._migrate, None)
+
+        client = FakeSsnClient({"2025-15": load_fixture("entrega_semanal.json")})
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            call_command(
+                "sync_ssn_data", period="semanal", year=2025, cronograma="2025-15",
+                checkpoint=str(Path(tempfile.gettempdir()) / "backfill.checkpoint.json"),
+                stdout=mock.MagicMock(),
+            )
+
+    def _migrate(self, target):
+        self.executor.loader.build_graph()
+        targets = [target] if target else self.executor.loader.graph.leaf_nodes()
+        self.executor.migrate(targets)
+
+    def test_orphan_operations_are_skipped(self):
+        # Compra sin solicitud: la migración no debe fallar por el NOT NULL del libro
+        CompraOperacion.objects.filter(codigo_especie="AL30").update(solicitud=None)
+        PosicionSemanal.objects.all().delete()
+
+        self._migrate(("operaciones", "0004_posicionsemanal"))
+        self._migrate(("operaciones", "0005_backfill_posiciones"))
+
+        especies = set(PosicionSemanal.objects.values_list("codigo_especie", flat=True))
+        self.assertNotIn("AL30", especies)
+        self.assertTrue({"4521", "GD30", "TX26", "TZX26"} <= especies)
+
+class PreviewExcelTests(TestCase):
+    """Excel de la vista previa escrito en streaming (constant_memory)."""
+
+    class _Worksheet:
+        def __init__(self):
+            self.cells = []
+
+        def write(self, row, col, value, fmt=None):
+            self.cells.append((row, col, value, fmt))
+
+        write_number = write_string = write_blank = write
+
+    def _service(self):
+        from operaciones.services import SolicitudPreviewService
+
+        return SolicitudPreviewService(mock.MagicMock(tipo_entrega="Mensual"), [])
+
+    def test_table_writes_each_cell_once_in_row_order(self):
+        from operaciones.helpers import camel_to_title
+
+        formats = {name: name for name in ("header", "num", "border", "total_num", "total_label")}
+        records = [
+            {"tipo": "I", "cantidad": "10.5", "detalle": {"codigo": "AL30"}},
+            {"tipo": "I", "cantidad": "2", "extra": None},
+        ]
+        worksheet = self._Worksheet()
+        widths = self._service()._write_table(worksheet, records, 3, camel_to_title, formats)
+
+        positions = [(row, col) for row, col, _, _ in worksheet.cells]
+        self.assertEqual(positions, sorted(positions))
+        self.assertEqual(len(positions), len(set(positions)))
+        self.assertEqual(
+            [value for row, _, value, _ in worksheet.cells if row == 3],
+            ["Tipo", "Cantidad", "Detalle.Codigo", "Extra"],
+        )
+        totales = {col: (value, fmt) for row, col, value, fmt in worksheet.cells if row == 6}
+        self.assertEqual(totales[0], ("Total", "total_label"))
+        self.assertEqual(totales[1], (Decimal("12.5"), "total_num"))
+        self.assertEqual(widths, [10, 10, 16, 10])
+
+    def test_each_record_is_flattened_once(self):
+        from operaciones.helpers import camel_to_title
+        from operaciones.services import SolicitudPreviewService
+
+        records = [{"tipo": "I", "detalle": {"codigo": f"AL{i}"}} for i in range(20)]
+        original = SolicitudPreviewService._flatten
+        with mock.patch.object(
+            SolicitudPreviewService, "_flatten", side_effect=original
+        ) as flatten:
+            self._service()._write_table(
+                mock.MagicMock(), records, 0, camel_to_title, mock.MagicMock()
+            )
+
+        # Una llamada por registro (más la recursiva de cada anidado)
+        top_level = [call for call in flatten.call_args_list if len(call.args) == 1]
+        self.assertEqual(len(top_level), len(records))
+
+    def test_repeated_values_are_converted_once(self):
+        from operaciones.helpers import camel_to_title
+
+        records = [{"codigo": "=1+1", "cantidad": "7"} for _ in range(50)]
+        worksheet = mock.MagicMock()
+        service = self._service()
+        with mock.patch.object(service, "_cell_spec", wraps=service._cell_spec) as spec:
+            service._write_table(worksheet, records, 0, camel_to_title, mock.MagicMock())
+
+        self.assertEqual(spec.call_count, 2)
+        # Los strings nunca se interpretan como fórmula
+        worksheet.write_string.assert_any_call(1, 0, "=1+1", mock.ANY)
+        worksheet.write.assert_any_call(51, 1, 350, mock.ANY)
+
+    def test_build_excel_for_monthly_fixture(self):
+        import zipfile
+        from io import BytesIO
+
+        from operaciones.services import OperacionesService, SolicitudPreviewService
+
+        client = FakeSsnClient({"2025-03": load_fixture("entrega_mensual.json")})
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            call_command(
+                "sync_ssn_data", period="mensual", year=2025, cronograma="2025-03",
+                checkpoint=str(Path(tempfile.gettempdir()) / "excel.checkpoint.json"),
+                stdout=mock.MagicMock(),
+            )
+        solicitud = BaseRequestModel.objects.get(cronograma="2025-03")
+        preview = SolicitudPreviewService(
+            solicitud, OperacionesService.get_all_operaciones(solicitud)
+        )
+        self.assertTrue(preview.generar_preview())
+
+        with zipfile.ZipFile(BytesIO(preview.build_excel())) as xlsx:
+            workbook = xlsx.read("xl/workbook.xml").decode()
+        for sheet in ("Solicitud", "Stock Inversión", "Stock Plazo Fijo", "Stock Cheque PD"):
+            self.assertIn(f'name="{sheet}"', workbook)
+
+
+class PreviewCacheTests(TestCase):
+    """Artefactos de la vista previa cacheados por contenido en previews/."""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = override_settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.previews = Path(media.name) / "previews"
+
+        client = FakeSsnClient({"2025-15": load_fixture("entrega_semanal.json")})
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            call_command(
+                "sync_ssn_data", period="semanal", year=2025, cronograma="2025-15",
+                checkpoint=str(Path(tempfile.gettempdir()) / "preview.checkpoint.json"),
+                stdout=mock.MagicMock(),
+            )
+        self.semana = BaseRequestModel.objects.get(cronograma="2025-15")
+
+    def _preview(self):
+        from operaciones.services import SolicitudPreviewService
+
+        preview = SolicitudPreviewService(self.semana)
+        self.assertTrue(preview.generar_preview_cacheado())
+        return preview
+
+    def test_unchanged_solicitud_is_served_from_disk(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from operaciones.services import solicitud_preview_service
+
+        primera = self._preview()
+        # El Excel no se arma con la vista previa, solo en la descarga
+        self.assertEqual(
+            [p.name for p in self.previews.iterdir()], [Path(primera.json_filename).name]
+        )
+
+        with mock.patch.object(solicitud_preview_service, "serialize_operations") as serialize, \
+                CaptureQueriesContext(connection) as ctx:
+            segunda = self._preview()
+        serialize.assert_not_called()
+        self.assertEqual(len(ctx.captured_queries), 1)  # solo la huella de contenido
+        self.assertEqual(segunda.formatted_json, primera.formatted_json)
+        self.assertEqual(segunda.mailto_link, primera.mailto_link)
+
+    def test_edits_and_deletes_change_the_key(self):
+        claves = [self._preview().cache_key]
+
+        compra = self.semana.compras.first()
+        compra.cant_especies += 1
+        compra.save()
+        claves.append(self._preview().cache_key)
+
+        canje = self.semana.canjes.select_related("detalle_b").get()
+        canje.detalle_b.cant_especies += 1
+        canje.detalle_b.save()
+        claves.append(self._preview().cache_key)
+
+        self.assertTrue(self._preview().obtener_excel())
+        self.semana.ventas.get().delete()
+        preview = self._preview()
+        claves.append(preview.cache_key)
+
+        self.assertEqual(len(set(claves)), 4)
+        # Solo quedan los artefactos de la versión actual
+        self.assertEqual(
+            [p.name for p in self.previews.iterdir()], [Path(preview.json_filename).name]
+        )
+
+    def test_excel_download_is_built_once_and_revalidated(self):
+        from django.contrib.auth import get_user_model
+        from django.urls import reverse
+
+        from operaciones.services import solicitud_preview_service
+
+        self.client.force_login(get_user_model().objects.create_user("preview", password="x"))
+        url = reverse("operaciones:download_excel", kwargs={"uuid": str(self.semana.uuid)})
+        preview = self._preview()
+
+        # Primera descarga: se arma desde el JSON cacheado, sin serializar operaciones
+        with mock.patch.object(solicitud_preview_service, "serialize_operations") as serialize:
+            response = self.client.get(url)
+        serialize.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"PK"))
+        self.assertEqual(response["ETag"], f'"{preview.cache_key}"')
+        self.assertIn("Last-Modified", response)
+        self.assertTrue((self.previews / Path(preview.excel_filename).name).exists())
+
+        with mock.patch.object(
+            solicitud_preview_service.SolicitudPreviewService, "build_excel"
+        ) as build:
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+            self.assertEqual(cached.status_code, 304)
+            again = self.client.get(url)
+            self.assertEqual(again.status_code, 200)
+        build.assert_not_called()
+
+        # Una edición cambia la versión: el ETag viejo deja de validar
+        compra = self.semana.compras.first()
+        compra.cant_especies += 1
+        compra.save()
+        stale = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(stale.status_code, 200)
+        self.assertNotEqual(stale["ETag"], response["ETag"])
+
+
+class CompiledEncoderGoldenTests(TestCase):
+    """El encoder compilado debe emitir exactamente el mismo JSON que serialize_operations."""
+
+    CASOS = [
+        ("semanal", "2025-15", "entrega_semanal.json"),
+        ("mensual", "2025-03", "entrega_mensual.json"),
+    ]
+
+    def _dump(self, payload):
+        return json.dumps(payload, indent=2, ensure_ascii=False) + "\n"
+
+    def test_matches_golden_payloads(self):
+        from operaciones.encoders import encode_solicitud
+        from operaciones.serializers import serialize_operations
+        from operaciones.services import OperacionesService
+
+        for period, cronograma, fixture in self.CASOS:
+            with self.subTest(period=period):
+                client = FakeSsnClient({cronograma: load_fixture(fixture)})
+                with mock.patch.object(SsnClientConfig, "ssn_client", client):
+                    call_command(
+                        "sync_ssn_data", period=period, year=2025, cronograma=cronograma,
+                        checkpoint=str(Path(tempfile.gettempdir()) / f"golden.{period}.json"),
+                        stdout=mock.MagicMock(),
+                    )
+                solicitud = BaseRequestModel.objects.get(cronograma=cronograma)
+                golden = (TESTDATA_DIR / f"golden_payload_{period}.json").read_text(encoding="utf-8")
+
+                encoded = self._dump(encode_solicitud(solicitud))
+                serialized = self._dump(serialize_operations(
+                    solicitud, OperacionesService.get_all_operaciones(solicitud)
+                ))
+
+                self.assertEqual(encoded, golden)
+                self.assertEqual(serialized, golden)
@@ -1,6 +1,8 @@
 from django.urls import path
 
 from .views import (
+    EnvioEstadoJsonView,
+    EnvioEstadoView,
     ExcelDownloadView,
     MonthlyStockGenerateView,
     OperacionCreateView,
@@ -71,6 +73,17 @@ urlpatterns = [
         OperacionSendView.as_view(),
         name="enviar_operaciones",
     ),
+    # Estado de un envío encolado (SSN_ASYNC_SUBMISSION)
+    path(
+        "<uuid:uuid>/enviar/<int:job_id>/",
+        EnvioEstadoView.as_view(),
+        name="estado_envio",
+    ),
+    path(
+        "<uuid:uuid>/enviar/<int:job_id>/estado/",
+        EnvioEstadoJsonView.as_view(),
+        name="estado_envio_json",
+    ),
     # Detalle de una respuesta generada
     path(
         "<uuid:uuid>/respuesta/",
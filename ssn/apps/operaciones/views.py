@@ -3,10 +3,13 @@ import logging
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
+from django.core.files.storage import default_storage
 from django.db.models import Exists, OuterRef
-from django.http import FileResponse, Http404
-from django.shortcuts import redirect
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from django.views import View
 from django.views.generic import (
     CreateView,
@@ -17,10 +20,12 @@ from django.views.generic import (
     TemplateView,
     UpdateView,
 )
-from ssn_client.models import SolicitudResponse
+from ssn_client.jobs import encolar_envio, marcar_notificado
+from ssn_client.models import EnvioSolicitudJob, SolicitudResponse
 from ssn_client.services import (
     consultar_estado_ssn,
     enviar_y_guardar_solicitud,
+    guardar_estado_en_cache,
     solicitar_rectificacion_ssn,
 )
 from ssn_client.services import EstadoSSN
@@ -296,8 +301,12 @@ class OperacionListView(
     def get(self, request, *args, **kwargs):
         """
         Sincroniza el estado con SSN antes de mostrar la lista.
+
+        Con SSN_STATUS_SYNC_INLINE=False la sincronización queda a cargo del
+        comando reconcile_ssn_status y la vista no espera a la SSN.
         """
-        self._sync_estado_con_ssn()
+        if getattr(settings, "SSN_STATUS_SYNC_INLINE", True):
+            self._sync_estado_con_ssn()
         return super().get(request, *args, **kwargs)
 
     def _sync_estado_con_ssn(self):
@@ -314,10 +323,15 @@ class OperacionListView(
             )
 
     def get_queryset(self):
-        return OperacionesService.get_all_operaciones(self.base_request)
+        # Ordenado y paginado en SQL: una página no materializa toda la solicitud
+        return OperacionesService.get_operaciones_index(self.base_request)
 
     def get_header_buttons_config(self):
-        has_ops = bool(self.get_queryset())
+        # Reutiliza el índice de get() (su count() ya lo calculó el paginador)
+        operaciones = getattr(self, "object_list", None)
+        if operaciones is None:
+            operaciones = self.get_queryset()
+        has_ops = bool(operaciones)
         is_monthly = self.base_request.tipo_entrega == TipoEntrega.MENSUAL
 
         if not self.base_request.is_editable:
@@ -366,10 +380,10 @@ class OperacionListView(
         """
         # --- Acción para INICIAR la rectificación ---
         if "rectify_action" in request.POST:
-            # Consultar estado SSN actual
-            estado_ssn, datos_ssn, status_consulta = consultar_estado_ssn(
-                self.base_request
-            )
+            # Consultar estado SSN actual (en vivo: decide la rectificación)
+            estado_ssn, datos_ssn, status_consulta = consultar_estado_ssn(self.base_request)
+            if estado_ssn is not None and status_consulta < 400:
+                guardar_estado_en_cache(self.base_request, estado_ssn, datos_ssn, status_consulta)
 
             if status_consulta >= 400:
                 error_detail = datos_ssn.get('error') or datos_ssn.get('message', 'Error desconocido')
@@ -667,16 +681,17 @@ class OperacionPreviewView(
         return ["back_operations"] + (["send"] if self.base_request.is_editable else [])
 
     def get(self, request, *args, **kwargs):
-        operations = OperacionesService.get_all_operaciones(self.base_request)
-        preview = SolicitudPreviewService(self.base_request, operations)
-        if not preview.generar_preview():
+        # Si la solicitud no cambió desde la última vista previa, los artefactos
+        # se leen de previews/ sin cargar ni serializar operaciones
+        preview = SolicitudPreviewService(self.base_request)
+        if not preview.generar_preview_cacheado():
             messages.error(request, "No hay operaciones para enviar.")
             return redirect(
                 "operaciones:lista_operaciones", uuid=str(self.base_request.uuid)
             )
         self.formatted_json = preview.formatted_json
         self.mailto_link = preview.mailto_link
-        self.excel_link = preview.generar_excel()
+        self.excel_link = preview.excel_link
         return super().get(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
@@ -695,23 +710,52 @@ class ExcelDownloadView(
     OperationReadonlyViewMixin,
     View,
 ):
-    """Sirve el archivo Excel de preview para descarga (funciona en producción sin DEBUG)."""
+    """
+    Sirve el archivo Excel de preview para descarga (funciona en producción sin DEBUG).
+
+    El Excel se arma en la primera descarga de cada versión de la solicitud.
+    ETag es la clave de contenido de la vista previa, así que los clientes que
+    ya lo tienen reciben 304 sin que se arme ni se lea el archivo.
+    """
     title = ""
 
     def get(self, request, *args, **kwargs):
-        import os
-        filepath = os.path.join(
-            settings.MEDIA_ROOT, "previews",
-            f"solicitud_{self.base_request.uuid}.xlsx",
+        preview = SolicitudPreviewService(self.base_request)
+        etag = quote_etag(preview.cache_key)
+        last_modified = self._modified_time(preview.excel_filename)
+
+        not_modified = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
         )
-        if not os.path.exists(filepath):
-            raise Http404("El archivo Excel no existe. Genere la vista previa nuevamente.")
-        return FileResponse(
-            open(filepath, "rb"),
+        if not_modified is not None:
+            return not_modified
+
+        filename = preview.obtener_excel()
+        if filename is None:
+            raise Http404("La solicitud no tiene operaciones para exportar.")
+
+        response = FileResponse(
+            default_storage.open(filename, "rb"),
             as_attachment=True,
             filename=f"solicitud_{self.base_request.uuid}.xlsx",
             content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
+        response["ETag"] = etag
+        last_modified = last_modified or self._modified_time(filename)
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        # La URL no cambia con la solicitud: siempre revalidar
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    @staticmethod
+    def _modified_time(filename):
+        try:
+            return default_storage.get_modified_time(filename)
+        except (OSError, NotImplementedError):
+            return None
 
 
 class OperacionSendView(
@@ -730,10 +774,11 @@ class OperacionSendView(
                 "operaciones:lista_operaciones", uuid=str(self.base_request.uuid)
             )
 
-        # 1) Consultar estado SSN antes de enviar
-        estado_ssn, datos_ssn, status_consulta = consultar_estado_ssn(
-            self.base_request
-        )
+        # 1) Consultar estado SSN antes de enviar (en vivo: decide el envío;
+        #    la caché es solo para mostrar)
+        estado_ssn, datos_ssn, status_consulta = consultar_estado_ssn(self.base_request)
+        if estado_ssn is not None and status_consulta < 400:
+            guardar_estado_en_cache(self.base_request, estado_ssn, datos_ssn, status_consulta)
 
         if status_consulta >= 400:
             error_detail = datos_ssn.get('error') or datos_ssn.get('message', 'Error desconocido')
@@ -761,24 +806,34 @@ class OperacionSendView(
                 "operaciones:lista_operaciones", uuid=str(self.base_request.uuid)
             )
 
-        # 3) Enviar normalmente si el estado lo permite (VACÍO, CARGADO, A_RECTIFICAR)
+        # 3) Modo asíncrono: encolar el envío (process_ssn_jobs lo ejecuta) y
+        #    seguir su estado desde la UI, sin esperar a la SSN en este request
+        if getattr(settings, "SSN_ASYNC_SUBMISSION", False):
+            job, creado = encolar_envio(self.base_request, allow_empty=allow_empty)
+            if not creado:
+                messages.info(request, "Ya hay un envío en curso para esta solicitud.")
+            return redirect(
+                "operaciones:estado_envio", uuid=str(self.base_request.uuid), job_id=job.pk
+            )
+
+        # 4) Enviar normalmente si el estado lo permite (VACÍO, CARGADO, A_RECTIFICAR)
         response_data, status, _ = enviar_y_guardar_solicitud(
-            self.base_request, operations, allow_empty=allow_empty
+            self.base_request, allow_empty=allow_empty
         )
         if 200 <= status < 300:
             ssn_message = response_data.get("message", "Solicitud enviada correctamente.")
             messages.success(request, ssn_message)
             SessionService.clear_base_request(request)
 
-            # Enviar email de confirmación (fire-and-forget — no bloquea la respuesta)
+            # Email de confirmación (con EMAIL_OUTBOX_ENABLED lo entrega dispatch_emails)
             try:
                 from operaciones.services.email_service import PresentacionEmailService
-                PresentacionEmailService.send_confirmacion(
+                PresentacionEmailService.deliver_confirmacion(
                     self.base_request, operations, ssn_message=ssn_message
                 )
             except Exception:
                 logger.warning(
-                    "No se pudo enviar email de confirmación para %s",
+                    "No se pudo enviar el email de confirmación para %s",
                     self.base_request.uuid,
                     exc_info=True,
                 )
@@ -798,6 +853,83 @@ class OperacionSendView(
         )
 
 
+def _notificar_resultado_envio(request, job):
+    """
+    Traslada el resultado de un envío encolado a los mensajes del usuario,
+    igual que lo hace OperacionSendView en el envío síncrono. Cada resultado
+    se notifica una sola vez (la pantalla de espera consulta varias veces).
+    """
+    if not marcar_notificado(job):
+        return
+    if job.exitoso:
+        messages.success(request, job.mensaje)
+        SessionService.clear_base_request(request)
+    else:
+        messages.error(request, job.mensaje)
+        for err in job.respuesta.get("errors", []):
+            messages.error(request, err)
+
+
+class EnvioEstadoView(
+    OperationReadonlyViewMixin,
+    TemplateView,
+):
+    """Pantalla de espera de un envío encolado; consulta EnvioEstadoJsonView."""
+
+    # --- Atributos configurables ---
+    template_name = "envio_estado.html"
+    title = "Enviando a SSN"
+
+    def get(self, request, *args, **kwargs):
+        self.job = get_object_or_404(
+            EnvioSolicitudJob, pk=kwargs["job_id"], solicitud=self.base_request
+        )
+        if self.job.finalizado:
+            _notificar_resultado_envio(request, self.job)
+            return redirect(
+                "operaciones:solicitud_respuesta", uuid=str(self.base_request.uuid)
+            )
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["job"] = self.job
+        context["status_url"] = reverse(
+            "operaciones:estado_envio_json",
+            kwargs={"uuid": self.base_request.uuid, "job_id": self.job.pk},
+        )
+        return context
+
+
+class EnvioEstadoJsonView(
+    StandaloneViewMixin,
+    View,
+):
+    """
+    Estado de un envío encolado en JSON (lo consulta la pantalla de espera).
+
+    Cuando el job terminó deja el resultado en los mensajes del usuario y
+    devuelve la URL del historial de respuestas.
+    """
+
+    def get(self, request, *args, **kwargs):
+        job = get_object_or_404(
+            EnvioSolicitudJob, pk=kwargs["job_id"], solicitud_id=kwargs["uuid"]
+        )
+        data = {
+            "estado": job.estado,
+            "finalizado": job.finalizado,
+            "exitoso": job.exitoso,
+            "mensaje": job.mensaje,
+        }
+        if job.finalizado:
+            _notificar_resultado_envio(request, job)
+            data["redirect_url"] = reverse(
+                "operaciones:solicitud_respuesta", kwargs={"uuid": job.solicitud_id}
+            )
+        return JsonResponse(data)
+
+
 class SolicitudRespuestasListView(
     StandaloneViewMixin,
     DetailView,
@@ -891,11 +1023,7 @@ class MonthlyStockGenerateView(
         context["has_missing_weeks"] = bool(missing_weeks)
 
         # Stocks existentes
-        existing_count = (
-            self.base_request.stocks_inversion_mensuales.count()
-            + self.base_request.stocks_plazofijo_mensuales.count()
-            + self.base_request.stocks_chequespd_mensuales.count()
-        )
+        existing_count = OperacionesService.get_total_operaciones(self.base_request)
         context["existing_stocks_count"] = existing_count
         context["can_generate"] = existing_count == 0
 
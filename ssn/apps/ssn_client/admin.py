@@ -3,7 +3,7 @@ import json
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import SolicitudResponse
+from .models import EnvioSolicitudJob, SolicitudResponse
 
 
 @admin.register(SolicitudResponse)
@@ -49,3 +49,24 @@ class SolicitudResponseAdmin(admin.ModelAdmin):
             json.dumps(obj.respuesta, indent=2, ensure_ascii=False),
         )
     respuesta_pretty.short_description = "Respuesta SSN"
+
+
+@admin.register(EnvioSolicitudJob)
+class EnvioSolicitudJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "solicitud", "estado", "status_http", "intentos", "worker", "created_at", "finished_at")
+    list_filter = ("estado",)
+    search_fields = ("solicitud__uuid",)
+    ordering = ("-created_at",)
+    readonly_fields = (
+        "solicitud",
+        "estado",
+        "allow_empty",
+        "status_http",
+        "respuesta",
+        "intentos",
+        "worker",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+    fields = readonly_fields
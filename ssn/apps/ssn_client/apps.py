@@ -38,6 +38,13 @@ class SsnClientConfig(AppConfig):
         try:
             # Importamos el servicio para evitar importaciones circulares
             from .clients import SsnService
+            from .token_store import build_token_store
+
+            token_store = build_token_store(
+                getattr(settings, "SSN_API_TOKEN_STORE", "cache"),
+                cache_alias=getattr(settings, "SSN_API_TOKEN_CACHE", "ssn_token"),
+                namespace=f"{settings.SSN_API_BASE_URL}|{settings.SSN_API_CIA}|{settings.SSN_API_USERNAME}",
+            )
 
             SsnClientConfig.ssn_client = SsnService(
                 username=settings.SSN_API_USERNAME,
@@ -48,7 +55,12 @@ class SsnClientConfig(AppConfig):
                 retry_delay=settings.SSN_API_RETRY_DELAY,
                 verify_ssl=getattr(settings, "SSN_API_VERIFY_SSL", True),
                 request_timeout=getattr(settings, "SSN_API_REQUEST_TIMEOUT", (10, 20)),
+                token_store=token_store,
             )
+            # Sin login acá: el token se obtiene en el primer uso real. Opcionalmente
+            # se precalienta en un thread daemon para no demorar el arranque.
+            if getattr(settings, "SSN_API_WARMUP", False):
+                SsnClientConfig.ssn_client.warm_up(background=True)
             logger.info("Cliente SSN inicializado exitosamente.")
         except Exception as e:
             logger.warning(f"No se pudo inicializar el cliente SSN: {e}")
@@ -1,4 +1,5 @@
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
 from http import HTTPStatus
@@ -7,11 +8,17 @@ from typing import Any, Callable, Dict, Optional, Tuple
 import certifi
 import jwt
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, ReadTimeout, RequestException, Timeout
 
+from .token_store import LocalTokenStore, TokenStore
+
 # Configuración del logger para registrar eventos e información relevante.
 logger = logging.getLogger("ssn_client")
 
+# Marca "usar el token actual" en _refresh_token (None significa "no había token")
+_TOKEN_ACTUAL = object()
+
 
 # Definición de la metaclase Singleton
 class Singleton(type):
@@ -42,6 +49,7 @@ class SsnService(metaclass=Singleton):
         token_refresh_margin: int = 300,  # 5 minutos en segundos
         verify_ssl: bool = True,  # Verificación SSL (False para entornos de test con cert self-signed)
         request_timeout: Tuple[int, int] = (10, 20),  # (connect_timeout, read_timeout) en segundos
+        token_store: Optional[TokenStore] = None,  # Store compartido del JWT (default: en memoria)
     ) -> None:
         # Evita re-inicializar la instancia si ya fue creada.
         if hasattr(self, "_initialized") and self._initialized:
@@ -57,10 +65,53 @@ class SsnService(metaclass=Singleton):
         self.verify_ssl = certifi.where() if verify_ssl else False
         self.request_timeout = request_timeout
         self.session = requests.Session()
-        # Se intenta obtener el token de autenticación al instanciar el servicio.
-        self.token = self._get_token()
+        self.token_store = token_store or LocalTokenStore()
+        # El login es lazy: no se hace al instanciar (AppConfig.ready() no debe esperar
+        # a la SSN). Se obtiene en la primera solicitud real vía _check_token(),
+        # reutilizando el del store compartido si otro worker ya hizo login,
+        # o por adelantado con warm_up().
+        self.token: Optional[str] = None
+        self._warm_up_thread: Optional[threading.Thread] = None
         self._initialized = True  # Marca que ya fue inicializado
 
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Obtiene el token por adelantado para que la primera solicitud no pague el login.
+
+        Args:
+            background: Si es True, el login corre en un thread daemon y no bloquea al llamador
+
+        Returns:
+            Optional[threading.Thread]: Thread lanzado, o None si se ejecutó en línea
+        """
+        if not background:
+            self._check_token()
+            return None
+
+        if self._warm_up_thread and self._warm_up_thread.is_alive():
+            return self._warm_up_thread
+
+        self._warm_up_thread = threading.Thread(
+            target=self._check_token, name="ssn-token-warmup", daemon=True
+        )
+        self._warm_up_thread.start()
+        logger.debug("Warm-up del token SSN lanzado en segundo plano.")
+        return self._warm_up_thread
+
+    def set_pool_size(self, size: int) -> None:
+        """
+        Ajusta el pool de conexiones de la sesión para uso concurrente.
+
+        requests.Session mantiene 10 conexiones por host; con más threads
+        compartiendo la sesión, las conexiones extra se descartan y se reabren.
+
+        Args:
+            size: Cantidad máxima de conexiones simultáneas por host
+        """
+        adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
     def _get_token(self) -> Optional[str]:
         """
         Realiza una solicitud POST a la ruta de login para obtener el token de autenticación.
@@ -94,19 +145,23 @@ class SsnService(metaclass=Singleton):
             logger.error(f"Excepción inesperada al obtener token: {e}")
         return None
 
-    def _get_expiration_date(self) -> Optional[datetime]:
+    def _get_expiration_date(self, token: Optional[str] = None) -> Optional[datetime]:
         """
         Decodifica el JWT y extrae la fecha de expiración a partir del campo 'exp'.
 
+        Args:
+            token: Token a decodificar (default: el token actual)
+
         Returns:
             Optional[datetime]: Fecha de expiración del token o None si no se pudo decodificar
         """
-        if not self.token:
+        token = token or self.token
+        if not token:
             return None
 
         try:
             # Decodificar sin verificar la firma solo para extraer el payload
-            payload = jwt.decode(self.token, options={"verify_signature": False})
+            payload = jwt.decode(token, options={"verify_signature": False})
             exp_timestamp = payload.get("exp")
             if exp_timestamp:
                 return datetime.fromtimestamp(exp_timestamp)
@@ -117,17 +172,21 @@ class SsnService(metaclass=Singleton):
             logger.error(f"Error al decodificar el token: {e}")
             return None
 
-    def _should_refresh_token(self) -> bool:
+    def _should_refresh_token(self, token: Optional[str] = None) -> bool:
         """
         Determina si el token debe ser refrescado basado en su fecha de expiración.
 
+        Args:
+            token: Token a evaluar (default: el token actual)
+
         Returns:
             bool: True si el token debe ser refrescado, False en caso contrario
         """
-        if not self.token:
+        token = token or self.token
+        if not token:
             return True
 
-        expiration_date = self._get_expiration_date()
+        expiration_date = self._get_expiration_date(token)
         if not expiration_date:
             return True
 
@@ -137,19 +196,74 @@ class SsnService(metaclass=Singleton):
         )
         return refresh_threshold >= expiration_date
 
-    def _refresh_token(self) -> bool:
+    def _token_ttl(self, token: str) -> Optional[int]:
+        """
+        Segundos de vida restantes del token, para usar como TTL en el store compartido.
+
+        Returns:
+            Optional[int]: TTL en segundos o None si el token no informa 'exp'
+        """
+        expiration_date = self._get_expiration_date(token)
+        if not expiration_date:
+            return None
+        return max(int((expiration_date - datetime.now()).total_seconds()), 1)
+
+    def _adopt_shared_token(self, stale_token: Optional[str] = None) -> bool:
+        """
+        Adopta el token del store compartido si es distinto al vencido y sigue vigente.
+
+        Args:
+            stale_token: Token vencido o rechazado que se quiere reemplazar
+
+        Returns:
+            bool: True si se adoptó un token vigente, False en caso contrario
+        """
+        shared_token = self.token_store.get()
+        if not shared_token or shared_token == stale_token:
+            return False
+        if self._should_refresh_token(shared_token):
+            return False
+        self.token = shared_token
+        logger.debug("Token reutilizado desde el store compartido.")
+        return True
+
+    def _refresh_token(self, stale_token: Any = _TOKEN_ACTUAL) -> bool:
         """
         Refresca el token de autenticación.
 
+        El login se hace bajo el lock del store. El token vencido se registra
+        antes de esperar el lock: si mientras tanto otro thread de este proceso
+        u otro worker ya obtuvo uno nuevo y vigente, se reutiliza en lugar de
+        volver a loguear.
+
+        Args:
+            stale_token: Token vencido o rechazado (default: el token actual)
+
         Returns:
             bool: True si se refrescó exitosamente, False en caso contrario
         """
+        if stale_token is _TOKEN_ACTUAL:
+            stale_token = self.token
         logger.info("Refrescando token...")
-        new_token = self._get_token()
-        if new_token:
-            self.token = new_token
-            logger.info("Token refrescado exitosamente.")
-            return True
+        with self.token_store.lock():
+            current_token = self.token
+            if (
+                current_token
+                and current_token != stale_token
+                and not self._should_refresh_token(current_token)
+            ):
+                logger.info("Token refrescado por otro thread; se reutiliza.")
+                return True
+            if self._adopt_shared_token(stale_token):
+                logger.info("Token refrescado por otro proceso; se reutiliza.")
+                return True
+
+            new_token = self._get_token()
+            if new_token:
+                self.token = new_token
+                self.token_store.set(new_token, self._token_ttl(new_token))
+                logger.info("Token refrescado exitosamente.")
+                return True
         logger.error("Fallo al refrescar el token.")
         return False
 
@@ -160,13 +274,18 @@ class SsnService(metaclass=Singleton):
         Returns:
             bool: True si el token es válido, False en caso contrario
         """
-        if not self.token:
+        token = self.token
+        if not token:
+            if self._adopt_shared_token():
+                return True
             logger.debug("No hay token. Obteniendo uno nuevo...")
-            return self._refresh_token()
+            return self._refresh_token(stale_token=token)
 
-        if self._should_refresh_token():
+        if self._should_refresh_token(token):
+            if self._adopt_shared_token(stale_token=token):
+                return True
             logger.debug("El token está por expirar. Refrescando...")
-            return self._refresh_token()
+            return self._refresh_token(stale_token=token)
 
         logger.debug("Token válido.")
         return True
@@ -339,7 +458,8 @@ class SsnService(metaclass=Singleton):
             bool: True si se pudo refrescar el token, False en caso contrario
         """
         logger.warning("Recibido 401. Refrescando token e intentando nuevamente...")
-        if self._refresh_token():
+        rejected_token = kwargs.get("headers", {}).get("Token") or None
+        if self._refresh_token(stale_token=rejected_token):
             kwargs["headers"] = self._get_headers()
 
             # Loggear nuevamente con el token actualizado
@@ -0,0 +1,268 @@
+"""
+Cola de envíos a la SSN respaldada por la base de datos.
+
+Un envío completo (consulta de estado, POST, confirmación, consulta final y
+email) puede superar el timeout de gunicorn cuando la SSN responde lento y
+_make_request reintenta. Con SSN_ASYNC_SUBMISSION=True la vista solo encola un
+EnvioSolicitudJob y el comando process_ssn_jobs lo ejecuta en segundo plano.
+
+Los jobs se toman con un UPDATE condicional (estado=PENDIENTE), así que varios
+workers pueden leer la misma tabla sin ejecutar dos veces el mismo envío.
+Mientras un job corre, el worker actualiza su updated_at cada
+SSN_JOB_HEARTBEAT segundos (latido): solo se reclaman los jobs cuyo latido
+se detuvo, no los envíos lentos.
+"""
+
+import logging
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ssn_client.models import EnvioSolicitudJob, EstadoEnvioJob
+
+logger = logging.getLogger("ssn_client")
+
+ESTADOS_ACTIVOS = [EstadoEnvioJob.PENDIENTE, EstadoEnvioJob.EN_CURSO]
+
+
+def worker_id() -> str:
+    """Identificador del proceso worker (host:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def encolar_envio(base_request, allow_empty: bool = False) -> Tuple[EnvioSolicitudJob, bool]:
+    """
+    Encola el envío de una solicitud.
+
+    Si la solicitud ya tiene un envío pendiente o en curso se devuelve ese job
+    (un doble click no genera dos envíos).
+
+    Returns:
+        (job, creado)
+    """
+    activo = EnvioSolicitudJob.objects.filter(
+        solicitud=base_request, estado__in=ESTADOS_ACTIVOS
+    ).first()
+    if activo:
+        return activo, False
+
+    try:
+        with transaction.atomic():
+            job = EnvioSolicitudJob.objects.create(
+                solicitud=base_request, allow_empty=allow_empty
+            )
+    except IntegrityError:
+        # Otro request encoló el mismo envío en paralelo
+        job = EnvioSolicitudJob.objects.get(
+            solicitud=base_request, estado__in=ESTADOS_ACTIVOS
+        )
+        return job, False
+
+    logger.info(f"Envío encolado #{job.pk} para solicitud {base_request.uuid}")
+    return job, True
+
+
+def tomar_job(worker: str, candidatos: int = 10) -> Optional[EnvioSolicitudJob]:
+    """
+    Toma el job pendiente más antiguo y lo marca EN_CURSO.
+
+    Returns:
+        El job tomado, o None si la cola está vacía.
+    """
+    pendientes = EnvioSolicitudJob.objects.filter(
+        estado=EstadoEnvioJob.PENDIENTE
+    ).order_by("created_at").values_list("pk", flat=True)[:candidatos]
+
+    for pk in pendientes:
+        tomado = EnvioSolicitudJob.objects.filter(
+            pk=pk, estado=EstadoEnvioJob.PENDIENTE
+        ).update(
+            estado=EstadoEnvioJob.EN_CURSO,
+            worker=worker,
+            started_at=timezone.now(),
+            intentos=F("intentos") + 1,
+            updated_at=timezone.now(),
+        )
+        if tomado:
+            return EnvioSolicitudJob.objects.select_related("solicitud").get(pk=pk)
+    return None
+
+
+def heartbeat_interval() -> float:
+    """Segundos entre latidos de un job en curso (SSN_JOB_HEARTBEAT)."""
+    return float(getattr(settings, "SSN_JOB_HEARTBEAT", 30))
+
+
+def registrar_latido(job: EnvioSolicitudJob) -> bool:
+    """
+    Renueva el updated_at de un job en curso.
+
+    Returns:
+        False si el job ya no está EN_CURSO en este worker (fue reclamado).
+    """
+    return bool(
+        EnvioSolicitudJob.objects.filter(
+            pk=job.pk, estado=EstadoEnvioJob.EN_CURSO, worker=job.worker
+        ).update(updated_at=timezone.now())
+    )
+
+
+@contextmanager
+def latido(job: EnvioSolicitudJob, intervalo: Optional[float] = None) -> Iterator[None]:
+    """Mantiene vivo el job (registrar_latido en un thread) mientras dura el bloque."""
+    intervalo = heartbeat_interval() if intervalo is None else intervalo
+    detener = threading.Event()
+
+    def run():
+        try:
+            while not detener.wait(intervalo):
+                if not registrar_latido(job):
+                    logger.warning(f"Envío #{job.pk}: el job ya no pertenece a este worker")
+                    return
+        except Exception as e:
+            logger.warning(f"Envío #{job.pk}: no se pudo registrar el latido: {e}")
+        finally:
+            connection.close()  # Conexión propia del thread
+
+    thread = threading.Thread(target=run, name=f"latido-envio-{job.pk}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        detener.set()
+        thread.join(timeout=5)
+
+
+def liberar_jobs_colgados(max_age: int, max_intentos: int = 3) -> int:
+    """
+    Devuelve a la cola los jobs EN_CURSO de un worker que murió a mitad del envío:
+    los que no registraron un latido en max_age segundos.
+
+    El worker pudo haber completado el envío antes de morir: al volver a
+    tomarlo, ejecutar_envio verifica primero si la entrega ya quedó presentada
+    (ver _envio_ya_presentado) en lugar de reenviarla. Pasados max_intentos el
+    job se marca ERROR.
+
+    Returns:
+        Cantidad de jobs liberados o descartados.
+    """
+    limite = timezone.now() - timedelta(seconds=max_age)
+    colgados = EnvioSolicitudJob.objects.filter(
+        estado=EstadoEnvioJob.EN_CURSO, updated_at__lt=limite
+    )
+    descartados = colgados.filter(intentos__gte=max_intentos).update(
+        estado=EstadoEnvioJob.ERROR,
+        respuesta={"error": "El envío se interrumpió demasiadas veces."},
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    liberados = colgados.update(
+        estado=EstadoEnvioJob.PENDIENTE, worker="", updated_at=timezone.now()
+    )
+    if descartados or liberados:
+        logger.warning(
+            f"Jobs de envío colgados: {liberados} devueltos a la cola, {descartados} descartados"
+        )
+    return descartados + liberados
+
+
+def _envio_ya_presentado(job: EnvioSolicitudJob) -> bool:
+    """
+    Indica si un job interrumpido (intentos > 1) ya había completado el envío.
+
+    Primero mira el estado local (el worker llegó a guardar el resultado);
+    si no, consulta la SSN: al encolar, la vista verificó que la entrega no
+    estaba PRESENTADA, así que si ahora lo está la presentó este job.
+    """
+    from operaciones.models import EstadoSolicitud
+    from ssn_client.services import EstadoSSN, consultar_estado_ssn
+
+    base_request = job.solicitud
+    if (
+        base_request.estado == EstadoSolicitud.PRESENTADO
+        and base_request.send_at
+        and base_request.send_at >= job.created_at
+    ):
+        return True
+
+    estado_ssn, _, status = consultar_estado_ssn(base_request)
+    if status >= 400 or estado_ssn != EstadoSSN.PRESENTADO:
+        return False
+
+    base_request.estado = EstadoSolicitud.PRESENTADO
+    base_request.send_at = base_request.send_at or timezone.now()
+    base_request.save(update_fields=["estado", "send_at", "updated_at"])
+    return True
+
+
+def marcar_notificado(job: EnvioSolicitudJob) -> bool:
+    """
+    Marca el resultado del job como mostrado al usuario.
+
+    Returns:
+        True solo la primera vez (UPDATE condicional), así cada resultado se
+        notifica una única vez aunque la pantalla de espera consulte varias.
+    """
+    return bool(
+        EnvioSolicitudJob.objects.filter(pk=job.pk, notificado=False).update(notificado=True)
+    )
+
+
+def ejecutar_envio(job: EnvioSolicitudJob) -> EnvioSolicitudJob:
+    """
+    Ejecuta un job tomado con tomar_job(): envía la solicitud a la SSN y, si
+    el envío fue exitoso, encola el email de confirmación.
+
+    Si el job vuelve a la cola tras la muerte de un worker y la entrega ya
+    quedó presentada, se da por completado sin reenviar (reenviar devolvería
+    409 y registraría ERROR para un envío exitoso).
+    """
+    from operaciones.services import OperacionesService
+    from ssn_client.services import enviar_y_guardar_solicitud
+
+    base_request = job.solicitud
+    try:
+        with latido(job):
+            if job.intentos > 1 and _envio_ya_presentado(job):
+                logger.info(f"Envío #{job.pk}: la entrega ya estaba presentada, no se reenvía")
+                response_data, status = (
+                    {"message": "La entrega ya quedó presentada en la SSN."}, 200
+                )
+            else:
+                response_data, status, _ = enviar_y_guardar_solicitud(
+                    base_request, allow_empty=job.allow_empty
+                )
+    except Exception as e:
+        logger.exception(f"Error inesperado ejecutando el envío #{job.pk}: {e}")
+        response_data, status = {"error": "Error inesperado", "detalle": str(e)}, 500
+
+    job.status_http = status
+    job.respuesta = response_data if isinstance(response_data, dict) else {"data": response_data}
+    job.estado = EstadoEnvioJob.COMPLETADO if 200 <= status < 300 else EstadoEnvioJob.ERROR
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status_http", "respuesta", "estado", "finished_at", "updated_at"])
+    logger.info(f"Envío #{job.pk} finalizado: {job.estado} ({status})")
+
+    if job.exitoso:
+        try:
+            from operaciones.services.email_service import PresentacionEmailService
+
+            operations = OperacionesService.get_all_operaciones(base_request)
+            PresentacionEmailService.deliver_confirmacion(
+                base_request, operations, ssn_message=job.mensaje
+            )
+        except Exception:
+            logger.warning(
+                "No se pudo enviar el email de confirmación para %s",
+                base_request.uuid,
+                exc_info=True,
+            )
+    return job
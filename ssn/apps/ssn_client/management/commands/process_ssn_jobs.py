@@ -0,0 +1,98 @@
+"""
+Worker que ejecuta los envíos a la SSN encolados por la vista de envío
+(SSN_ASYNC_SUBMISSION=True).
+
+Uso:
+    python manage.py process_ssn_jobs                # procesa la cola y termina
+    python manage.py process_ssn_jobs --loop 2       # worker: consulta la cola cada 2s
+    python manage.py process_ssn_jobs --max-jobs 10
+
+Ejemplo como servicio en docker-compose:
+    command: python ssn/manage.py process_ssn_jobs --loop 2
+"""
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from ssn_client.jobs import (
+    ejecutar_envio,
+    heartbeat_interval,
+    liberar_jobs_colgados,
+    tomar_job,
+    worker_id,
+)
+
+logger = logging.getLogger("ssn_client")
+
+
+class Command(BaseCommand):
+    help = "Ejecuta los envíos a la SSN encolados (cola en base de datos)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            type=float,
+            default=0,
+            metavar="SEGUNDOS",
+            help="Espera entre consultas a la cola vacía (modo worker). 0 = vaciar la cola y salir",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=0,
+            help="Termina después de procesar N jobs (0 = sin límite)",
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=600,
+            metavar="SEGUNDOS",
+            help=(
+                "Devuelve a la cola los jobs EN_CURSO sin latido hace más que esto "
+                "(default: 600; mínimo 3 × SSN_JOB_HEARTBEAT)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        minimo = 3 * heartbeat_interval()
+        if options["stale_after"] < minimo:
+            raise CommandError(
+                f"--stale-after debe ser al menos {minimo:.0f}s (3 latidos de SSN_JOB_HEARTBEAT)"
+            )
+        worker = worker_id()
+        procesados = 0
+        if options["loop"] > 0:
+            self.stdout.write(f"🔁 Worker {worker} esperando envíos (Ctrl+C para salir)")
+
+        try:
+            while True:
+                close_old_connections()
+                liberar_jobs_colgados(options["stale_after"])
+                job = tomar_job(worker)
+
+                if job is None:
+                    if options["loop"] <= 0:
+                        break
+                    time.sleep(options["loop"])
+                    continue
+
+                start = time.perf_counter()
+                self.stdout.write(f"Enviando solicitud {job.solicitud_id} (job #{job.pk})...")
+                job = ejecutar_envio(job)
+                elapsed = time.perf_counter() - start
+                style = self.style.SUCCESS if job.exitoso else self.style.ERROR
+                icon = "✅" if job.exitoso else "❌"
+                self.stdout.write(
+                    style(f"  {icon} {job.estado} ({job.status_http}) en {elapsed:.2f}s: {job.mensaje}")
+                )
+
+                procesados += 1
+                if options["max_jobs"] and procesados >= options["max_jobs"]:
+                    break
+        except KeyboardInterrupt:
+            self.stdout.write("Worker detenido")
+
+        self.stdout.write(self.style.SUCCESS(f"Jobs procesados: {procesados}"))
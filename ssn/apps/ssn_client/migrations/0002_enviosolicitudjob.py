@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-17 00:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operaciones', '0002_baserequestmodel_sync_hash'),
+        ('ssn_client', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnvioSolicitudJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('EN_CURSO', 'En curso'), ('COMPLETADO', 'Completado'), ('ERROR', 'Error')], default='PENDIENTE', help_text='Estado del job en la cola', max_length=16)),
+                ('allow_empty', models.BooleanField(default=False, help_text='Permite enviar una entrega semanal sin operaciones')),
+                ('status_http', models.PositiveIntegerField(blank=True, help_text='Código HTTP del resultado del envío', null=True)),
+                ('respuesta', models.JSONField(blank=True, default=dict, help_text='Respuesta final del envío')),
+                ('intentos', models.PositiveSmallIntegerField(default=0, help_text='Cantidad de veces que un worker tomó el job')),
+                ('worker', models.CharField(blank=True, default='', help_text='Worker que tomó el job', max_length=128)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('solicitud', models.ForeignKey(help_text='Solicitud a enviar', on_delete=django.db.models.deletion.CASCADE, related_name='envios', to='operaciones.baserequestmodel')),
+            ],
+            options={
+                'verbose_name': 'Envío encolado',
+                'verbose_name_plural': 'Envíos encolados',
+                'db_table': 'db_envios_solicitud',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['estado', 'created_at'], name='db_envios_s_estado_865a68_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('estado__in', ['PENDIENTE', 'EN_CURSO'])), fields=('solicitud',), name='unique_envio_activo_por_solicitud')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ssn_client', '0002_enviosolicitudjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enviosolicitudjob',
+            name='notificado',
+            field=models.BooleanField(default=False, help_text='El resultado ya se mostró al usuario'),
+        ),
+    ]
@@ -37,3 +37,90 @@ class SolicitudResponse(models.Model):
                 name="unique_solicitud_endpoint",
             )
         ]
+
+
+class EstadoEnvioJob(models.TextChoices):
+    PENDIENTE = "PENDIENTE", "Pendiente"
+    EN_CURSO = "EN_CURSO", "En curso"
+    COMPLETADO = "COMPLETADO", "Completado"
+    ERROR = "ERROR", "Error"
+
+
+class EnvioSolicitudJob(models.Model):
+    """
+    Envío a la SSN encolado para ejecutarse fuera del request HTTP.
+
+    La vista de envío crea el job y el comando process_ssn_jobs lo ejecuta
+    (enviar_y_guardar_solicitud). La tabla hace de cola: no requiere broker.
+    """
+
+    solicitud = models.ForeignKey(
+        BaseRequestModel,
+        on_delete=models.CASCADE,
+        related_name="envios",
+        help_text="Solicitud a enviar",
+    )
+    estado = models.CharField(
+        max_length=16,
+        choices=EstadoEnvioJob.choices,
+        default=EstadoEnvioJob.PENDIENTE,
+        help_text="Estado del job en la cola",
+    )
+    allow_empty = models.BooleanField(
+        default=False, help_text="Permite enviar una entrega semanal sin operaciones"
+    )
+    status_http = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Código HTTP del resultado del envío"
+    )
+    respuesta = models.JSONField(
+        default=dict, blank=True, help_text="Respuesta final del envío"
+    )
+    intentos = models.PositiveSmallIntegerField(
+        default=0, help_text="Cantidad de veces que un worker tomó el job"
+    )
+    worker = models.CharField(
+        max_length=128, blank=True, default="", help_text="Worker que tomó el job"
+    )
+    notificado = models.BooleanField(
+        default=False, help_text="El resultado ya se mostró al usuario"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, null=True, blank=True)
+
+    @property
+    def finalizado(self):
+        return self.estado in (EstadoEnvioJob.COMPLETADO, EstadoEnvioJob.ERROR)
+
+    @property
+    def exitoso(self):
+        return self.estado == EstadoEnvioJob.COMPLETADO
+
+    @property
+    def mensaje(self):
+        """Mensaje para el usuario, con el mismo criterio que el envío síncrono."""
+        if self.exitoso:
+            return self.respuesta.get("message", "Solicitud enviada correctamente.")
+        if self.estado == EstadoEnvioJob.ERROR:
+            return self.respuesta.get("message") or self.respuesta.get(
+                "error", "Error al enviar la solicitud."
+            )
+        return "Envío en curso..."
+
+    def __str__(self):
+        return f"Envío #{self.pk} | {self.solicitud_id} | {self.estado}"
+
+    class Meta:
+        verbose_name = "Envío encolado"
+        verbose_name_plural = "Envíos encolados"
+        db_table = "db_envios_solicitud"
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["estado", "created_at"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["solicitud"],
+                condition=models.Q(estado__in=["PENDIENTE", "EN_CURSO"]),
+                name="unique_envio_activo_por_solicitud",
+            )
+        ]
@@ -3,10 +3,13 @@ from http import HTTPStatus
 from typing import Tuple, Dict, Any, Optional
 
 from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
 from django.utils import timezone
 from operaciones.helpers.text_utils import normalizar_texto
 from operaciones.models import EstadoSolicitud
 from ssn_client.models import SolicitudResponse
+from ssn_client.token_store import cache_lock
 
 logger = logging.getLogger("ssn_client")
 
@@ -142,6 +145,76 @@ def consultar_estado_ssn(
         return None, {"error": str(e)}, HTTPStatus.INTERNAL_SERVER_ERROR
 
 
+def _estado_cache():
+    return caches[getattr(settings, "SSN_STATUS_CACHE", "ssn_status")]
+
+
+def _estado_cache_key(base_request) -> str:
+    codigo_compania = base_request.codigo_compania or "0744"
+    return f"ssn_estado:{codigo_compania}:{base_request.tipo_entrega}:{base_request.cronograma}"
+
+
+def consultar_estado_ssn_cacheado(
+    base_request,
+) -> Tuple[Optional[str], Optional[Dict[str, Any]], int]:
+    """
+    Igual que consultar_estado_ssn, pero con caché por (tipo_entrega, cronograma).
+
+    El resultado se guarda SSN_STATUS_CACHE_TTL segundos en una caché compartida
+    entre procesos. Mientras un proceso consulta a la SSN, los demás que piden la
+    misma clave esperan su resultado (single-flight) en lugar de repetir la
+    llamada. Los errores no se cachean.
+
+    Usar para lecturas (vistas, validaciones). Los pasos que deciden un envío
+    usan consultar_estado_ssn directamente.
+    """
+    try:
+        cache = _estado_cache()
+        key = _estado_cache_key(base_request)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug(f"Estado SSN desde caché para {key}: {cached[0]}")
+            return tuple(cached)
+
+        lock_wait = sum(getattr(settings, "SSN_API_REQUEST_TIMEOUT", (10, 20)))
+        with cache_lock(cache, f"{key}:lock", timeout=lock_wait + 5, wait=lock_wait):
+            # Otro proceso pudo haber completado la consulta mientras esperábamos
+            cached = cache.get(key)
+            if cached is not None:
+                return tuple(cached)
+
+            estado, response, status = consultar_estado_ssn(base_request)
+            if estado is not None and status < 400:
+                guardar_estado_en_cache(base_request, estado, response, status)
+            return estado, response, status
+    except Exception as e:
+        logger.warning(f"Caché de estado SSN no disponible, se consulta directo: {e}")
+        return consultar_estado_ssn(base_request)
+
+
+def guardar_estado_en_cache(base_request, estado, response, status) -> None:
+    """
+    Guarda en caché un estado recién consultado a la SSN, para que las lecturas
+    siguientes (consultar_estado_ssn_cacheado) no repitan la consulta.
+    """
+    ttl = getattr(settings, "SSN_STATUS_CACHE_TTL", 30)
+    try:
+        _estado_cache().set(_estado_cache_key(base_request), [estado, response, status], ttl)
+    except Exception as e:
+        logger.warning(f"No se pudo guardar el estado SSN en caché: {e}")
+
+
+def invalidar_estado_ssn(base_request) -> None:
+    """
+    Descarta el estado cacheado de una entrega. Llamar después de cualquier
+    operación que lo modifique en la SSN (envío, confirmación, rectificación).
+    """
+    try:
+        _estado_cache().delete(_estado_cache_key(base_request))
+    except Exception as e:
+        logger.warning(f"No se pudo invalidar el estado SSN en caché: {e}")
+
+
 def guardar_respuesta_solicitud(base_request, endpoint, payload, response, status):
     obj, created = SolicitudResponse.objects.update_or_create(
         solicitud=base_request,
@@ -160,10 +233,13 @@ def guardar_respuesta_solicitud(base_request, endpoint, payload, response, statu
     return obj
 
 
-def enviar_y_guardar_solicitud(base_request, operations, allow_empty=False):
+def enviar_y_guardar_solicitud(base_request, allow_empty=False):
     """
     Envía una solicitud a la SSN considerando su estado actual.
 
+    El payload se arma desde la base (encode_solicitud); la verificación de
+    solicitud vacía se hace sobre ese mismo payload.
+
     Flujo:
     1. Consulta el estado en la SSN
     2. Decide qué acción tomar según el estado:
@@ -173,7 +249,7 @@ def enviar_y_guardar_solicitud(base_request, operations, allow_empty=False):
        - RECTIFICACIÓN PENDIENTE: Esperando aprobación (error)
     """
     try:
-        from operaciones.serializers import serialize_operations
+        from operaciones.encoders import encode_solicitud
 
         # 1) Consultar estado actual en la SSN
         logger.info(f"Consultando estado previo para solicitud {base_request.uuid}")
@@ -224,15 +300,16 @@ def enviar_y_guardar_solicitud(base_request, operations, allow_empty=False):
             logger.error(msg)
             return {"error": msg}, HTTPStatus.INTERNAL_SERVER_ERROR, None
 
-        # 3) Validar y serializar
-        if not operations and not allow_empty:
+        # 3) Serializar y validar. Mismo JSON que serialize_operations, armado
+        #    desde values() (ver encoders.py)
+        payload = encode_solicitud(base_request)
+        if not (payload.get("operaciones") or payload.get("stocks")) and not allow_empty:
             return (
                 {"error": "No hay operaciones para enviar."},
                 HTTPStatus.BAD_REQUEST,
                 None,
             )
 
-        payload = serialize_operations(base_request, operations)
         tipo_entrega = payload.get("tipoEntrega")
         if not tipo_entrega:
             return {"error": "Falta el tipo de entrega."}, HTTPStatus.BAD_REQUEST, None
@@ -260,6 +337,7 @@ def enviar_y_guardar_solicitud(base_request, operations, allow_empty=False):
             f"Ejecutando {http_method_name.upper()} en {endpoint} para solicitud {base_request.uuid}"
         )
         response, status = http_method(endpoint, data=payload)
+        invalidar_estado_ssn(base_request)
 
         obj_response = guardar_respuesta_solicitud(
             base_request, endpoint, payload, response, status
@@ -279,6 +357,7 @@ def enviar_y_guardar_solicitud(base_request, operations, allow_empty=False):
             response, status = ssn_client.post_resource(
                 endpoint_confirm, data=confirm_payload
             )
+            invalidar_estado_ssn(base_request)
 
             obj_response = guardar_respuesta_solicitud(
                 base_request, endpoint_confirm, confirm_payload, response, status
@@ -289,8 +368,10 @@ def enviar_y_guardar_solicitud(base_request, operations, allow_empty=False):
 
             logger.info(f"Confirmación exitosa: {status} - {response}")
 
-        # 7) Consultar estado final para sincronizar
-        estado_final_ssn, _, _ = consultar_estado_ssn(base_request)
+        # 7) Consultar estado final para sincronizar (siempre en vivo; deja la caché al día)
+        estado_final_ssn, datos_finales, status_final = consultar_estado_ssn(base_request)
+        if estado_final_ssn is not None and status_final < 400:
+            guardar_estado_en_cache(base_request, estado_final_ssn, datos_finales, status_final)
 
         # 8) Actualizar el estado del modelo según el estado SSN
         base_request.send_at = timezone.now()
@@ -392,6 +473,7 @@ def solicitar_rectificacion_ssn(
             f"para {base_request.uuid}"
         )
         response, status = ssn_client.put_resource(endpoint_url, data=payload)
+        invalidar_estado_ssn(base_request)
 
         # 5) Guardar respuesta con label descriptivo para el historial
         obj_response = guardar_respuesta_solicitud(
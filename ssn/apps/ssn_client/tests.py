@@ -150,3 +150,454 @@
 #         response = self.service.post_resource("entregaSemanal", data=payload)
 #         self.assertIsNotNone(response, "La respuesta no debe ser None")
 #         self.assertIn("ENVIADO CORRECTAMENTE", str(response), "El mensaje de éxito no se encontró en la respuesta")
+
+
+import time as _time
+from unittest import mock
+
+import jwt
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from ssn_client.clients import Singleton, SsnService
+from ssn_client.token_store import CacheTokenStore, LocalTokenStore
+
+
+def _make_jwt(ttl_seconds: int = 3600) -> str:
+    """Genera un JWT sin firma válida con 'exp' a ttl_seconds desde ahora."""
+    return jwt.encode({"exp": int(_time.time()) + ttl_seconds, "n": _time.time_ns()}, "k")
+
+
+def _login_response(token: str) -> mock.Mock:
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {"token": token}
+    return response
+
+
+TEST_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "ssn_token": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ssn-token-tests",
+    },
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class TokenStoreTests(SimpleTestCase):
+    """Tests del token compartido entre instancias (workers) de SsnService."""
+
+    def setUp(self):
+        Singleton._instances.pop(SsnService, None)
+        caches["ssn_token"].clear()
+
+    def tearDown(self):
+        Singleton._instances.pop(SsnService, None)
+
+    def _new_service(self, store, login_token, warm_up=True):
+        """Crea una instancia nueva (bypass del Singleton) con el login mockeado."""
+        Singleton._instances.pop(SsnService, None)
+        with mock.patch("ssn_client.clients.requests.Session") as session_cls:
+            session_cls.return_value.post.return_value = _login_response(login_token)
+            service = SsnService(
+                username="u", password="p", cia="c", base_url="https://ssn.test",
+                token_store=store,
+            )
+        if warm_up:
+            service.warm_up(background=False)
+        return service, session_cls.return_value.post
+
+    def test_incomplete_store_fails_on_instantiation(self):
+        from ssn_client.token_store import TokenStore
+
+        class SinLock(TokenStore):
+            def get(self):
+                return None
+
+            def set(self, token, ttl=None):
+                pass
+
+            def clear(self):
+                pass
+
+        with self.assertRaises(TypeError):
+            SinLock()
+
+    def test_init_does_not_login(self):
+        service, login = self._new_service(LocalTokenStore(), _make_jwt(), warm_up=False)
+
+        self.assertEqual(login.call_count, 0)
+        self.assertIsNone(service.token)
+
+    def test_first_request_logs_in_lazily(self):
+        token = _make_jwt()
+        service, login = self._new_service(LocalTokenStore(), token, warm_up=False)
+        service.session.get.__name__ = "get"
+        service.session.get.return_value = mock.Mock(status_code=200, headers={})
+        service.session.get.return_value.json.return_value = {"ok": True}
+
+        data, status = service.get_resource("entregaSemanal")
+
+        self.assertEqual(status, 200)
+        self.assertEqual(login.call_count, 1)
+        self.assertEqual(service.session.get.call_args.kwargs["headers"]["Token"], token)
+
+    def test_background_warm_up(self):
+        token = _make_jwt()
+        service, login = self._new_service(LocalTokenStore(), token, warm_up=False)
+
+        thread = service.warm_up(background=True)
+        thread.join(timeout=5)
+
+        self.assertEqual(login.call_count, 1)
+        self.assertEqual(service.token, token)
+
+    def test_workers_share_single_login(self):
+        store = CacheTokenStore(cache_alias="ssn_token", key="test-token")
+        first_token = _make_jwt()
+
+        worker_1, login_1 = self._new_service(store, first_token)
+        worker_2, login_2 = self._new_service(store, _make_jwt())
+
+        self.assertEqual(login_1.call_count, 1)
+        self.assertEqual(login_2.call_count, 0)
+        self.assertEqual(worker_1.token, first_token)
+        self.assertEqual(worker_2.token, first_token)
+
+    def test_expiring_shared_token_is_refreshed_once(self):
+        store = CacheTokenStore(cache_alias="ssn_token", key="test-token")
+        store.set(_make_jwt(ttl_seconds=10))  # dentro del margen de refresco
+
+        fresh_token = _make_jwt()
+        worker_1, login_1 = self._new_service(store, fresh_token)
+        worker_2, login_2 = self._new_service(store, _make_jwt())
+
+        self.assertEqual(login_1.call_count, 1)
+        self.assertEqual(login_2.call_count, 0)
+        self.assertEqual(store.get(), fresh_token)
+        self.assertEqual(worker_2.token, fresh_token)
+
+    def test_unauthorized_forces_new_login_even_if_store_has_same_token(self):
+        store = LocalTokenStore()
+        rejected_token = _make_jwt()
+        service, _ = self._new_service(store, rejected_token)
+
+        new_token = _make_jwt()
+        service.session.post.return_value = _login_response(new_token)
+        kwargs = {"headers": service._get_headers()}
+
+        self.assertTrue(service._handle_unauthorized(kwargs))
+        self.assertEqual(service.token, new_token)
+        self.assertEqual(store.get(), new_token)
+        self.assertEqual(kwargs["headers"]["Token"], new_token)
+
+
+    def test_concurrent_threads_share_single_login(self):
+        import threading
+
+        stores = {
+            "local": LocalTokenStore,
+            "cache": lambda: CacheTokenStore(cache_alias="ssn_token", key="test-token"),
+        }
+        for name, make_store in stores.items():
+            with self.subTest(store=name):
+                caches["ssn_token"].clear()
+                token = _make_jwt()
+                service, login = self._new_service(make_store(), token, warm_up=False)
+
+                def slow_login(*args, **kwargs):
+                    _time.sleep(0.05)
+                    return _login_response(token)
+
+                login.side_effect = slow_login
+                barrier = threading.Barrier(8)
+                results = []
+
+                def refresh():
+                    barrier.wait()
+                    results.append(service._check_token())
+
+                threads = [threading.Thread(target=refresh) for _ in range(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join(timeout=10)
+
+                self.assertEqual(results, [True] * 8)
+                self.assertEqual(login.call_count, 1)
+                self.assertEqual(service.token, token)
+
+                # Varios 401 simultáneos con el mismo token rechazado: un solo login
+                login.reset_mock()
+                token = _make_jwt()
+                barrier.reset()
+                results.clear()
+
+                def unauthorized():
+                    kwargs = {"headers": service._get_headers()}
+                    barrier.wait()
+                    results.append(service._handle_unauthorized(kwargs))
+
+                threads = [threading.Thread(target=unauthorized) for _ in range(8)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join(timeout=10)
+
+                self.assertEqual(results, [True] * 8)
+                self.assertEqual(login.call_count, 1)
+                self.assertEqual(service.token, token)
+
+import threading
+
+from operaciones.models import BaseRequestModel
+from ssn_client.apps import SsnClientConfig
+
+
+class SlowStatusClient:
+    """Cliente SSN falso que tarda en responder el estado y cuenta las llamadas."""
+
+    def __init__(self, estado="Presentado", delay=0.2):
+        self.estado = estado
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get_resource(self, resource, params=None):
+        with self._lock:
+            self.calls += 1
+        _time.sleep(self.delay)
+        return {"estado": self.estado}, 200
+
+
+@override_settings(
+    CACHES={
+        **TEST_CACHES,
+        "ssn_status": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "ssn-status-tests",
+        },
+    },
+    SSN_STATUS_CACHE_TTL=30,
+)
+class EstadoSsnCacheTests(SimpleTestCase):
+    """Tests del caché de estados SSN por (tipo_entrega, cronograma)."""
+
+    def setUp(self):
+        # Import diferido: ssn_client.services y operaciones.services se importan mutuamente
+        from ssn_client import services
+
+        self.services = services
+
+        caches["ssn_status"].clear()
+        self.solicitud = BaseRequestModel(
+            tipo_entrega="Semanal", cronograma="2025-15", codigo_compania="0744"
+        )
+
+    def test_repeated_reads_hit_ssn_once(self):
+        client = SlowStatusClient(delay=0)
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            for _ in range(3):
+                estado, _, status = self.services.consultar_estado_ssn_cacheado(self.solicitud)
+
+        self.assertEqual((estado, status), ("Presentado", 200))
+        self.assertEqual(client.calls, 1)
+
+    def test_concurrent_reads_are_single_flight(self):
+        client = SlowStatusClient(delay=0.3)
+        results = []
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            threads = [
+                threading.Thread(
+                    target=lambda: results.append(self.services.consultar_estado_ssn_cacheado(self.solicitud)[0])
+                )
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=10)
+
+        self.assertEqual(results, ["Presentado"] * 5)
+        self.assertEqual(client.calls, 1)
+
+    def test_invalidation_forces_fresh_read(self):
+        client = SlowStatusClient(delay=0)
+        with mock.patch.object(SsnClientConfig, "ssn_client", client):
+            self.services.consultar_estado_ssn_cacheado(self.solicitud)
+            client.estado = "A Rectificar"
+            self.services.invalidar_estado_ssn(self.solicitud)
+            estado, _, _ = self.services.consultar_estado_ssn_cacheado(self.solicitud)
+
+        self.assertEqual(estado, "A Rectificar")
+        self.assertEqual(client.calls, 2)
+
+
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from operaciones.models import EstadoSolicitud, TipoEntrega
+from ssn_client.jobs import (
+    ejecutar_envio,
+    encolar_envio,
+    liberar_jobs_colgados,
+    marcar_notificado,
+    registrar_latido,
+    tomar_job,
+)
+from ssn_client.models import EnvioSolicitudJob, EstadoEnvioJob
+
+
+class EnvioSolicitudJobTests(TestCase):
+    """Tests for the DB-backed submission queue and process_ssn_jobs."""
+
+    def setUp(self):
+        from ssn_client import services
+
+        self.services = services
+        self.solicitud = BaseRequestModel.objects.create(
+            codigo_compania="0744", tipo_entrega=TipoEntrega.SEMANAL,
+            cronograma="2025-15", estado=EstadoSolicitud.BORRADOR,
+        )
+
+    def test_enqueue_is_idempotent_while_active(self):
+        job, creado = encolar_envio(self.solicitud, allow_empty=True)
+        otro, creado_otro = encolar_envio(self.solicitud)
+
+        self.assertTrue(creado)
+        self.assertFalse(creado_otro)
+        self.assertEqual(job.pk, otro.pk)
+        self.assertTrue(job.allow_empty)
+
+    def test_job_is_taken_by_a_single_worker(self):
+        job, _ = encolar_envio(self.solicitud)
+
+        tomado = tomar_job("worker-1")
+        self.assertEqual(tomado.pk, job.pk)
+        self.assertEqual(tomado.estado, EstadoEnvioJob.EN_CURSO)
+        self.assertEqual(tomado.intentos, 1)
+        self.assertIsNone(tomar_job("worker-2"))
+
+    def test_stale_jobs_are_requeued(self):
+        job, _ = encolar_envio(self.solicitud)
+        tomar_job("worker-muerto")
+        EnvioSolicitudJob.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(hours=1),
+            updated_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(liberar_jobs_colgados(max_age=600), 1)
+        self.assertEqual(tomar_job("worker-2").pk, job.pk)
+
+    def test_slow_job_with_heartbeat_is_not_requeued(self):
+        from django.core.management.base import CommandError
+
+        job, _ = encolar_envio(self.solicitud)
+        job = tomar_job("worker-lento")
+        EnvioSolicitudJob.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(hours=1),
+            updated_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertTrue(registrar_latido(job))
+        self.assertEqual(liberar_jobs_colgados(max_age=600), 0)
+        self.assertFalse(registrar_latido(EnvioSolicitudJob(pk=job.pk, worker="otro")))
+
+        with self.assertRaises(CommandError):
+            call_command("process_ssn_jobs", stale_after=10, stdout=mock.MagicMock())
+
+    def test_requeued_job_already_presented_is_not_resent(self):
+        job, _ = encolar_envio(self.solicitud, allow_empty=True)
+        tomar_job("worker-muerto")
+        EnvioSolicitudJob.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(hours=1),
+            updated_at=timezone.now() - timedelta(hours=1),
+        )
+        liberar_jobs_colgados(max_age=600)
+        job = tomar_job("worker-2")
+
+        presentado = (self.services.EstadoSSN.PRESENTADO, {}, 200)
+        with mock.patch.object(self.services, "consultar_estado_ssn", return_value=presentado), \
+                mock.patch.object(self.services, "enviar_y_guardar_solicitud") as enviar, \
+                mock.patch(
+                    "operaciones.services.email_service.PresentacionEmailService.deliver_confirmacion"
+                ):
+            ejecutar_envio(job)
+
+        enviar.assert_not_called()
+        job.refresh_from_db()
+        self.solicitud.refresh_from_db()
+        self.assertEqual(job.estado, EstadoEnvioJob.COMPLETADO)
+        self.assertEqual(self.solicitud.estado, EstadoSolicitud.PRESENTADO)
+
+    def test_requeued_job_not_presented_is_resent(self):
+        job, _ = encolar_envio(self.solicitud, allow_empty=True)
+        tomar_job("worker-muerto")
+        EnvioSolicitudJob.objects.filter(pk=job.pk).update(
+            estado=EstadoEnvioJob.PENDIENTE
+        )
+        job = tomar_job("worker-2")
+
+        cargado = (self.services.EstadoSSN.CARGADO, {}, 200)
+        with mock.patch.object(self.services, "consultar_estado_ssn", return_value=cargado), \
+                mock.patch.object(
+                    self.services, "enviar_y_guardar_solicitud",
+                    return_value=({"message": "Entrega confirmada"}, 200, None),
+                ) as enviar, \
+                mock.patch(
+                    "operaciones.services.email_service.PresentacionEmailService.deliver_confirmacion"
+                ):
+            ejecutar_envio(job)
+
+        enviar.assert_called_once()
+        self.assertEqual(job.estado, EstadoEnvioJob.COMPLETADO)
+
+    def test_result_is_notified_once(self):
+        job, _ = encolar_envio(self.solicitud)
+
+        self.assertTrue(marcar_notificado(job))
+        self.assertFalse(marcar_notificado(job))
+
+    def test_worker_runs_submission_and_records_result(self):
+        ok, _ = encolar_envio(self.solicitud, allow_empty=True)
+        otra = BaseRequestModel.objects.create(
+            codigo_compania="0744", tipo_entrega=TipoEntrega.SEMANAL, cronograma="2025-16",
+        )
+        falla, _ = encolar_envio(otra, allow_empty=True)
+
+        def enviar(base_request, allow_empty=False):
+            if base_request.pk == self.solicitud.pk:
+                return {"message": "Entrega confirmada"}, 200, None
+            return {"message": "Rechazada", "errors": ["cronograma inválido"]}, 400, None
+
+        with mock.patch.object(self.services, "enviar_y_guardar_solicitud", side_effect=enviar), \
+                mock.patch(
+                    "operaciones.services.email_service.PresentacionEmailService.deliver_confirmacion"
+                ) as deliver_confirmacion:
+            call_command("process_ssn_jobs", stdout=mock.MagicMock())
+
+        ok.refresh_from_db()
+        falla.refresh_from_db()
+        self.assertEqual(ok.estado, EstadoEnvioJob.COMPLETADO)
+        self.assertEqual(ok.mensaje, "Entrega confirmada")
+        self.assertEqual(falla.estado, EstadoEnvioJob.ERROR)
+        self.assertEqual(falla.status_http, 400)
+        deliver_confirmacion.assert_called_once()
+        self.assertEqual(deliver_confirmacion.call_args.args[0].pk, self.solicitud.pk)
+
+    def test_empty_payload_is_not_sent(self):
+        from operaciones.encoders import encode_solicitud
+
+        cargado = (self.services.EstadoSSN.CARGADO, {}, 200)
+        with mock.patch.object(self.services, "consultar_estado_ssn", return_value=cargado), \
+                mock.patch("operaciones.encoders.encode_solicitud",
+                           wraps=encode_solicitud) as encode:
+            response, status, _ = self.services.enviar_y_guardar_solicitud(self.solicitud)
+
+        # La verificación de vacío se hace sobre el payload codificado
+        encode.assert_called_once_with(self.solicitud)
+        self.assertEqual(status, 400)
+        self.assertEqual(response, {"error": "No hay operaciones para enviar."})
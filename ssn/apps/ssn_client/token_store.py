@@ -0,0 +1,189 @@
+"""
+Almacenamiento compartido del token JWT de la SSN.
+
+SsnService es un Singleton por proceso: con gunicorn (3+ workers) cada worker
+hacía su propio /login al arrancar y cada vez que el token expiraba. Los stores
+de este módulo permiten que todos los procesos compartan el mismo token:
+
+- LocalTokenStore: token en memoria del proceso (comportamiento histórico).
+- CacheTokenStore: token en una caché de Django (FileBasedCache, Redis, ...)
+  protegido por un lock, de modo que un solo worker refresca el JWT y el resto
+  lo reutiliza.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import ContextManager, Iterator, Optional
+
+from django.core.cache import caches
+
+logger = logging.getLogger("ssn_client")
+
+
+@contextmanager
+def cache_lock(
+    cache,
+    key: str,
+    timeout: int = 30,
+    wait: float = 20.0,
+    poll_interval: float = 0.1,
+) -> Iterator[bool]:
+    """
+    Lock cooperativo entre procesos basado en cache.add().
+
+    cache.add() es atómico en Redis/Memcached y best-effort en FileBasedCache
+    (suficiente para evitar la estampida de logins). El lock expira solo a los
+    `timeout` segundos por si el proceso que lo tomó muere.
+
+    Yields:
+        bool: True si se obtuvo el lock, False si se agotó la espera.
+    """
+    owner = uuid.uuid4().hex
+    deadline = time.monotonic() + wait
+    try:
+        acquired = cache.add(key, owner, timeout)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            acquired = cache.add(key, owner, timeout)
+    except Exception as e:
+        logger.warning(f"No se pudo tomar el lock '{key}' en caché: {e}")
+        acquired = False
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                if cache.get(key) == owner:
+                    cache.delete(key)
+            except Exception as e:
+                logger.warning(f"No se pudo liberar el lock '{key}' en caché: {e}")
+
+
+class TokenStore(ABC):
+    """Interfaz mínima de un store de tokens."""
+
+    @abstractmethod
+    def get(self) -> Optional[str]:
+        """Token guardado, o None si no hay."""
+
+    @abstractmethod
+    def set(self, token: str, ttl: Optional[int] = None) -> None:
+        """Guarda el token (ttl en segundos; None = sin vencimiento)."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Borra el token guardado."""
+
+    @abstractmethod
+    def lock(self) -> ContextManager[bool]:
+        """Context manager que serializa el login; devuelve si se obtuvo el lock."""
+
+
+class LocalTokenStore(TokenStore):
+    """Token en memoria del proceso. No comparte nada entre workers."""
+
+    def __init__(self) -> None:
+        self._token: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[str]:
+        return self._token
+
+    def set(self, token: str, ttl: Optional[int] = None) -> None:
+        self._token = token
+
+    def clear(self) -> None:
+        self._token = None
+
+    @contextmanager
+    def lock(self) -> Iterator[bool]:
+        with self._lock:
+            yield True
+
+
+class CacheTokenStore(TokenStore):
+    """
+    Token compartido en una caché de Django.
+
+    Si la caché no está disponible (ej: Redis caído) el store se degrada a
+    "sin token compartido": cada proceso hace login por su cuenta, como antes.
+    """
+
+    def __init__(
+        self,
+        cache_alias: str = "default",
+        key: str = "ssn_api_token",
+        lock_timeout: int = 30,
+        lock_wait: float = 20.0,
+    ) -> None:
+        self.cache_alias = cache_alias
+        self.key = key
+        self.lock_key = f"{key}:lock"
+        self.lock_timeout = lock_timeout
+        self.lock_wait = lock_wait
+        # Serializa también los threads del mismo proceso
+        self._thread_lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def get(self) -> Optional[str]:
+        try:
+            return self.cache.get(self.key)
+        except Exception as e:
+            logger.warning(f"No se pudo leer el token SSN de la caché '{self.cache_alias}': {e}")
+            return None
+
+    def set(self, token: str, ttl: Optional[int] = None) -> None:
+        try:
+            if ttl is None:
+                self.cache.set(self.key, token)
+            else:
+                self.cache.set(self.key, token, ttl)
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el token SSN en la caché '{self.cache_alias}': {e}")
+
+    def clear(self) -> None:
+        try:
+            self.cache.delete(self.key)
+        except Exception as e:
+            logger.warning(f"No se pudo borrar el token SSN de la caché '{self.cache_alias}': {e}")
+
+    @contextmanager
+    def lock(self) -> Iterator[bool]:
+        with self._thread_lock:
+            with cache_lock(
+                self.cache, self.lock_key,
+                timeout=self.lock_timeout, wait=self.lock_wait,
+            ) as acquired:
+                if not acquired:
+                    logger.warning(
+                        "No se obtuvo el lock del token SSN a tiempo; se continúa sin él."
+                    )
+                yield acquired
+
+
+def build_token_store(kind: str, cache_alias: str, namespace: str) -> TokenStore:
+    """
+    Construye el store configurado en settings (SSN_API_TOKEN_STORE).
+
+    Args:
+        kind: "cache" (compartido entre procesos) o "local" (por proceso)
+        cache_alias: Alias de CACHES a usar cuando kind == "cache"
+        namespace: Identifica credenciales y entorno (cia, usuario, URL) para no
+                   mezclar tokens de prod y test en la misma caché.
+    """
+    if kind == "local":
+        return LocalTokenStore()
+    if kind != "cache":
+        logger.warning(f"SSN_API_TOKEN_STORE desconocido '{kind}'. Se usa 'cache'.")
+
+    digest = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:16]
+    return CacheTokenStore(cache_alias=cache_alias, key=f"ssn_api_token:{digest}")
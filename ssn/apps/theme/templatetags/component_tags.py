@@ -1,7 +1,7 @@
 from django import forms as django_forms
 from django import template
 
-from operaciones.helpers.text_utils import format_ar_number
+from operaciones.helpers.number_utils import format_ar_number
 
 register = template.Library()
 
@@ -12,6 +12,30 @@ SSN_API_MAX_RETRIES = config("SSN_API_MAX_RETRIES", default=3, cast=int)
 SSN_API_RETRY_DELAY = config("SSN_API_RETRY_DELAY", default=5, cast=int)
 SSN_API_ENABLED = config("SSN_API_ENABLED", default=True, cast=bool)
 SSN_API_VERIFY_SSL = config("SSN_API_VERIFY_SSL", default=True, cast=bool)  # False para test con cert self-signed
+# Dónde vive el JWT de la SSN:
+# - "cache": compartido entre workers de gunicorn vía CACHES[SSN_API_TOKEN_CACHE] (un solo login)
+# - "local": un token por proceso (comportamiento anterior)
+SSN_API_TOKEN_STORE = config("SSN_API_TOKEN_STORE", default="cache")
+SSN_API_TOKEN_CACHE = config("SSN_API_TOKEN_CACHE", default="ssn_token")
+# El login a la SSN es lazy (primer uso). Con True se precalienta el token en un
+# thread en segundo plano al arrancar, sin bloquear manage.py ni el boot de gunicorn.
+SSN_API_WARMUP = config("SSN_API_WARMUP", default=False, cast=bool)
+# Caché del estado de cada entrega en la SSN (consultar_estado_ssn_cacheado):
+# las vistas consultan a la SSN como máximo una vez por período cada TTL segundos.
+SSN_STATUS_CACHE = config("SSN_STATUS_CACHE", default="ssn_status")
+SSN_STATUS_CACHE_TTL = config("SSN_STATUS_CACHE_TTL", default=30, cast=int)
+# False: la lista de operaciones no sincroniza el estado con la SSN en cada GET;
+# lo hace el comando reconcile_ssn_status (cron o --loop).
+SSN_STATUS_SYNC_INLINE = config("SSN_STATUS_SYNC_INLINE", default=True, cast=bool)
+# True: la vista de envío encola el envío y el comando process_ssn_jobs lo ejecuta
+# fuera del request (la UI consulta el estado del job).
+SSN_ASYNC_SUBMISSION = config("SSN_ASYNC_SUBMISSION", default=False, cast=bool)
+# Segundos entre latidos de un envío en curso: process_ssn_jobs solo reclama los
+# jobs sin latido reciente (--stale-after), nunca un envío lento pero vivo.
+SSN_JOB_HEARTBEAT = config("SSN_JOB_HEARTBEAT", default=30, cast=int)
+# True: una línea INFO por payload serializado con filas por tipo, errores y
+# tiempo total (los serializadores no loguean por campo ni por fila).
+SSN_SERIALIZER_STATS = config("SSN_SERIALIZER_STATS", default=False, cast=bool)
 
 # --- Authentication Configuration ---
 # Solo necesitas configurar IDENTITY_SERVICE_URL
@@ -57,9 +81,19 @@ MAILSENDER_URL = config("MAILSENDER_URL", default="")
 MAILSENDER_SERVICE_USER = config("MAILSENDER_SERVICE_USER", default="")
 MAILSENDER_SERVICE_PASSWORD = config("MAILSENDER_SERVICE_PASSWORD", default="")
 ALERT_EMAIL_RECIPIENTS = config("ALERT_EMAIL_RECIPIENTS", default="")  # CSV: a@x.com,b@x.com
+# True: la confirmación de presentación se encola y la entrega el comando
+# dispatch_emails (debe estar programado: cron o --loop). False: se envía en el
+# momento, dentro del envío a la SSN.
+EMAIL_OUTBOX_ENABLED = config("EMAIL_OUTBOX_ENABLED", default=False, cast=bool)
+# Bandeja de salida (dispatch_emails): destinatarios por llamada, reintentos y
+# espera base del backoff exponencial en segundos.
+EMAIL_OUTBOX_BATCH_SIZE = config("EMAIL_OUTBOX_BATCH_SIZE", default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config("EMAIL_OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+EMAIL_OUTBOX_BACKOFF = config("EMAIL_OUTBOX_BACKOFF", default=60, cast=int)
 
-# --- Caché cross-process para alertas ---
+# --- Caché cross-process para alertas, token y estados SSN ---
 # FileBasedCache permite compartir estado entre el web server (gunicorn) y el cron.
+# Para "ssn_token" puede usarse Redis/Memcached si hay uno disponible (cache.add atómico).
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
@@ -68,4 +102,12 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
         "LOCATION": "/tmp/ssn_alerts_cache",
     },
+    "ssn_token": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": "/tmp/ssn_token_cache",
+    },
+    "ssn_status": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": "/tmp/ssn_status_cache",
+    },
 }